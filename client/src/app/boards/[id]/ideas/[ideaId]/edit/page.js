@@ -11,6 +11,7 @@ import remarkGfm from 'remark-gfm';
 import styles from './page.module.css';
 import { useRequireAuth } from '@/hooks/useRequireAuth';
 import { apiGet, apiPost } from '@/lib/api';
+import { diffOps } from '@/lib/textPatch';
 
 export default function IdeaEditPage() {
   const router = useRouter();
@@ -33,6 +34,9 @@ export default function IdeaEditPage() {
   // Form fields
   const [title, setTitle] = useState('');
   const [bodyMd, setBodyMd] = useState('');
+  // Version serveur du body (base des patchs envoyés à l'update)
+  const [baseBody, setBaseBody] = useState('');
+  const [baseHash, setBaseHash] = useState(null);
   const [columnId, setColumnId] = useState('');
   const [tagsText, setTagsText] = useState('');
   const [impact, setImpact] = useState('');
@@ -81,6 +85,8 @@ export default function IdeaEditPage() {
 
         setTitle(idea?.title || '');
         setBodyMd(idea?.body_md || '');
+        setBaseBody(idea?.body_md || '');
+        setBaseHash(idea?.body_hash || null);
         setColumnId(String(idea?.column?.id || ''));
 
         const tags = Array.isArray(idea?.tags) ? idea.tags : [];
@@ -126,11 +132,18 @@ export default function IdeaEditPage() {
 
     const payload = {
       title: cleanTitle,
-      body_md: bodyMd || '',
       column_id: columnId ? Number(columnId) : undefined,
       tags,
     };
 
+    // Body : seulement la plage modifiée quand la base serveur est connue
+    if (baseHash) {
+      const ops = diffOps(baseBody, bodyMd || '');
+      if (ops.length) payload.body_patch = { base: baseHash, ops };
+    } else {
+      payload.body_md = bodyMd || '';
+    }
+
     if (hasImpact) {
       payload.impact = impact === '' ? null : Number(impact);
     }
@@ -143,12 +156,18 @@ export default function IdeaEditPage() {
       setSaveError(null);
       setSaved(false);
 
-      await apiPost(`/api/boards/${boardId}/ideas/${ideaId}/update/`, payload);
+      const res = await apiPost(`/api/boards/${boardId}/ideas/${ideaId}/update/`, payload);
+      setBaseBody(res?.idea?.body_md ?? bodyMd ?? '');
+      setBaseHash(res?.idea?.body_hash || null);
 
       setSaved(true);
       // Optional: go back to detail after save
       router.push(`/boards/${boardId}/ideas/${ideaId}`);
     } catch (err) {
+      if (err.status === 409) {
+        setSaveError("Le contenu a été modifié ailleurs : rechargez la page avant d'enregistrer.");
+        return;
+      }
       setSaveError(err.message || "Impossible d'enregistrer");
     } finally {
       setSaving(false);
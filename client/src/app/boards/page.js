@@ -17,7 +17,7 @@ export default function BoardsPage() {
     if (!authLoading && authenticated) {
       async function loadBoards() {
         try {
-          const data = await apiGet('/api/boards/');
+          const data = await apiGet('/api/boards/?overview=1&recent=3');
           setBoards(data.boards || []);
         } catch (err) {
           setError(err.message || 'Impossible de charger les boards');
@@ -58,6 +58,20 @@ export default function BoardsPage() {
             {boards.map((b) => (
               <Link key={b.id} className={styles.card} href={`/boards/${b.id}`}>
                 <div className={styles.cardTitle}>{b.name}</div>
+                {typeof b.total === 'number' && (
+                  <div className={styles.cardMeta}>
+                    {b.total} idée{b.total > 1 ? 's' : ''}
+                    {b.counts?.active ? ` · ${b.counts.active} active${b.counts.active > 1 ? 's' : ''}` : ''}
+                    {b.updated_at ? ` · maj ${new Date(b.updated_at).toLocaleDateString('fr-FR')}` : ''}
+                  </div>
+                )}
+                {b.recent?.length > 0 && (
+                  <ul className={styles.recent}>
+                    {b.recent.map((idea) => (
+                      <li key={idea.id}>{idea.title}</li>
+                    ))}
+                  </ul>
+                )}
                 <div className={styles.cardMeta}>Ouvrir le kanban →</div>
               </Link>
             ))}
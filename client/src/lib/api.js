@@ -68,6 +68,19 @@ function makeError(res, data) {
   return err;
 }
 
+// Copies des GET revalidées par ETag : le serveur répond 304 sans corps si
+// rien n'a changé (board/api/conditional.py). En mémoire, par URL.
+const ETAG_CACHE_MAX = 100;
+const etagCache = new Map();
+
+function rememberEtag(url, etag, data) {
+  etagCache.delete(url);
+  etagCache.set(url, { etag, data });
+  if (etagCache.size > ETAG_CACHE_MAX) {
+    etagCache.delete(etagCache.keys().next().value);
+  }
+}
+
 async function ensureCsrfCookie(csrfUrl = '/api/auth/csrf/') {
   // If cookie is already present, don't spam the server.
   if (getCookie('csrftoken')) return;
@@ -114,6 +127,11 @@ async function request(method, url, {
     }
   }
 
+  const cached = method === 'GET' ? etagCache.get(finalUrl) : undefined;
+  if (cached) {
+    finalHeaders['If-None-Match'] = cached.etag;
+  }
+
   if (!isSafeMethod) {
     await ensureCsrfCookie(csrfUrl);
     const token = getCookie('csrftoken');
@@ -139,12 +157,21 @@ async function request(method, url, {
     ...(fetchOptions || {}),
   });
 
+  if (res.status === 304 && cached) {
+    // Copie : l'appelant peut modifier ses données (mises à jour optimistes)
+    return structuredClone(cached.data);
+  }
+
   const parsed = await parseJsonSafe(res);
 
   if (!res.ok) {
+    etagCache.delete(finalUrl);
     throw makeError(res, parsed);
   }
 
+  const etag = method === 'GET' ? res.headers.get('etag') : null;
+  if (etag) rememberEtag(finalUrl, etag, structuredClone(parsed));
+
   return parsed;
 }
 
@@ -0,0 +1,33 @@
+// Patch texte pour body_md (voir server/board/api/services/patches.py).
+// Les offsets sont ceux des chaînes JS (unités UTF-16), comme côté serveur.
+
+function isHighSurrogate(code) {
+  return code >= 0xd800 && code <= 0xdbff;
+}
+
+// Une seule plage [start, end, text] : préfixe et suffixe communs retirés.
+// Retourne [] si les deux textes sont identiques.
+export function diffOps(base, next) {
+  const a = base || '';
+  const b = next || '';
+  if (a === b) return [];
+
+  let start = 0;
+  const max = Math.min(a.length, b.length);
+  while (start < max && a.charCodeAt(start) === b.charCodeAt(start)) start += 1;
+  // Ne pas couper une paire de surrogates
+  if (start > 0 && isHighSurrogate(a.charCodeAt(start - 1))) start -= 1;
+
+  let endA = a.length;
+  let endB = b.length;
+  while (endA > start && endB > start && a.charCodeAt(endA - 1) === b.charCodeAt(endB - 1)) {
+    endA -= 1;
+    endB -= 1;
+  }
+  if (endA < a.length && isHighSurrogate(a.charCodeAt(endA - 1))) {
+    endA += 1;
+    endB += 1;
+  }
+
+  return [[start, endA, b.slice(start, endB)]];
+}
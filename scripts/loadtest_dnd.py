@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+Générateur de charge « tempête de drag & drop » contre un serveur local.
+
+N clients simulés (un thread chacun, bibliothèque standard uniquement) :
+csrf + `auth/login`, puis en boucle sur un board : poll du `kanban`, `move`
+(intra et inter-colonnes), `reorder` d'une colonne et `quick-add`, d'après leur
+dernière copie du kanban comme le ferait le client Next.js.
+
+À la fin : débit, percentiles de latence par opération, erreurs de verrou
+SQLite (« database is locked »), autres erreurs, puis contrôle des invariants
+sur le kanban final :
+- positions dupliquées dans une colonne (deux cartes au même rang) ;
+- trous (positions différentes de 0..n-1) ;
+- idées perdues ou en trop (nombre final ≠ initial + quick-adds réussis).
+
+Usage (serveur lancé à part, ex. `python manage.py runserver`) :
+
+    python scripts/loadtest_dnd.py --username admin --password ... \\
+        --board 1 --clients 20 --duration 30
+
+Les erreurs de verrou sont reconnues au message SQLite de la page d'erreur
+(DJANGO_DEBUG=1) ou à un statut 503 ; avec DJANGO_DEBUG=0 elles comptent dans
+« 5xx ». En http avec DJANGO_DEBUG=0, lancer le serveur avec
+DJANGO_FORCE_SECURE_COOKIES=0 (sinon les cookies Secure ne reviennent pas).
+Code de sortie 1 si une requête a échoué en 5xx ou si un invariant est violé.
+
+Le board est modifié : utiliser une base de dev ou une copie
+(`python manage.py clone_board <id> "Charge"`).
+"""
+import argparse
+import http.cookiejar
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+
+# Part de chaque opération dans le mélange (polling dominant, comme en vrai)
+MIX = (("kanban", 50), ("move", 25), ("reorder", 15), ("quick_add", 10))
+
+
+class Client:
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/") + "/api/"
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    def _csrf(self):
+        for cookie in self.cookies:
+            if cookie.name == "csrftoken":
+                return cookie.value
+        return ""
+
+    def request(self, method, path, payload=None):
+        """(status, données JSON ou texte brut). Les erreurs HTTP ne lèvent pas."""
+        data = None
+        headers = {"Accept": "application/json"}
+        if payload is not None:
+            data = json.dumps(payload).encode()
+            headers["Content-Type"] = "application/json"
+            headers["X-CSRFToken"] = self._csrf()
+        req = urllib.request.Request(self.base_url + path, data=data, headers=headers, method=method)
+        try:
+            with self.opener.open(req, timeout=self.timeout) as resp:
+                status, body = resp.status, resp.read()
+        except urllib.error.HTTPError as e:
+            status, body = e.code, e.read()
+        try:
+            return status, json.loads(body)
+        except ValueError:
+            return status, body.decode("utf-8", "replace")
+
+    def login(self, username, password):
+        self.request("GET", "auth/csrf")
+        status, data = self.request("POST", "auth/login", {"username": username, "password": password})
+        if status != 200:
+            raise SystemExit(f"Connexion refusée ({status}) : {data}")
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.samples = {}
+        self.quick_adds = 0
+
+    def record(self, op, ms, status, body):
+        if 200 <= status < 300:
+            outcome = "ok"
+        elif status == 503 or "is locked" in str(body):
+            # Page d'erreur de DEBUG (message SQLite) ou 503 explicite du serveur
+            outcome = "lock"
+        elif status >= 500:
+            outcome = "5xx"
+        else:
+            outcome = str(status)
+        with self.lock:
+            self.latencies[op].append(ms)
+            self.outcomes[op][outcome] += 1
+            if outcome != "ok":
+                self.samples.setdefault(f"{op} {outcome}", " ".join(str(body).split())[:160])
+            if op == "quick_add" and outcome == "ok":
+                self.quick_adds += 1
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+# ---------------------------------------------------------------------------
+# Un client simulé
+# ---------------------------------------------------------------------------
+def _pick(columns, rng, non_empty=False):
+    candidates = [c for c in columns if c["ideas"]] if non_empty else columns
+    return rng.choice(candidates) if candidates else None
+
+
+def run_client(n, args, stats, stop, start_barrier):
+    rng = random.Random(args.seed + n)
+    client = Client(args.url, args.timeout)
+    client.login(args.username, args.password)
+    kanban_path = f"boards/{args.board}/kanban"
+    _, snapshot = client.request("GET", kanban_path)
+    ops, weights = zip(*MIX)
+    start_barrier.wait()
+
+    while not stop.is_set():
+        op = rng.choices(ops, weights)[0]
+        columns = snapshot.get("columns", []) if isinstance(snapshot, dict) else []
+        path, payload = kanban_path, None
+
+        if op == "move":
+            source, target = _pick(columns, rng, non_empty=True), _pick(columns, rng)
+            if source is None:
+                op = "kanban"
+            else:
+                idea = rng.choice(source["ideas"])
+                path = f"boards/{args.board}/ideas/{idea['id']}/move"
+                payload = {"to_column_id": target["id"], "target_index": rng.randint(0, len(target["ideas"]))}
+        elif op == "reorder":
+            column = _pick(columns, rng, non_empty=True)
+            if column is None:
+                op = "kanban"
+            else:
+                ids = [idea["id"] for idea in column["ideas"]]
+                rng.shuffle(ids)
+                path = f"boards/{args.board}/columns/{column['id']}/reorder"
+                payload = {"ordered_ids": ids}
+        elif op == "quick_add":
+            column = _pick(columns, rng)
+            path = f"boards/{args.board}/ideas/quick-add"
+            payload = {"text": f"Charge {n}-{rng.randrange(10**6)} #charge"}
+            if column is not None:
+                payload["column_id"] = column["id"]
+
+        started = time.perf_counter()
+        status, body = client.request("GET" if payload is None else "POST", path, payload)
+        stats.record(op, (time.perf_counter() - started) * 1000, status, body)
+        if op == "kanban" and status == 200:
+            snapshot = body
+        if args.think:
+            stop.wait(rng.uniform(0, 2 * args.think) / 1000)
+
+
+# ---------------------------------------------------------------------------
+# Invariants
+# ---------------------------------------------------------------------------
+def check_invariants(snapshot, expected_total):
+    problems = []
+    total = 0
+    for column in snapshot["columns"]:
+        positions = [idea.get("position") for idea in column["ideas"]]
+        total += len(positions)
+        duplicates = sorted(p for p, count in Counter(positions).items() if count > 1 and p is not None)
+        if duplicates:
+            problems.append(f"colonne {column['name']!r} : positions dupliquées {duplicates[:10]}")
+        missing = sorted(set(range(len(positions))) - set(positions))
+        if missing:
+            problems.append(f"colonne {column['name']!r} : rangs manquants {missing[:10]} ({len(missing)} trous)")
+    if total != expected_total:
+        problems.append(f"{total} idées sur le board, {expected_total} attendues")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8000", help="Serveur (défaut: %(default)s)")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--board", type=int, help="Board ciblé (défaut: le premier de la liste)")
+    parser.add_argument("--clients", type=int, default=10, help="Clients concurrents (défaut: %(default)s)")
+    parser.add_argument("--duration", type=float, default=20, help="Durée en secondes (défaut: %(default)s)")
+    parser.add_argument("--think", type=float, default=50, help="Pause moyenne entre actions, ms (défaut: %(default)s)")
+    parser.add_argument("--settle", type=float, default=2, help="Attente avant le contrôle final, s (défaut: %(default)s)")
+    parser.add_argument("--timeout", type=float, default=30, help="Timeout HTTP, s (défaut: %(default)s)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    admin = Client(args.url, args.timeout)
+    admin.login(args.username, args.password)
+    if args.board is None:
+        status, data = admin.request("GET", "boards")
+        if status != 200 or not data.get("boards"):
+            raise SystemExit(f"Aucun board disponible ({status})")
+        args.board = data["boards"][0]["id"]
+    status, before = admin.request("GET", f"boards/{args.board}/kanban")
+    if status != 200:
+        raise SystemExit(f"Kanban du board {args.board} illisible ({status})")
+    initial_total = sum(len(c["ideas"]) for c in before["columns"])
+    initial_problems = check_invariants(before, initial_total)
+
+    stats = Stats()
+    barrier = threading.Barrier(args.clients + 1)
+    errors = []
+
+    def target(n):
+        try:
+            run_client(n, args, stats, stop, barrier)
+        except BaseException as e:  # noqa: BLE001 - remonté dans le rapport
+            errors.append(f"client {n} : {e!r}")
+            barrier.abort()
+
+    stop = threading.Event()
+    threads = [threading.Thread(target=target, args=(n,), daemon=True) for n in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    try:
+        barrier.wait()
+    except threading.BrokenBarrierError:
+        raise SystemExit("\n".join(errors) or "Démarrage des clients interrompu")
+    # La durée part du moment où tous les clients sont connectés
+    started = time.monotonic()
+    stop.wait(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.monotonic() - started
+
+    # Rapport
+    total_requests = sum(len(v) for v in stats.latencies.values())
+    print(f"board {args.board} · {args.clients} clients · {elapsed:.1f} s · {total_requests / elapsed:.1f} req/s")
+    print(f"{'opération':<11}{'req':>7}{'ok':>7}{'lock':>6}{'5xx':>6}{'4xx':>6}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for op, _ in MIX:
+        values, outcomes = stats.latencies[op], stats.outcomes[op]
+        client_errors = sum(n for outcome, n in outcomes.items() if outcome.startswith("4"))
+        print(
+            f"{op:<11}{len(values):>7}{outcomes['ok']:>7}{outcomes['lock']:>6}{outcomes['5xx']:>6}{client_errors:>6}"
+            f"{percentile(values, 50):>9.1f}{percentile(values, 95):>9.1f}{percentile(values, 99):>9.1f}"
+        )
+    for key, sample in sorted(stats.samples.items()):
+        print(f"  exemple {key} : {sample}")
+    for error in errors:
+        print(f"  {error}")
+
+    # Les tâches différées du serveur (compaction après un move) finissent après la réponse
+    time.sleep(args.settle)
+    status, after = admin.request("GET", f"boards/{args.board}/kanban")
+    if status != 200:
+        raise SystemExit(f"Kanban final illisible ({status})")
+    problems = check_invariants(after, initial_total + stats.quick_adds)
+    if initial_problems:
+        print("Invariants déjà violés avant la charge :")
+        for problem in initial_problems:
+            print(f"  - {problem}")
+    if problems:
+        print(f"Invariants violés après la charge ({len(problems)}) :")
+        for problem in problems:
+            print(f"  - {problem}")
+    else:
+        print("Invariants respectés : positions 0..n-1 sans doublon, aucune idée perdue.")
+
+    failed = sum(stats.outcomes[op]["lock"] + stats.outcomes[op]["5xx"] for op, _ in MIX)
+    return 1 if problems or failed or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
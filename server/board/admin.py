@@ -1,5 +1,82 @@
-from django.contrib import admin
-from .models import Board, Column, Idea, Tag, IdeaTemplate
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import transaction
+from django.db.models import Case, IntegerField, Max, Value, When
+from django.utils import timezone
+from django.utils.functional import cached_property
+
+from .api import tasks
+from .api.operations import normalize_tags_value
+from .api.services import duplicates, stats, tag_suggestions, versions
+from .api.services.ideas import compact_column
+from .api.services.revisions import record_revision
+from .models import Board, Column, Idea, IdeaLshBand, IdeaSignature, IdeaStatus, Tag, IdeaTemplate
+
+
+class CappedCountPaginator(Paginator):
+    """
+    COUNT(*) borné : au-delà de `CAP` lignes après la page demandée, on
+    s'arrête de compter (SELECT COUNT(*) FROM (... LIMIT CAP + 1 OFFSET n)).
+    Sur une grosse table, le changelist n'a pas besoin du total exact.
+
+    Le plafond part de la page affichée (`page_hint`) : toutes les pages
+    restent accessibles, la pagination propose toujours jusqu'à CAP lignes
+    au-delà. Compte exact dès que le reste tient sous le plafond (filtres).
+    """
+
+    CAP = 10000
+
+    def __init__(self, object_list, per_page, *args, page_hint=1, **kwargs):
+        super().__init__(object_list, per_page, *args, **kwargs)
+        try:
+            self.page_hint = max(int(page_hint), 1)
+        except (TypeError, ValueError):
+            self.page_hint = 1
+
+    @cached_property
+    def count(self):
+        offset = (self.page_hint - 1) * self.per_page
+        return offset + self.object_list[offset : offset + self.CAP + 1].count()
+
+    @property
+    def capped(self):
+        """Vrai si le compte est un minorant (d'autres lignes suivent)."""
+        return self.count > (self.page_hint - 1) * self.per_page + self.CAP
+
+
+class BoardStatsAdminMixin:
+    """
+    Les écritures de l'admin (formulaire, suppressions, actions) passent à côté
+    des compteurs incrémentaux (stats, co-occurrence des tags) : on recalcule
+    les boards touchés (O(board)) et on incrémente leur version. Les
+    suppressions de colonnes et de tags en font partie (cascade sur les idées
+    et les liens de tags, sans signal).
+    """
+
+    def _rebuild_stats(self, board_ids):
+        board_ids = {b for b in board_ids if b is not None}
+        for board in Board.objects.filter(id__in=board_ids):
+            stats.rebuild(board)
+            tag_suggestions.rebuild(board)
+        versions.touch(list(board_ids))
+
+    def _board_ids(self, queryset):
+        """Boards dont les compteurs dépendent des objets de `queryset`."""
+        raise NotImplementedError
+
+    def delete_model(self, request, obj):
+        board_ids = self._board_ids(type(obj).objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        self._rebuild_stats(board_ids)
+
+    def delete_queryset(self, request, queryset):
+        board_ids = self._board_ids(queryset)
+        super().delete_queryset(request, queryset)
+        self._rebuild_stats(board_ids)
 
 
 @admin.register(Board)
@@ -9,28 +86,182 @@ class BoardAdmin(admin.ModelAdmin):
 
 
 @admin.register(Column)
-class ColumnAdmin(admin.ModelAdmin):
+class ColumnAdmin(BoardStatsAdminMixin, admin.ModelAdmin):
     list_display = ("name", "board", "order", "created_at")
     list_filter = ("board",)
+    list_select_related = ("board",)
     ordering = ("board", "order")
 
+    def _board_ids(self, queryset):
+        return list(queryset.order_by().values_list("board_id", flat=True).distinct())
+
+
+class IdeaActionForm(ActionForm):
+    """Paramètres des actions groupées (colonne cible, tags)."""
+
+    column = forms.ModelChoiceField(
+        queryset=Column.objects.select_related("board").order_by("board__name", "order"),
+        required=False,
+        label="Colonne",
+    )
+    tags = forms.CharField(required=False, label="Tags", help_text="Séparés par des virgules")
+
 
 @admin.register(Idea)
-class IdeaAdmin(admin.ModelAdmin):
+class IdeaAdmin(BoardStatsAdminMixin, admin.ModelAdmin):
     list_display = ("title", "column", "position", "status", "impact", "updated_at")
     list_filter = ("status", "column__board")
     search_fields = ("title", "body_md", "next_action")
     filter_horizontal = ("tags",)
-    ordering = ("column", "position")
+    # column_id (et non column) : l'index (column, position) sert le tri, sans
+    # JOIN + tri sur l'ordering de Column.
+    ordering = ("column_id", "position", "id")
+
+    # Changelist à nombre de requêtes fixe : colonne + board en JOIN (Column.__str__
+    # lit board.name), body_md non chargé, comptage borné.
+    list_select_related = ("column__board",)
+    list_per_page = 100
+    paginator = CappedCountPaginator
+    show_full_result_count = False
+
+    action_form = IdeaActionForm
+    UPDATE_CHUNK = 300
+    actions = ("move_to_column", "archive", "add_tags", "remove_tags")
+
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        if request.resolver_match and request.resolver_match.url_name.endswith("changelist"):
+            qs = qs.defer("body_md")
+        return qs
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        return self.paginator(
+            queryset, per_page, orphans, allow_empty_first_page, page_hint=request.GET.get(PAGE_VAR, 1)
+        )
+
+    def _board_ids(self, queryset):
+        return list(queryset.order_by().values_list("column__board_id", flat=True).distinct())
+
+    def save_model(self, request, obj, form, change):
+        previous = (
+            Idea.objects.filter(pk=obj.pk).values_list("column__board_id", "body_md", "title").first()
+            if change
+            else None
+        )
+        super().save_model(request, obj, form, change)
+        if change:
+            previous_board, previous_body, previous_title = previous
+            self._rebuild_stats([previous_board, obj.column.board_id])
+            # Historique (services/revisions.py), comme update_idea
+            if previous_body != obj.body_md or previous_title != obj.title:
+                record_revision(obj, previous_body, previous_title)
+            if {"title", "body_md", "column"} & set(form.changed_data):
+                tasks.defer(duplicates.reindex, obj.pk)
+
+    # ------------------------------------------------------------------
+    # Actions groupées (requêtes ensemblistes, pas de save() par objet)
+    # ------------------------------------------------------------------
+    def _tag_names(self, request):
+        names = normalize_tags_value(request.POST.get("tags", ""))
+        if not names:
+            self.message_user(request, "Indiquer au moins un tag.", messages.WARNING)
+        return names
+
+    @admin.action(description="Déplacer vers la colonne choisie (en fin de colonne)")
+    def move_to_column(self, request, queryset):
+        # Seul le champ colonne est validé (les choix de `action` sont remplis par l'admin)
+        try:
+            column = self.action_form.base_fields["column"].clean(request.POST.get("column"))
+        except ValidationError:
+            column = None
+        if column is None:
+            self.message_user(request, "Choisir une colonne cible.", messages.WARNING)
+            return
+
+        ids = list(queryset.exclude(column=column).order_by("column", "position", "id").values_list("id", flat=True))
+        if not ids:
+            return
+        board_ids = self._board_ids(queryset)
+        source_columns = set(Idea.objects.filter(id__in=ids).values_list("column_id", flat=True))
+
+        with transaction.atomic():
+            last = Idea.objects.filter(column=column).aggregate(m=Max("position"))["m"]
+            start = 0 if last is None else last + 1
+            now = timezone.now()
+            # Un UPDATE par paquet (limite de paramètres SQLite) : positions à la
+            # suite, dans l'ordre actuel. Les colonnes source gardent des trous,
+            # compactés en arrière-plan après le commit.
+            for offset in range(0, len(ids), self.UPDATE_CHUNK):
+                chunk = ids[offset:offset + self.UPDATE_CHUNK]
+                Idea.objects.filter(id__in=chunk).update(
+                    column=column,
+                    column_entered_at=now,
+                    updated_at=now,
+                    position=Case(
+                        *(When(id=iid, then=Value(start + offset + i)) for i, iid in enumerate(chunk)),
+                        output_field=IntegerField(),
+                    ),
+                )
+            # Index de doublons : suit l'idée si elle change de board
+            for model in (IdeaSignature, IdeaLshBand):
+                model.objects.filter(idea_id__in=ids).exclude(board_id=column.board_id).update(board_id=column.board_id)
+            self._rebuild_stats([*board_ids, column.board_id])
+            for column_id in source_columns:
+                tasks.defer(compact_column, column_id)
+        self.message_user(request, f"{len(ids)} idée(s) déplacée(s) vers « {column} ».", messages.SUCCESS)
+
+    @admin.action(description="Archiver")
+    def archive(self, request, queryset):
+        board_ids = self._board_ids(queryset)
+        with transaction.atomic():
+            count = queryset.exclude(status=IdeaStatus.ARCHIVED).update(
+                status=IdeaStatus.ARCHIVED, updated_at=timezone.now()
+            )
+            self._rebuild_stats(board_ids)
+        self.message_user(request, f"{count} idée(s) archivée(s).", messages.SUCCESS)
+
+    @admin.action(description="Ajouter les tags")
+    def add_tags(self, request, queryset):
+        names = self._tag_names(request)
+        if not names:
+            return
+        through = Idea.tags.through
+        with transaction.atomic():
+            tags = [Tag.objects.get_or_create(name=name)[0] for name in names]
+            ids = list(queryset.values_list("id", flat=True))
+            through.objects.bulk_create(
+                [through(idea_id=iid, tag_id=tag.id) for iid in ids for tag in tags],
+                ignore_conflicts=True,
+                batch_size=500,
+            )
+            self._rebuild_stats(self._board_ids(queryset))
+        self.message_user(request, f"Tags ajoutés à {len(ids)} idée(s).", messages.SUCCESS)
+
+    @admin.action(description="Retirer les tags")
+    def remove_tags(self, request, queryset):
+        names = self._tag_names(request)
+        if not names:
+            return
+        with transaction.atomic():
+            deleted, _ = Idea.tags.through.objects.filter(
+                idea__in=queryset.values("id"), tag__name__in=names
+            ).delete()
+            self._rebuild_stats(self._board_ids(queryset))
+        self.message_user(request, f"{deleted} lien(s) de tag retiré(s).", messages.SUCCESS)
 
 
 @admin.register(Tag)
-class TagAdmin(admin.ModelAdmin):
+class TagAdmin(BoardStatsAdminMixin, admin.ModelAdmin):
     search_fields = ("name",)
 
+    def _board_ids(self, queryset):
+        return list(
+            Idea.objects.filter(tags__in=queryset).order_by().values_list("column__board_id", flat=True).distinct()
+        )
+
 
 @admin.register(IdeaTemplate)
 class IdeaTemplateAdmin(admin.ModelAdmin):
     list_display = ("name", "is_active", "created_at")
     list_filter = ("is_active",)
-    search_fields = ("name", "description", "body_md")
\ No newline at end of file
+    search_fields = ("name", "description", "body_md")
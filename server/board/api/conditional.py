@@ -0,0 +1,140 @@
+"""
+GET conditionnels (ETag → 304) des lectures pollées par le client : liste des
+boards, kanban, détail d'une idée.
+
+Les ETags viennent de `Board.version` / `Board.updated_at`
+(services/versions.py), lus en une requête indexée, sans construire ni
+sérialiser la réponse. Si le client présente le même ETag (`If-None-Match`),
+la vue ne s'exécute pas : 304 sans corps.
+
+Pas de `Last-Modified` : à la seconde près (format HTTP), deux écritures dans
+la même seconde donneraient la même date, donc un 304 périmé à un client qui
+n'envoie que `If-Modified-Since`. Sans Last-Modified, ce header est ignoré.
+
+`Cache-Control: private, no-cache` remplace le `no-store` de json_nostore sur
+ces réponses : le navigateur (ou client/src/lib/api.js) garde la copie mais
+revalide à chaque requête, les proxies partagés ne la stockent pas.
+`Vary: Cookie` : la réponse dépend de la session.
+
+Un utilisateur anonyme ne reçoit pas de validateurs (la vue répond 401 ou une
+liste vide).
+"""
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.db.models import Count, Max, Sum
+from django.utils.cache import get_conditional_response, patch_vary_headers
+
+from ..models import Board
+
+CACHE_CONTROL = "private, no-cache"
+
+
+# ---------------------------------------------------------------------------
+# Validateurs : ETag, ou None (pas de GET conditionnel)
+# ---------------------------------------------------------------------------
+def _board_row(board_id):
+    return Board.objects.filter(id=board_id).values("id", "version", "updated_at")
+
+
+def _from_board(prefix, row, *extra):
+    if row is None:
+        return None  # board inexistant : la vue répond 404
+    parts = [prefix, str(row["id"]), str(row["version"]), *map(str, extra)]
+    return '"%s.%d"' % ("-".join(parts), row["updated_at"].timestamp() * 1e6)
+
+
+def kanban_validators(request, board_id):
+    return _from_board("k", _board_row(board_id).first())
+
+
+async def akanban_validators(request, board_id):
+    return _from_board("k", await _board_row(board_id).afirst())
+
+
+def idea_validators(request, board_id, idea_id):
+    # Toute écriture du board invalide ses détails d'idée : grossier mais sûr,
+    # et une idée supprimée ou déplacée a forcément changé la version.
+    return _from_board("i", _board_row(board_id).first(), idea_id)
+
+
+async def aidea_validators(request, board_id, idea_id):
+    return _from_board("i", await _board_row(board_id).afirst(), idea_id)
+
+
+def _boards_aggregate():
+    # Création, suppression, renommage ou contenu modifié d'un board : l'un de
+    # ces agrégats change (les versions ne font que croître).
+    return {"n": Count("id"), "max_id": Max("id"), "versions": Sum("version"), "last": Max("updated_at")}
+
+
+def _from_boards(request, agg):
+    if agg["last"] is None:
+        return None
+    variant = request.GET.urlencode() or "-"
+    return '"b-%d-%d-%d-%d-%s"' % (
+        agg["n"],
+        agg["max_id"],
+        agg["versions"] or 0,
+        agg["last"].timestamp() * 1e6,
+        variant.replace('"', ""),
+    )
+
+
+def boards_validators(request):
+    return _from_boards(request, Board.objects.aggregate(**_boards_aggregate()))
+
+
+async def aboards_validators(request):
+    return _from_boards(request, await Board.objects.aaggregate(**_boards_aggregate()))
+
+
+# ---------------------------------------------------------------------------
+# Décorateur
+# ---------------------------------------------------------------------------
+def _finish(response, etag):
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response["ETag"] = etag
+        response["Cache-Control"] = CACHE_CONTROL
+        for header in ("Pragma", "Expires"):
+            if header in response:
+                del response[header]
+    patch_vary_headers(response, ("Cookie",))
+    return response
+
+
+def conditional(validators):
+    """
+    Décore une vue GET : `validators(request, *args, **kwargs)` fournit
+    l'ETag. Vue async : validateurs async (`a*_validators`).
+    """
+
+    def decorator(view):
+        if iscoroutinefunction(view):
+
+            @wraps(view)
+            async def async_wrapper(request, *args, **kwargs):
+                user = await request.auser()
+                etag = await validators(request, *args, **kwargs) if user.is_authenticated else None
+                if etag is None:
+                    return await view(request, *args, **kwargs)
+                response = get_conditional_response(request, etag=etag)
+                if response is None:
+                    response = await view(request, *args, **kwargs)
+                return _finish(response, etag)
+
+            return async_wrapper
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            etag = validators(request, *args, **kwargs) if request.user.is_authenticated else None
+            if etag is None:
+                return view(request, *args, **kwargs)
+            response = get_conditional_response(request, etag=etag)
+            if response is None:
+                response = view(request, *args, **kwargs)
+            return _finish(response, etag)
+
+        return wrapper
+
+    return decorator
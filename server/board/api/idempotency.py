@@ -0,0 +1,192 @@
+"""
+Clés d'idempotence pour les endpoints d'écriture.
+
+Un client qui renvoie un POST (Wi-Fi instable, timeout) avec le même en-tête
+`Idempotency-Key` reçoit la réponse mémorisée au lieu de rejouer l'écriture :
+pas de doublon au quick-add, pas de renormalisation répétée au move.
+
+- Clé par utilisateur, conservée BOARD_IDEMPOTENCY_TTL secondes.
+- La table est bornée : les lignes expirées puis les plus anciennes au-delà
+  de BOARD_IDEMPOTENCY_MAX_ROWS sont purgées toutes les
+  BOARD_IDEMPOTENCY_PRUNE_EVERY insertions, en tâche d'arrière-plan.
+- Une ligne "en cours" (status NULL) est posée avant l'exécution : un retry
+  concurrent reçoit 409 au lieu d'exécuter la vue une deuxième fois.
+- Cette réservation expire après BOARD_IDEMPOTENCY_LEASE secondes : si le
+  worker d'origine est mort (crash, timeout), un retry la reprend au lieu de
+  recevoir 409 jusqu'à la fin du TTL. `created_at` sert de jeton : le worker
+  dépossédé ne peut plus écrire ni supprimer la ligne.
+- Les réponses 5xx (et les exceptions) ne sont pas mémorisées : la ligne est
+  supprimée et le client peut réessayer.
+- Les écritures de la table passent par writes.run (rejeu sur « database is
+  locked »), sans verrou de board : elles ne concernent que l'utilisateur.
+"""
+import hashlib
+from datetime import timedelta
+from functools import wraps
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse
+from django.utils import timezone
+
+from . import tasks, writes
+from .debug import debug_log
+from .responses import json_nostore
+from ..models import IdempotencyKey
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+
+
+def _ttl():
+    return timedelta(seconds=getattr(settings, "BOARD_IDEMPOTENCY_TTL", 24 * 3600))
+
+
+def _lease():
+    return timedelta(seconds=getattr(settings, "BOARD_IDEMPOTENCY_LEASE", 60))
+
+
+def _fingerprint(request):
+    digest = hashlib.sha256()
+    digest.update(request.method.encode())
+    digest.update(b"\0")
+    digest.update(request.path.encode())
+    digest.update(b"\0")
+    digest.update(request.body)
+    return digest.hexdigest()
+
+
+def _replay(row):
+    resp = HttpResponse(row.body, status=row.status, content_type=row.content_type or "application/json")
+    resp["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+    resp["Idempotent-Replayed"] = "true"
+    return resp
+
+
+def prune(now=None):
+    """Supprime les clés expirées, puis les plus anciennes au-delà du plafond."""
+    now = now or timezone.now()
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=now - _ttl()).delete()
+
+    max_rows = getattr(settings, "BOARD_IDEMPOTENCY_MAX_ROWS", 10000)
+    cutoff = list(IdempotencyKey.objects.order_by("-id").values_list("id", flat=True)[max_rows:max_rows + 1])
+    if cutoff:
+        more, _ = IdempotencyKey.objects.filter(id__lte=cutoff[0]).delete()
+        deleted += more
+    return deleted
+
+
+def _in_progress():
+    resp = json_nostore({"error": "A request with this Idempotency-Key is in progress"}, status=409)
+    resp["Retry-After"] = "1"
+    return resp
+
+
+def _create(request, key, fingerprint):
+    with transaction.atomic():
+        return IdempotencyKey.objects.create(user_id=request.user.pk, key=key, fingerprint=fingerprint)
+
+
+def _take_over(row):
+    """Reprend une réservation expirée ; False si un autre retry l'a prise avant."""
+    now = timezone.now()
+    taken = IdempotencyKey.objects.filter(pk=row.pk, status__isnull=True, created_at=row.created_at).update(
+        created_at=now
+    )
+    row.created_at = now
+    return bool(taken)
+
+
+def _claim(request, key, fingerprint):
+    """
+    Pose la ligne "en cours". Retourne (row, None) si la requête doit être
+    exécutée, ou (None, réponse) pour un rejeu / conflit.
+    """
+    try:
+        row = _create(request, key, fingerprint)
+    except IntegrityError:
+        existing = IdempotencyKey.objects.filter(user_id=request.user.pk, key=key).first()
+        now = timezone.now()
+        if existing is not None and existing.created_at < now - _ttl():
+            existing.delete()
+            existing = None
+
+        if existing is None:
+            # Expirée ou supprimée entre-temps (purge / 5xx) : on retente une fois
+            try:
+                return _create(request, key, fingerprint), None
+            except IntegrityError:
+                return None, _in_progress()
+
+        if existing.fingerprint != fingerprint:
+            return None, json_nostore(
+                {"error": "Idempotency-Key already used for a different request"}, status=422
+            )
+        if existing.status is None:
+            if existing.created_at < now - _lease() and _take_over(existing):
+                debug_log("[IDEMPOTENCY] stale claim taken over key=%s", key)
+                return existing, None
+            return None, _in_progress()
+
+        debug_log("[IDEMPOTENCY] replay key=%s status=%s", key, existing.status)
+        return None, _replay(existing)
+
+    every = getattr(settings, "BOARD_IDEMPOTENCY_PRUNE_EVERY", 100)
+    if every and row.pk % every == 0:
+        tasks.defer(prune)
+    return row, None
+
+
+def _owned(row):
+    return IdempotencyKey.objects.filter(pk=row.pk, created_at=row.created_at)
+
+
+def _release(row):
+    _owned(row).delete()
+
+
+def _store(row, response):
+    _owned(row).update(
+        status=response.status_code,
+        content_type=response.get("Content-Type", ""),
+        body=response.content.decode(response.charset or "utf-8"),
+    )
+
+
+def idempotent(view):
+    """
+    Décorateur des vues POST : rejoue la réponse mémorisée quand l'en-tête
+    `Idempotency-Key` a déjà été vu pour cet utilisateur (et ce corps).
+    Sans en-tête, ou utilisateur anonyme, la vue s'exécute normalement.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        key = request.headers.get(HEADER, "").strip()
+        if not key or not request.user.is_authenticated:
+            return view(request, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return json_nostore({"error": f"{HEADER} is too long (max {MAX_KEY_LENGTH})"}, status=400)
+
+        try:
+            row, early = writes.run(None, _claim, request, key, _fingerprint(request))
+        except writes.Busy as e:
+            early = json_nostore(e.to_dict(), status=e.status)
+            early["Retry-After"] = "1"
+        if early is not None:
+            return early
+
+        try:
+            response = view(request, *args, **kwargs)
+        except Exception:
+            writes.run(None, _release, row)
+            raise
+
+        if response.status_code >= 500 or getattr(response, "streaming", False):
+            writes.run(None, _release, row)
+            return response
+
+        writes.run(None, _store, row, response)
+        return response
+
+    return wrapper
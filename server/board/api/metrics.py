@@ -0,0 +1,302 @@
+"""
+Registre de métriques en mémoire (compteurs + histogrammes à buckets fixes),
+exposé au format texte Prometheus par `views_metrics.metrics_api`.
+
+- Activé par BOARD_METRICS_ENABLED (DJANGO_METRICS=1) ; désactivé, les
+  helpers `record_*` / `observe_*` retournent immédiatement.
+- Thread-safe : un verrou unique protège le registre (sections très courtes).
+- Multi-workers (gunicorn) : chaque process a son registre. Si
+  BOARD_METRICS_DIR est défini, chaque worker y dépose périodiquement un
+  instantané JSON et l'endpoint agrège tous les fichiers (sommes). Les
+  fichiers d'un process mort, ou non rafraîchis depuis
+  BOARD_METRICS_STALE_SECONDS, sont ignorés ; au démarrage (BoardConfig.ready),
+  les premiers sont supprimés, ainsi que celui d'un ancien process de même PID.
+"""
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250, 500)
+SIZE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}
+        self._counters = {}
+        self._histograms = {}
+        self._last_flush = 0.0
+
+    # -- déclaration ---------------------------------------------------------
+    def counter(self, name, help_text):
+        self._meta[name] = (COUNTER, help_text, None)
+
+    def histogram(self, name, help_text, buckets):
+        self._meta[name] = (HISTOGRAM, help_text, tuple(buckets))
+
+    # -- écriture ------------------------------------------------------------
+    def inc(self, name, labels=(), value=1):
+        key = (name, tuple(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=()):
+        buckets = self._meta[name][2]
+        key = (name, tuple(labels))
+        with self._lock:
+            state = self._histograms.get(key)
+            if state is None:
+                # [compte par bucket..., +Inf] + somme
+                state = self._histograms[key] = [0] * (len(buckets) + 1) + [0.0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(buckets)] += 1
+            state[-1] += value
+
+    # -- lecture -------------------------------------------------------------
+    def snapshot(self):
+        with self._lock:
+            return {
+                "counters": [[n, list(l), v] for (n, l), v in self._counters.items()],
+                "histograms": [[n, list(l), list(s)] for (n, l), s in self._histograms.items()],
+            }
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # -- multi-process -------------------------------------------------------
+    def maybe_flush(self):
+        """Dépose l'instantané du process dans BOARD_METRICS_DIR (au plus toutes les N s)."""
+        directory = getattr(settings, "BOARD_METRICS_DIR", "")
+        if not directory:
+            return
+        now = time.monotonic()
+        if now - self._last_flush < getattr(settings, "BOARD_METRICS_FLUSH_SECONDS", 5):
+            return
+        self._last_flush = now
+        write_snapshot(Path(directory), self.snapshot())
+
+
+REGISTRY = Registry()
+
+REGISTRY.counter("board_http_requests_total", "Requêtes HTTP par route, méthode et statut.")
+REGISTRY.histogram(
+    "board_http_request_duration_seconds", "Latence des requêtes HTTP par route.", LATENCY_BUCKETS
+)
+REGISTRY.histogram("board_db_queries_per_request", "Requêtes SQL par requête HTTP.", QUERY_BUCKETS)
+REGISTRY.histogram(
+    "board_move_renormalized_cards", "Cartes renormalisées par déplacement (move_idea).", SIZE_BUCKETS
+)
+REGISTRY.counter("board_cache_requests_total", "Accès cache par cache et résultat (hit/miss).")
+REGISTRY.counter("board_tasks_total", "Tâches d'arrière-plan par tâche et résultat (ok/retry/failed/inline).")
+REGISTRY.counter("board_writes_total", "Transactions d'écriture (writes.run) par résultat (ok/retry/busy).")
+
+
+def enabled():
+    return getattr(settings, "BOARD_METRICS_ENABLED", False)
+
+
+# -----------------------------------------------------------------------------
+# Helpers appelés par le middleware et les services
+# -----------------------------------------------------------------------------
+def record_request(route, method, status, duration, queries):
+    if not enabled():
+        return
+    REGISTRY.inc("board_http_requests_total", (("route", route), ("method", method), ("status", str(status))))
+    REGISTRY.observe("board_http_request_duration_seconds", duration, (("route", route),))
+    REGISTRY.observe("board_db_queries_per_request", queries, (("route", route),))
+    REGISTRY.maybe_flush()
+
+
+def observe_move(kind, cards):
+    if not enabled():
+        return
+    REGISTRY.observe("board_move_renormalized_cards", cards, (("kind", kind),))
+
+
+def record_cache(cache, hit):
+    if not enabled():
+        return
+    REGISTRY.inc("board_cache_requests_total", (("cache", cache), ("result", "hit" if hit else "miss")))
+
+
+def record_task(task, result):
+    if not enabled():
+        return
+    REGISTRY.inc("board_tasks_total", (("task", task), ("result", result)))
+
+
+def record_write(result):
+    if not enabled():
+        return
+    REGISTRY.inc("board_writes_total", (("result", result),))
+
+
+# -----------------------------------------------------------------------------
+# Agrégation multi-process
+# -----------------------------------------------------------------------------
+def write_snapshot(directory, snapshot):
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"metrics-{os.getpid()}.json"
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(snapshot), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _snapshot_pid(path):
+    try:
+        return int(path.stem.split("-", 1)[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # EPERM : le process existe (autre utilisateur)
+    return True
+
+
+def _is_stale(path, now):
+    """Instantané d'un worker mort, ou trop ancien pour être encore le sien."""
+    pid = _snapshot_pid(path)
+    if pid is None or not _pid_alive(pid):
+        return True
+    max_age = getattr(settings, "BOARD_METRICS_STALE_SECONDS", 3600)
+    try:
+        return path.stat().st_mtime < now - max_age
+    except OSError:
+        return True
+
+
+def prune_snapshots():
+    """
+    Au démarrage d'un worker : supprime les instantanés des process morts et
+    celui d'un ancien process qui avait le même PID (compté deux fois sinon).
+    """
+    directory = getattr(settings, "BOARD_METRICS_DIR", "")
+    if not directory or not Path(directory).is_dir():
+        return 0
+    now = time.time()
+    own_file = f"metrics-{os.getpid()}.json"
+    removed = 0
+    for path in Path(directory).glob("metrics-*.json"):
+        if path.name == own_file or _is_stale(path, now):
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            removed += 1
+    return removed
+
+
+def merge_snapshots(snapshots):
+    counters = {}
+    histograms = {}
+    for snap in snapshots:
+        for name, labels, value in snap.get("counters", []):
+            key = (name, tuple(tuple(l) for l in labels))
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, state in snap.get("histograms", []):
+            key = (name, tuple(tuple(l) for l in labels))
+            current = histograms.get(key)
+            histograms[key] = list(state) if current is None else [a + b for a, b in zip(current, state)]
+    return counters, histograms
+
+
+def collect():
+    """Instantané du process courant + ceux des autres workers (si BOARD_METRICS_DIR)."""
+    own = REGISTRY.snapshot()
+    snapshots = [own]
+    directory = getattr(settings, "BOARD_METRICS_DIR", "")
+    if directory:
+        own_file = f"metrics-{os.getpid()}.json"
+        now = time.time()
+        for path in Path(directory).glob("metrics-*.json"):
+            if path.name == own_file or _is_stale(path, now):
+                continue
+            try:
+                snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError):
+                continue
+    return merge_snapshots(snapshots)
+
+
+# -----------------------------------------------------------------------------
+# Format texte Prometheus
+# -----------------------------------------------------------------------------
+def _labels(pairs):
+    if not pairs:
+        return ""
+    inner = ",".join(
+        '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in pairs
+    )
+    return "{" + inner + "}"
+
+
+def _fmt(value):
+    if isinstance(value, float) and math.isinf(value):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render():
+    counters, histograms = collect()
+    lines = []
+
+    for name, (kind, help_text, buckets) in REGISTRY._meta.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        if kind == COUNTER:
+            for (n, labels), value in sorted(counters.items()):
+                if n == name:
+                    lines.append(f"{name}{_labels(labels)} {_fmt(value)}")
+            continue
+
+        for (n, labels), state in sorted(histograms.items()):
+            if n != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*buckets, math.inf), state[:-1]):
+                cumulative += count
+                le = "+Inf" if math.isinf(bound) else _fmt(float(bound))
+                lines.append(f"{name}_bucket{_labels((*labels, ('le', le)))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {_fmt(state[-1])}")
+            lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+
+    # Taux de hit par cache, calculé à partir des compteurs hit/miss
+    ratios = {}
+    for (n, labels), value in counters.items():
+        if n != "board_cache_requests_total":
+            continue
+        data = dict(labels)
+        hits, total = ratios.get(data["cache"], (0, 0))
+        ratios[data["cache"]] = (hits + (value if data["result"] == "hit" else 0), total + value)
+    if ratios:
+        lines.append("# HELP board_cache_hit_ratio Taux de hit par cache (depuis le démarrage).")
+        lines.append("# TYPE board_cache_hit_ratio gauge")
+        for cache, (hits, total) in sorted(ratios.items()):
+            lines.append(f"board_cache_hit_ratio{_labels((('cache', cache),))} {_fmt(hits / total)}")
+
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,448 @@
+"""
+Opérations d'écriture sur les idées et les colonnes, indépendantes de la requête HTTP.
+
+Chaque opération prend les identifiants de l'URL et le payload déjà décodé,
+et retourne `(data, status)`. Les erreurs de validation lèvent
+`OperationError`; les objets introuvables lèvent `Http404` (get_object_or_404).
+
+Partagées par les vues unitaires (views_ideas) et par l'endpoint batch
+(views_batch), qui enchaîne plusieurs opérations dans une transaction.
+"""
+from __future__ import annotations
+
+import json
+
+from django.conf import settings
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+
+from . import tasks
+from .debug import debug_log
+from .parsing import get_flag, get_int
+from .serializers import serialize_idea_card, serialize_idea_detail
+from .services import columns, duplicates, stats
+from .services.ideas import change_column, move_idea, quick_add_idea, reorder_column
+from .services.patches import PatchError, StalePatchError, apply_patch, body_hash
+from .services.revisions import record_revision
+from ..models import Board, Column, Idea, IdeaStatus, Tag
+
+
+class OperationError(Exception):
+    """Erreur de validation : message renvoyé au client tel quel."""
+
+    def __init__(self, message, status=400, **extra):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+        self.extra = extra
+
+    def to_dict(self):
+        return {"error": self.message, **self.extra}
+
+
+# -----------------------------------------------------------------------------
+# Helpers
+# -----------------------------------------------------------------------------
+def get_board(board_id: int) -> Board:
+    return get_object_or_404(Board, id=board_id)
+
+
+def get_column_in_board(board: Board, column_id: int) -> Column:
+    return get_object_or_404(Column, id=column_id, board=board)
+
+
+def get_idea_in_board(board: Board, idea_id: int) -> Idea:
+    return get_object_or_404(
+        Idea.objects.select_related("column").prefetch_related("tags"),
+        id=idea_id,
+        column__board=board,
+    )
+
+
+def normalize_tags_value(tags_val):
+    """Accept str 'a,b' or list; return list[str]."""
+    if isinstance(tags_val, str):
+        return [t.strip() for t in tags_val.split(",") if t.strip()]
+    if isinstance(tags_val, list):
+        return [str(t).strip() for t in tags_val if str(t).strip()]
+    return []
+
+
+# -----------------------------------------------------------------------------
+# Opérations
+# -----------------------------------------------------------------------------
+def update_idea(board_id, idea_id, payload):
+    """
+    Mise à jour des champs d'une idée (édition).
+    Champs optionnels : title, body_md | body_patch, next_action, impact,
+    column_id, tags. Un champ inchangé n'est pas réécrit.
+    """
+    board = get_board(board_id)
+    idea = get_idea_in_board(board, idea_id)
+    previous_body, previous_title = idea.body_md, idea.title
+    previous_status, previous_impact = idea.status, idea.impact
+
+    updated_fields = []
+    new_column = None
+
+    # title
+    if "title" in payload:
+        title = (payload.get("title") or "").strip()
+        if not title:
+            raise OperationError("Title is required")
+        if title != idea.title:
+            idea.title = title
+            updated_fields.append("title")
+
+    # body_md (document complet) ou body_patch (plages modifiées, voir services/patches.py)
+    if "body_md" in payload and "body_patch" in payload:
+        raise OperationError("Send either body_md or body_patch, not both")
+    base_body = None
+    if "body_md" in payload:
+        body = payload.get("body_md") or ""
+    elif "body_patch" in payload:
+        base_body = idea.body_md
+        try:
+            body = apply_patch(
+                idea.body_md,
+                payload.get("body_patch"),
+                max_ops=getattr(settings, "BOARD_PATCH_MAX_OPS", 1000),
+            )
+        except StalePatchError as e:
+            raise OperationError("body_md changed since base", status=409, body_hash=e.current_hash)
+        except PatchError as e:
+            raise OperationError(str(e))
+    else:
+        body = None
+    if body is not None and body != idea.body_md:
+        idea.body_md = body
+        updated_fields.append("body_md")
+
+    # next_action (optional field)
+    if "next_action" in payload and hasattr(idea, "next_action"):
+        next_action = payload.get("next_action") or ""
+        if next_action != idea.next_action:
+            idea.next_action = next_action
+            updated_fields.append("next_action")
+
+    # status (optional field)
+    if "status" in payload:
+        status = payload.get("status")
+        if status not in IdeaStatus.values:
+            raise OperationError(f"status must be one of {', '.join(IdeaStatus.values)}")
+        if status != idea.status:
+            idea.status = status
+            updated_fields.append("status")
+
+    # impact (optional field)
+    if "impact" in payload and hasattr(idea, "impact"):
+        impact_raw = payload.get("impact")
+        if impact_raw in (None, ""):
+            impact_int = None
+        else:
+            impact_int = get_int(payload, "impact", default="__invalid__")
+            if impact_int == "__invalid__":
+                raise OperationError("Impact must be an integer")
+        if impact_int != idea.impact:
+            idea.impact = impact_int
+            updated_fields.append("impact")
+
+    # column switch (optional)
+    if "column_id" in payload:
+        col_id = get_int(payload, "column_id")
+        if col_id is None:
+            raise OperationError("column_id must be an integer")
+
+        new_col = get_object_or_404(Column, id=col_id, board=board)
+        if idea.column_id != new_col.id:
+            new_column = new_col
+
+    # Save core fields + compteurs + révision, dans la même transaction
+    with transaction.atomic():
+        if new_column is not None:
+            change_column(board, idea, new_column)
+            updated_fields += ["column", "column_entered_at"]
+
+        if updated_fields and base_body is not None and "body_md" in updated_fields:
+            # Patch : compare-and-set sur le body de base, un patch concurrent
+            # appliqué entre la lecture et l'écriture donne un 409.
+            idea.updated_at = timezone.now()
+            fields = [Idea._meta.get_field(f).attname for f in [*updated_fields, "updated_at"]]
+            written = Idea.objects.filter(pk=idea.pk, body_md=base_body).update(
+                **{f: getattr(idea, f) for f in fields}
+            )
+            if not written:
+                current = Idea.objects.filter(pk=idea.pk).values_list("body_md", flat=True).first()
+                raise OperationError("body_md changed since base", status=409, body_hash=body_hash(current))
+        elif updated_fields:
+            idea.save(update_fields=[*updated_fields, "updated_at"])
+
+        if "status" in updated_fields:
+            stats.field_changed(board.id, stats.STATUS, previous_status, idea.status)
+        if "impact" in updated_fields:
+            stats.field_changed(board.id, stats.IMPACT, previous_impact, idea.impact)
+
+        # Historique (services/revisions.py) et index de doublons : seulement si
+        # titre ou body ont changé
+        if "body_md" in updated_fields or "title" in updated_fields:
+            record_revision(idea, previous_body, previous_title)
+            tasks.defer(duplicates.reindex, idea.id)
+
+    # Tags (optional)
+    if "tags" in payload and hasattr(idea, "tags"):
+        tags_list = normalize_tags_value(payload.get("tags"))
+        # Savepoint : tout ou rien pour les tags. Une erreur base remonte (la
+        # transaction de writes.run ou du batch est annulée) au lieu d'être
+        # avalée dans une transaction qu'elle a pu laisser inutilisable.
+        with transaction.atomic():
+            tag_objs = [Tag.objects.get_or_create(name=name)[0] for name in tags_list]
+            idea.tags.set(tag_objs)
+
+        # refresh to return current tags/column
+        idea = get_idea_in_board(board, idea.id)
+
+    data = {"idea": serialize_idea_detail(idea)}
+    if get_flag(payload, "check_duplicates"):
+        data["duplicates"] = duplicates.find_duplicates(board.id, idea.title, idea.body_md, exclude_id=idea.id)
+    return data, 200
+
+
+def move(board_id, idea_id, payload):
+    """
+    Move/reorder via DnD.
+    Le service gère la persistance de la position.
+    """
+    debug_log("[MOVE] board_id=%s idea_id=%s payload=%s", board_id, idea_id, payload)
+
+    # Accept multiple client keys (legacy compatible)
+    to_column_id = payload.get("to_column_id")
+    column_id = payload.get("column_id") or payload.get("column")
+    column_id = to_column_id or column_id
+
+    if not column_id:
+        raise OperationError("to_column_id/column_id is required")
+
+    try:
+        to_column_id = int(column_id)
+    except Exception:
+        raise OperationError("to_column_id/column_id must be an integer")
+
+    # target_index may be missing; accept synonyms
+    target_index = payload.get("target_index", payload.get("position", payload.get("order")))
+    try:
+        target_index = int(target_index) if target_index is not None else None
+    except Exception:
+        target_index = None
+
+    idea = move_idea(
+        board_id=int(board_id),
+        idea_id=int(idea_id),
+        to_column_id=int(to_column_id),
+        target_index=target_index,
+    )
+
+    return {
+        "ok": True,
+        "idea": {
+            "id": idea.id,
+            "column_id": idea.column_id,
+            **({"position": idea.position} if hasattr(idea, "position") else {}),
+        },
+    }, 200
+
+
+def reorder(board_id, column_id, payload):
+    """
+    Reorder strict d'une colonne (drag intra-colonne).
+    """
+    ordered_ids = payload.get("ordered_ids") or payload.get("orderedIds") or payload.get("ids")
+    if isinstance(ordered_ids, str):
+        try:
+            ordered_ids = json.loads(ordered_ids)
+        except Exception:
+            pass
+
+    if not isinstance(ordered_ids, list) or not ordered_ids:
+        raise OperationError("ordered_ids must be a non-empty list")
+
+    try:
+        ordered_ids = [int(i) for i in ordered_ids]
+    except Exception:
+        raise OperationError("ordered_ids must be integers")
+
+    debug_log("[REORDER] board_id=%s column_id=%s size=%s", board_id, column_id, len(ordered_ids))
+
+    try:
+        reorder_column(board_id=int(board_id), column_id=int(column_id), ordered_ids=ordered_ids)
+    except ValueError:
+        raise OperationError("Some ideas do not belong to this column")
+
+    return {"ok": True}, 200
+
+
+def _column_data(column):
+    return {"id": column.id, "name": column.name, "order": column.order}
+
+
+def _optional_int(payload, key):
+    value = payload.get(key)
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except Exception:
+        raise OperationError(f"{key} must be an integer")
+
+
+def create_column(board_id, payload):
+    """Nouvelle colonne : {"name", "index"?} (fin de board par défaut)."""
+    board = get_board(board_id)
+    index = _optional_int(payload, "index")
+    try:
+        column = columns.create_column(board, payload.get("name"), index=index)
+    except ValueError as e:
+        raise OperationError(str(e))
+    return {"column": _column_data(column)}, 201
+
+
+def rename_column(board_id, column_id, payload):
+    board = get_board(board_id)
+    column = get_column_in_board(board, column_id)
+    try:
+        column = columns.rename_column(board, column, payload.get("name"))
+    except ValueError as e:
+        raise OperationError(str(e))
+    return {"column": _column_data(column)}, 200
+
+
+def delete_column(board_id, column_id, payload):
+    """
+    Suppression d'une colonne : ses idées passent en fin de `target_column_id`
+    (obligatoire si la colonne n'est pas vide).
+    """
+    board = get_board(board_id)
+    column = get_column_in_board(board, column_id)
+    target_id = _optional_int(payload, "target_column_id")
+    target = get_column_in_board(board, target_id) if target_id is not None else None
+    try:
+        moved = columns.delete_column(board, column, target)
+    except ValueError as e:
+        raise OperationError(str(e))
+    return {"ok": True, "moved": moved, "target_column_id": target.id if target else None}, 200
+
+
+def reorder_columns(board_id, payload):
+    """Ordre complet des colonnes : {"column_ids": [...]}."""
+    board = get_board(board_id)
+    column_ids = payload.get("column_ids") or payload.get("ordered_ids")
+    if not isinstance(column_ids, list) or not column_ids:
+        raise OperationError("column_ids must be a non-empty list")
+    try:
+        column_ids = [int(i) for i in column_ids]
+    except Exception:
+        raise OperationError("column_ids must be integers")
+
+    try:
+        columns.reorder_columns(board, column_ids)
+    except ValueError as e:
+        raise OperationError(str(e))
+    ordered = Column.objects.filter(board=board).order_by("order", "id")
+    return {"columns": [_column_data(c) for c in ordered]}, 200
+
+
+def parse_quick_add_text(raw_text):
+    """
+    Simple inline parsing: #tag @column !impact
+    Retourne (title, tag_names, column_hint, impact_value).
+    """
+    words = raw_text.split()
+    tag_names = []
+    column_hint = None
+    impact_value = None
+    remaining = []
+
+    for w in words:
+        if w.startswith("#") and len(w) > 1:
+            name = w[1:].strip().strip(",;")
+            if name:
+                tag_names.append(name)
+            continue
+
+        if w.startswith("@") and len(w) > 1:
+            name = w[1:].strip().strip(",;")
+            if name:
+                column_hint = name
+            continue
+
+        if w.startswith("!") and len(w) > 1:
+            n = w[1:].strip().strip(",;")
+            try:
+                impact_value = int(n)
+                continue
+            except Exception:
+                pass
+
+        remaining.append(w)
+
+    title = " ".join(remaining).strip() or raw_text
+    return title, tag_names, column_hint, impact_value
+
+
+def quick_add(board_id, payload):
+    """
+    Quick add: parse du texte (#tags @colonne !impact) + création.
+    La création en base (position fin de colonne) est déportée dans le service.
+    """
+    raw_text = (payload.get("text") or payload.get("title") or "").strip()
+    column_id = payload.get("column_id")
+
+    if not raw_text:
+        raise OperationError("Text or title is required")
+
+    board = get_board(board_id)
+
+    title, tag_names, column_hint, impact_value = parse_quick_add_text(raw_text)
+
+    # Resolve destination column_id
+    resolved_column_id = None
+
+    if column_id is not None:
+        try:
+            resolved_column_id = int(column_id)
+        except Exception:
+            raise OperationError("column_id must be an integer")
+    elif column_hint:
+        col = Column.objects.filter(board=board, name__iexact=column_hint).order_by("order", "id").first()
+        if col:
+            resolved_column_id = col.id
+
+    # Create idea (service sets position at end when supported, impact included)
+    try:
+        idea = quick_add_idea(
+            board_id=int(board_id), title=title, column_id=resolved_column_id, impact=impact_value
+        )
+    except ValueError as e:
+        raise OperationError(str(e))
+
+    # tags (optional)
+    if tag_names and hasattr(idea, "tags"):
+        try:
+            from ..models import Tag
+
+            for name in tag_names:
+                tag, _ = Tag.objects.get_or_create(name=name)
+                idea.tags.add(tag)
+        except Exception:
+            pass
+
+        # refresh for tags
+        try:
+            idea = get_idea_in_board(board, idea.id)
+        except Exception:
+            pass
+
+    data = {"idea": serialize_idea_card(idea)}
+    if get_flag(payload, "check_duplicates"):
+        data["duplicates"] = duplicates.find_duplicates(board.id, idea.title, exclude_id=idea.id)
+    return data, 201
@@ -40,4 +40,11 @@ def get_int(payload, key, default=None):
             return default
         return int(value)
     except (TypeError, ValueError):
-        return default
\ No newline at end of file
+        return default
+
+def get_flag(payload, key):
+    """Booléen tolérant : true / "1" / "true" / "yes" / "on"."""
+    value = payload.get(key)
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ("1", "true", "yes", "on") if value is not None else False
@@ -1,10 +1,20 @@
+import time
+
 from django.conf import settings
 from django.http import JsonResponse
 
+from .timing import current_timing
+
 
 def json_nostore(data, status=200):
     """JsonResponse with cache disabled (important for Safari / proxies)."""
-    resp = JsonResponse(data, status=status)
+    timing = current_timing()
+    if timing is None:
+        resp = JsonResponse(data, status=status)
+    else:
+        started = time.perf_counter()
+        resp = JsonResponse(data, status=status)
+        timing.encode += time.perf_counter() - started
     resp["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
     resp["Pragma"] = "no-cache"
     resp["Expires"] = "0"
@@ -3,12 +3,22 @@ from __future__ import annotations
 from typing import Any, Dict, List
 
 from ..models import Board, Column, Idea
+from .services.patches import body_hash
 
 
 def serialize_board(board: Board) -> Dict[str, Any]:
     return {"id": board.id, "name": board.name}
 
 
+def serialize_auth_state(user) -> Dict[str, Any]:
+    if user.is_authenticated:
+        return {
+            "authenticated": True,
+            "user": {"id": user.id, "username": user.get_username(), "email": user.email},
+        }
+    return {"authenticated": False, "user": None}
+
+
 def serialize_tag_names(idea: Idea) -> List[str]:
     if hasattr(idea, "tags"):
         try:
@@ -46,6 +56,7 @@ def serialize_idea_detail(idea: Idea) -> Dict[str, Any]:
         "id": idea.id,
         "title": idea.title,
         "body_md": getattr(idea, "body_md", ""),
+        "body_hash": body_hash(getattr(idea, "body_md", "")),
         "status": getattr(idea, "status", None),
         "impact": getattr(idea, "impact", None),
         "next_action": getattr(idea, "next_action", None),
@@ -57,3 +68,16 @@ def serialize_idea_detail(idea: Idea) -> Dict[str, Any]:
     if hasattr(idea, "position"):
         data["position"] = idea.position
     return data
+
+
+def serialize_revision(revision) -> Dict[str, Any]:
+    """Révision d'idée (instance IdeaRevision ou dict issu de .values())."""
+    get = revision.get if isinstance(revision, dict) else (lambda k: getattr(revision, k))
+    created_at = get("created_at")
+    return {
+        "number": get("number"),
+        "kind": get("kind"),
+        "title": get("title"),
+        "body_size": get("body_size"),
+        "created_at": created_at.isoformat() if created_at else None,
+    }
@@ -0,0 +1,140 @@
+from django.db.models import Count, F, Max, Window
+from django.db.models.functions import RowNumber
+
+from ...models import Board, Column, Idea
+from ..serializers import serialize_board, serialize_idea_card
+
+OVERVIEW_MAX_RECENT = 20
+
+
+def _boards_qs(overview=False):
+    qs = Board.objects.order_by("id")
+    if overview:
+        return qs.values("id", "name", "updated_at")
+    return qs.values("id", "name")
+
+
+def _overview_querysets(recent):
+    """
+    Agrégats de tous les boards en requêtes fixes :
+    - comptes par (board, statut) + dernière mise à jour : un GROUP BY ;
+    - N cartes les plus récentes par board : ROW_NUMBER() partitionné par board,
+      filtré sur le rang (+ préchargement des tags).
+    """
+    recent = max(0, min(recent, OVERVIEW_MAX_RECENT))
+    counts_qs = (
+        Idea.objects.values(board_id=F("column__board_id"), idea_status=F("status"))
+        .annotate(n=Count("id"), last=Max("updated_at"))
+        .order_by()
+    )
+    recent_qs = None
+    if recent > 0:
+        recent_qs = (
+            Idea.objects.annotate(
+                board_id=F("column__board_id"),
+                rank=Window(
+                    RowNumber(),
+                    partition_by=[F("column__board_id")],
+                    order_by=[F("updated_at").desc(), F("id").desc()],
+                ),
+            )
+            .filter(rank__lte=recent)
+            .defer("body_md")
+            .prefetch_related("tags")
+            .order_by("board_id", "rank")
+        )
+    return counts_qs, recent_qs
+
+
+def _assemble_overview(boards, counts, recent_ideas):
+    by_board = {b["id"]: {**b, "counts": {}, "total": 0, "recent": []} for b in boards}
+    for row in counts:
+        entry = by_board.get(row["board_id"])
+        if entry is None:
+            continue
+        entry["counts"][row["idea_status"]] = row["n"]
+        entry["total"] += row["n"]
+        if row["last"] and row["last"] > entry["updated_at"]:
+            entry["updated_at"] = row["last"]
+    for idea in recent_ideas:
+        entry = by_board.get(idea.board_id)
+        if entry is not None:
+            entry["recent"].append(serialize_idea_card(idea))
+    for entry in by_board.values():
+        entry["updated_at"] = entry["updated_at"].isoformat()
+    return list(by_board.values())
+
+
+def list_boards(overview=False, recent=3):
+    """
+    Liste des boards. Avec `overview`, chaque board porte aussi ses comptes par
+    statut, sa dernière activité et ses `recent` cartes les plus récentes :
+    4 requêtes au plus, quel que soit le nombre de boards.
+    """
+    boards = list(_boards_qs(overview))
+    if not overview:
+        return boards
+    counts_qs, recent_qs = _overview_querysets(recent)
+    return _assemble_overview(boards, list(counts_qs), list(recent_qs) if recent_qs is not None else [])
+
+
+async def alist_boards(overview=False, recent=3):
+    boards = [row async for row in _boards_qs(overview)]
+    if not overview:
+        return boards
+    counts_qs, recent_qs = _overview_querysets(recent)
+    counts = [row async for row in counts_qs]
+    recent_ideas = [idea async for idea in recent_qs] if recent_qs is not None else []
+    return _assemble_overview(boards, counts, recent_ideas)
+
+
+def _kanban_querysets(board):
+    columns_qs = Column.objects.filter(board=board).order_by("order", "id")
+    # Les cartes n'affichent pas le Markdown : body_md n'est pas chargé.
+    ideas_qs = (
+        Idea.objects.filter(column__board=board)
+        .defer("body_md")
+        .prefetch_related("tags")
+    )
+
+    if hasattr(Idea, "position"):
+        ideas_qs = ideas_qs.order_by("column_id", "position", "id")
+    else:
+        ideas_qs = ideas_qs.order_by("column_id", "id")
+    return columns_qs, ideas_qs
+
+
+def _assemble_kanban(board, columns, ideas):
+    ideas_by_col = {}
+    for idea in ideas:
+        ideas_by_col.setdefault(idea.column_id, []).append(serialize_idea_card(idea))
+
+    return {
+        "board": serialize_board(board),
+        "columns": [
+            {
+                "id": col.id,
+                "name": col.name,
+                "order": getattr(col, "order", None),
+                "ideas": ideas_by_col.get(col.id, []),
+            }
+            for col in columns
+        ],
+    }
+
+
+def kanban_snapshot(board):
+    """
+    Board complet pour l'affichage Kanban : colonnes ordonnées et leurs cartes.
+    Nombre de requêtes fixe (colonnes, idées, tags préchargés).
+    """
+    columns_qs, ideas_qs = _kanban_querysets(board)
+    return _assemble_kanban(board, list(columns_qs), list(ideas_qs))
+
+
+async def akanban_snapshot(board):
+    """Version async (ORM async) de `kanban_snapshot`, mêmes requêtes."""
+    columns_qs, ideas_qs = _kanban_querysets(board)
+    columns = [col async for col in columns_qs]
+    ideas = [idea async for idea in ideas_qs]
+    return _assemble_kanban(board, columns, ideas)
@@ -0,0 +1,151 @@
+"""
+Duplication de board en un nombre fixe d'instructions SQL, quelle que soit sa
+taille :
+
+1. INSERT du board ;
+2. bulk_create des colonnes (mêmes noms / ordres) ;
+3. INSERT ... SELECT des idées, colonne source -> colonne cible par `order` ;
+4. INSERT ... SELECT des liens de tags, idée source -> idée copiée appariées
+   par ROW_NUMBER() (les copies sont insérées dans l'ordre des ids source,
+   elles reçoivent donc des ids croissants dans le même ordre) ;
+5. même appariement pour l'index de doublons (signatures et bandes LSH : le
+   texte est identique, rien n'est recalculé) ;
+6. copie de la matrice de co-occurrence des tags (mêmes paires) ;
+7. recalcul des compteurs de stats du nouveau board.
+
+Avec `include_ideas=False`, seule la structure (colonnes) est copiée : un
+board sert alors de modèle.
+"""
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from ...models import Board, Column, Idea, IdeaLshBand, IdeaSignature, TagCooccurrence
+from ..tracing import span
+from . import stats, tag_suggestions
+
+
+def _copy_ideas(source_id, target_id, now):
+    qn = connection.ops.quote_name
+    idea_table = qn(Idea._meta.db_table)
+    column_table = qn(Column._meta.db_table)
+    now_db = Idea._meta.get_field("created_at").get_db_prep_value(now, connection)
+
+    copied = ("title", "body_md", "status", "position", "impact", "next_action")
+    insert_cols = ", ".join(qn(f) for f in ("created_at", "updated_at", "column_entered_at", "column_id", *copied))
+    select_cols = ", ".join(f"i.{qn(f)}" for f in copied)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {idea_table} ({insert_cols}) "
+            f"SELECT %s, %s, %s, nc.id, {select_cols} "
+            f"FROM {idea_table} i "
+            f"JOIN {column_table} oc ON oc.id = i.column_id "
+            f"JOIN {column_table} nc ON nc.board_id = %s AND nc.{qn('order')} = oc.{qn('order')} "
+            f"WHERE oc.board_id = %s "
+            f"ORDER BY i.id",
+            [now_db, now_db, now_db, target_id, source_id],
+        )
+        return cursor.rowcount
+
+
+def _copy_per_idea(table, columns, source_id, target_id, extra_params=()):
+    """
+    Copie les lignes de `table` (clé idea_id) des idées source vers les idées
+    copiées. `columns` : {colonne cible: expression SQL}, `t` désignant la
+    ligne source.
+    """
+    qn = connection.ops.quote_name
+    idea_table = qn(Idea._meta.db_table)
+    column_table = qn(Column._meta.db_table)
+
+    numbered = (
+        "SELECT i.id, ROW_NUMBER() OVER (ORDER BY i.id) AS rn "
+        f"FROM {idea_table} i JOIN {column_table} c ON c.id = i.column_id "
+        "WHERE c.board_id = %s"
+    )
+    names = ", ".join(qn(name) for name in columns)
+    values = ", ".join(expr for expr in columns.values())
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {qn(table)} (idea_id, {names}) "
+            f"SELECT n.id, {values} "
+            f"FROM ({numbered}) o "
+            f"JOIN ({numbered}) n ON n.rn = o.rn "
+            f"JOIN {qn(table)} t ON t.idea_id = o.id",
+            [*extra_params, source_id, target_id],
+        )
+        return cursor.rowcount
+
+
+def _copy_tag_links(source_id, target_id):
+    table = Idea.tags.through._meta.db_table
+    return _copy_per_idea(table, {"tag_id": "t.tag_id"}, source_id, target_id)
+
+
+def _copy_duplicate_index(source_id, target_id):
+    _copy_per_idea(
+        IdeaSignature._meta.db_table,
+        {"board_id": "%s", "signature": "t.signature"},
+        source_id,
+        target_id,
+        extra_params=[target_id],
+    )
+    _copy_per_idea(
+        IdeaLshBand._meta.db_table,
+        {"board_id": "%s", "band": "t.band", "bucket": "t.bucket"},
+        source_id,
+        target_id,
+        extra_params=[target_id],
+    )
+
+
+def _copy_tag_pairs(source_id, target_id):
+    table = connection.ops.quote_name(TagCooccurrence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} (board_id, tag_id, other_id, count) "
+            f"SELECT %s, tag_id, other_id, count FROM {table} WHERE board_id = %s AND count > 0",
+            [target_id, source_id],
+        )
+    tag_suggestions.invalidate(target_id)
+
+
+def clone_board(source, name, *, include_ideas=True, description=None):
+    """
+    Copie `source` (colonnes, et idées + positions + tags si `include_ideas`)
+    dans un nouveau board `name`. Retourne (board, {"columns", "ideas", "tag_links"}).
+    """
+    name = (name or "").strip()
+    if not name:
+        raise ValueError("Name is required")
+
+    with span("clone_board", source_id=source.id, include_ideas=include_ideas), transaction.atomic():
+        try:
+            with transaction.atomic():
+                board = Board.objects.create(
+                    name=name,
+                    description=source.description if description is None else description,
+                )
+        except IntegrityError:
+            raise ValueError("A board with this name already exists")
+
+        columns = Column.objects.bulk_create(
+            [
+                Column(board=board, name=col.name, order=col.order)
+                for col in Column.objects.filter(board=source).order_by("order", "id")
+            ]
+        )
+
+        counts = {"columns": len(columns), "ideas": 0, "tag_links": 0}
+        if include_ideas and columns:
+            with span("clone_board.ideas"):
+                counts["ideas"] = _copy_ideas(source.id, board.id, timezone.now())
+            with span("clone_board.tags"):
+                counts["tag_links"] = _copy_tag_links(source.id, board.id)
+            with span("clone_board.duplicate_index"):
+                _copy_duplicate_index(source.id, board.id)
+            _copy_tag_pairs(source.id, board.id)
+            # INSERT ... SELECT : pas de signaux, compteurs recalculés
+            stats.rebuild(board)
+
+    return board, counts
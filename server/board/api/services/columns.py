@@ -0,0 +1,118 @@
+"""
+Gestion des colonnes d'un board (création, renommage, suppression, ordre).
+
+La contrainte `uniq_column_order_per_board` est vérifiée ligne par ligne :
+un échange d'ordres entre deux colonnes échoue si on écrit directement les
+valeurs finales. Le réordonnancement se fait donc en deux UPDATE, quel que
+soit le nombre de colonnes :
+
+1. décalage de toutes les colonnes au-delà des valeurs existantes
+   (`order + décalage`, aucune collision possible) ;
+2. écriture des ordres finaux 0..n-1 par un `CASE`.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Case, F, IntegerField, Max, Value, When
+from django.utils import timezone
+
+from ...models import Column, Idea
+from ..tracing import span
+from . import stats
+
+
+def _clean_name(name):
+    name = (name or "").strip()
+    if not name:
+        raise ValueError("Name is required")
+    if len(name) > Column._meta.get_field("name").max_length:
+        raise ValueError("Name is too long")
+    return name
+
+
+def _write_order(board, ordered_ids):
+    """Ordres 0..n-1 dans l'ordre de `ordered_ids` (toutes les colonnes du board)."""
+    columns = Column.objects.filter(board=board)
+    offset = (columns.aggregate(m=Max("order"))["m"] or 0) + 1
+    columns.update(order=F("order") + offset)
+    columns.update(
+        order=Case(
+            *(When(id=cid, then=Value(index)) for index, cid in enumerate(ordered_ids)),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def create_column(board, name, index=None):
+    """Ajoute une colonne en fin de board, ou à `index` (les suivantes sont décalées)."""
+    name = _clean_name(name)
+    with span("create_column", board_id=board.id), transaction.atomic():
+        ids = list(Column.objects.filter(board=board).order_by("order", "id").values_list("id", flat=True))
+        last = Column.objects.filter(board=board).aggregate(m=Max("order"))["m"]
+        try:
+            with transaction.atomic():
+                column = Column.objects.create(board=board, name=name, order=0 if last is None else last + 1)
+        except IntegrityError:
+            raise ValueError("A column with this name already exists")
+
+        if index is not None and index < len(ids):
+            ids.insert(max(0, index), column.id)
+            _write_order(board, ids)
+            column.refresh_from_db(fields=["order"])
+    return column
+
+
+def rename_column(board, column, name):
+    name = _clean_name(name)
+    if name == column.name:
+        return column
+    try:
+        with transaction.atomic():
+            Column.objects.filter(id=column.id).update(name=name, updated_at=timezone.now())
+    except IntegrityError:
+        raise ValueError("A column with this name already exists")
+    column.name = name
+    return column
+
+
+def reorder_columns(board, ordered_ids):
+    """Nouvel ordre complet des colonnes du board (2 UPDATE, une transaction)."""
+    ids = [int(i) for i in ordered_ids]
+    with span("reorder_columns", board_id=board.id, columns=len(ids)), transaction.atomic():
+        current = set(Column.objects.select_for_update().filter(board=board).values_list("id", flat=True))
+        if len(ids) != len(set(ids)) or set(ids) != current:
+            raise ValueError("column_ids must list every column of the board exactly once")
+        _write_order(board, ids)
+
+
+def delete_column(board, column, target=None):
+    """
+    Supprime `column`. Ses idées passent en bloc en fin de `target` (un UPDATE,
+    ordre conservé) ; la suppression ne cascade donc sur aucune idée.
+    Retourne le nombre d'idées déplacées.
+    """
+    with span("delete_column", board_id=board.id, column_id=column.id), transaction.atomic():
+        ideas = Idea.objects.filter(column=column)
+        moved = 0
+        if ideas.exists():
+            if target is None:
+                raise ValueError("target_column_id is required when the column has ideas")
+            if target.id == column.id:
+                raise ValueError("Target column must differ from the deleted column")
+
+            last = Idea.objects.filter(column=target).aggregate(m=Max("position"))["m"]
+            start = 0 if last is None else last + 1
+            base = ideas.order_by("position").values_list("position", flat=True).first() or 0
+            now = timezone.now()
+            # Positions relatives conservées : la colonne source peut avoir des trous,
+            # que l'ordre (position, id) tolère.
+            moved = ideas.update(
+                column=target,
+                position=F("position") - base + start,
+                column_entered_at=now,
+                updated_at=now,
+            )
+            stats.column_merged(board.id, column.id, target.id, moved, now)
+        else:
+            stats.column_merged(board.id, column.id, None, 0, timezone.now())
+
+        column.delete()
+    return moved
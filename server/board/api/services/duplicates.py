@@ -0,0 +1,195 @@
+"""
+Détection de doublons probables : MinHash + LSH sur le texte des idées.
+
+- Texte : titre + début du body, normalisé (minuscules, sans accents ni
+  ponctuation), découpé en shingles de 4 caractères hachés par crc32.
+- Signature : 32 minima de permutations `x XOR masque` (masques aléatoires
+  fixes ; min(map(...)) tourne en C, ~1 ms pour un body de 500 caractères),
+  stockée par idée (IdeaSignature). La part de minima égaux estime la
+  similarité de Jaccard.
+- Index : 8 bandes de 4 valeurs, une ligne IdeaLshBand par bande. Deux textes
+  de similarité 0.5 partagent au moins une bande avec une probabilité ~40 %,
+  0.7 → ~90 %, 0.9 → ~100 %.
+
+Une recherche lit les idées qui partagent une bande (8 égalités sur l'index
+(board, band, bucket)) puis compare leurs signatures : le coût dépend du
+nombre de candidats, pas de la taille du board.
+
+Index tenu à jour à la création (signal), à l'update du titre ou du body
+(update_idea, admin), en tâche d'arrière-plan après le commit, et à la copie
+de board. `rebuild_duplicate_index` recalcule l'existant.
+"""
+import random
+import re
+import struct
+import unicodedata
+import zlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from ...models import Idea, IdeaLshBand, IdeaSignature
+from ..tracing import span
+
+SHINGLE = 4
+BODY_CHARS = 500
+PERMUTATIONS = 32
+BANDS = 8
+ROWS = PERMUTATIONS // BANDS
+MAX_CANDIDATES = 200
+
+_rng = random.Random(0x5B0A2D)  # fixe : les signatures stockées doivent rester comparables
+_MASKS = [_rng.getrandbits(32) for _ in range(PERMUTATIONS)]
+_PACK = struct.Struct(f"<{PERMUTATIONS}I")
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def normalize(text):
+    text = unicodedata.normalize("NFKD", text.lower())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", text).strip()
+
+
+def shingles(title, body=""):
+    text = normalize(f"{title} {(body or '')[:BODY_CHARS]}")
+    if len(text) <= SHINGLE:
+        return {zlib.crc32(text.encode())} if text else set()
+    return {zlib.crc32(text[i:i + SHINGLE].encode()) for i in range(len(text) - SHINGLE + 1)}
+
+
+def signature(title, body=""):
+    """Tuple de PERMUTATIONS minima, ou None pour un texte vide."""
+    values = shingles(title, body)
+    if not values:
+        return None
+    return tuple(min(map(mask.__xor__, values)) for mask in _MASKS)
+
+
+def band_buckets(sig):
+    """(band, bucket) pour chaque bande : crc32 des valeurs de la bande."""
+    return [
+        (band, zlib.crc32(_PACK.pack(*sig)[band * ROWS * 4:(band + 1) * ROWS * 4]))
+        for band in range(BANDS)
+    ]
+
+
+def similarity(sig_a, sig_b):
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / PERMUTATIONS
+
+
+# ---------------------------------------------------------------------------
+# Index
+# ---------------------------------------------------------------------------
+def _rows(board_id, idea_id, sig):
+    return (
+        IdeaSignature(idea_id=idea_id, board_id=board_id, signature=_PACK.pack(*sig)),
+        [IdeaLshBand(board_id=board_id, idea_id=idea_id, band=band, bucket=bucket) for band, bucket in band_buckets(sig)],
+    )
+
+
+def index_idea(idea, board_id=None, created=False):
+    """(Ré)indexe une idée. 2 requêtes à la création, 3 à la mise à jour."""
+    board_id = board_id or idea.column.board_id
+    with span("duplicates.index", idea_id=idea.id):
+        sig = signature(idea.title, idea.body_md)
+        if not created:
+            IdeaLshBand.objects.filter(idea_id=idea.id).delete()
+        if sig is None:
+            IdeaSignature.objects.filter(idea_id=idea.id).delete()
+            return
+        sig_row, band_rows = _rows(board_id, idea.id, sig)
+        IdeaSignature.objects.bulk_create(
+            [sig_row], update_conflicts=True, unique_fields=["idea"], update_fields=["board", "signature"]
+        )
+        IdeaLshBand.objects.bulk_create(band_rows)
+
+
+def reindex(idea_id, created=False):
+    """
+    Version tâche d'arrière-plan (board/api/tasks.py) : relit l'idée en base,
+    verrouillée le temps de la réécriture. Idée supprimée entre-temps : rien.
+    """
+    with transaction.atomic():
+        idea = (
+            Idea.objects.select_for_update()
+            .select_related("column")
+            .only("id", "title", "body_md", "column__board_id")
+            .filter(id=idea_id)
+            .first()
+        )
+        if idea is not None:
+            index_idea(idea, created=created)
+
+
+def rebuild(board, batch_size=500):
+    """Recalcule l'index d'un board ; retourne le nombre d'idées indexées."""
+    IdeaLshBand.objects.filter(board=board).delete()
+    IdeaSignature.objects.filter(board=board).delete()
+
+    count = 0
+    signatures, bands = [], []
+    ideas = Idea.objects.filter(column__board=board).values_list("id", "title", "body_md")
+    for idea_id, title, body in ideas.iterator(chunk_size=2000):
+        sig = signature(title, body)
+        if sig is None:
+            continue
+        sig_row, band_rows = _rows(board.id, idea_id, sig)
+        signatures.append(sig_row)
+        bands.extend(band_rows)
+        count += 1
+        if len(signatures) >= batch_size:
+            IdeaSignature.objects.bulk_create(signatures)
+            IdeaLshBand.objects.bulk_create(bands)
+            signatures, bands = [], []
+    IdeaSignature.objects.bulk_create(signatures)
+    IdeaLshBand.objects.bulk_create(bands)
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Recherche
+# ---------------------------------------------------------------------------
+def find_duplicates(board_id, title, body="", exclude_id=None, threshold=None, limit=None):
+    """
+    Idées du board dont la similarité estimée avec (title, body) atteint
+    `threshold` : [{"id", "title", "similarity"}], plus similaires d'abord.
+    3 requêtes au plus (bandes, signatures, titres).
+    """
+    threshold = getattr(settings, "BOARD_DUPLICATE_THRESHOLD", 0.5) if threshold is None else threshold
+    limit = limit or getattr(settings, "BOARD_DUPLICATE_LIMIT", 5)
+
+    sig = signature(title, body)
+    if sig is None:
+        return []
+
+    with span("duplicates.find", board_id=board_id) as root:
+        match = Q()
+        for band, bucket in band_buckets(sig):
+            match |= Q(band=band, bucket=bucket)
+        candidates = IdeaLshBand.objects.filter(match, board_id=board_id)
+        if exclude_id is not None:
+            candidates = candidates.exclude(idea_id=exclude_id)
+        candidate_ids = list(candidates.values_list("idea_id", flat=True).distinct()[:MAX_CANDIDATES])
+        root.set(candidates=len(candidate_ids))
+        if not candidate_ids:
+            return []
+
+        scored = []
+        for idea_id, packed in IdeaSignature.objects.filter(idea_id__in=candidate_ids).values_list(
+            "idea_id", "signature"
+        ):
+            score = similarity(sig, _PACK.unpack(bytes(packed)))
+            if score >= threshold:
+                scored.append((score, idea_id))
+        scored.sort(key=lambda s: (-s[0], s[1]))
+        scored = scored[:limit]
+        if not scored:
+            return []
+
+        titles = dict(Idea.objects.filter(id__in=[i for _, i in scored]).values_list("id", "title"))
+    return [
+        {"id": idea_id, "title": titles[idea_id], "similarity": round(score, 2)}
+        for score, idea_id in scored
+        if idea_id in titles
+    ]
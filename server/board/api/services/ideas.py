@@ -1,9 +1,13 @@
-from django.db import transaction
+from django.db import connection, transaction
 from django.db.models import F, Max
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 from ...models import Board, Column, Idea
+from .. import metrics, tasks
 from ..debug import debug_log
+from ..tracing import span
+from . import stats, versions
 
 
 # ---------------------------------------------------------------------------
@@ -24,6 +28,39 @@ def _normalize_position(column, ids=None):
         Idea.objects.filter(id=iid, column=column).update(position=idx)
 
 
+def compact_column(column_id):
+    """
+    Positions 0..n-1 dans l'ordre (position, id) actuel, en un seul UPDATE
+    (ROW_NUMBER) : sûr en tâche d'arrière-plan, même si d'autres écritures
+    ont eu lieu depuis la mise en file. Seules les cartes dont la position
+    change sont réécrites ; retourne leur nombre.
+    """
+    qn = connection.ops.quote_name
+    table = qn(Idea._meta.db_table)
+    with span("compact_column", column_id=column_id), transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET position = r.rn - 1 FROM ("
+            f"SELECT id, ROW_NUMBER() OVER (ORDER BY position, id) AS rn FROM {table} WHERE column_id = %s"
+            f") r WHERE r.id = {table}.id AND {table}.position <> r.rn - 1",
+            [column_id],
+        )
+        changed = cursor.rowcount
+        if changed:
+            versions.touch(Column.objects.filter(id=column_id).values("board_id"))
+    return changed
+
+
+def change_column(board, idea, new_column):
+    """
+    Affecte la nouvelle colonne (sans sauvegarder) et met à jour les compteurs
+    de séjour. L'appelant sauvegarde `column` et `column_entered_at`.
+    """
+    now = timezone.now()
+    stats.idea_moved(board.id, idea.column_id, new_column.id, idea.column_entered_at, now)
+    idea.column = new_column
+    idea.column_entered_at = now
+
+
 # ---------------------------------------------------------------------------
 # Services
 # ---------------------------------------------------------------------------
@@ -39,121 +76,135 @@ def move_idea(*, board_id, idea_id, to_column_id, target_index=None):
     - On reconstruit la liste d’IDs source/destination pour éviter les cas limites
       (positions NULL, colonne vide, décalages incohérents).
     """
-    board = get_object_or_404(Board, id=board_id)
-    idea = get_object_or_404(
-        Idea.objects.select_related("column"),
-        id=idea_id,
-        column__board=board,
-    )
-    new_column = get_object_or_404(Column, id=to_column_id, board=board)
-
-    # Pas de champ position => on ne gère que le changement de colonne
-    if not hasattr(Idea, "position"):
-        if idea.column_id != new_column.id:
-            idea.column = new_column
-            idea.save(update_fields=["column"])
-        return idea
-
-    # Normalise target_index
-    try:
-        target_index = int(target_index) if target_index is not None else None
-    except Exception:
-        target_index = None
-
-    with transaction.atomic():
-        old_column = idea.column
-
-        # Source: liste ordonnée (exclure l’idée déplacée)
-        src_ids = list(
-            Idea.objects.filter(column=old_column)
-            .exclude(id=idea.id)
-            .order_by("position", "id")
-            .values_list("id", flat=True)
-        )
-
-        # Destination: liste ordonnée (exclure l’idée déplacée)
-        dest_ids = list(
-            Idea.objects.filter(column=new_column)
-            .exclude(id=idea.id)
-            .order_by("position", "id")
-            .values_list("id", flat=True)
-        )
-
-        # Index courant (utile en intra-colonne)
-        current_ids = []
-        if old_column.id == new_column.id:
-            current_ids = list(
-                Idea.objects.filter(column=old_column)
-                .order_by("position", "id")
-                .values_list("id", flat=True)
+    with span("move_idea", board_id=board_id, idea_id=idea_id) as root:
+        with span("move_idea.load"):
+            board = get_object_or_404(Board, id=board_id)
+            idea = get_object_or_404(
+                Idea.objects.select_related("column"),
+                id=idea_id,
+                column__board=board,
             )
-            try:
-                current_index = current_ids.index(idea.id)
-            except ValueError:
-                # Si incohérence, on considère que l’idée est en fin
-                current_index = len(current_ids)
-        else:
-            current_index = None
-
-        # Borne de l'index d’insertion
-        if target_index is None:
-            insert_at = len(dest_ids)
-        else:
-            insert_at = max(0, min(target_index, len(dest_ids)))
-
-        # Intra-colonne : si on se déplace vers le bas, l’index d’insertion
-        # reçu inclut souvent la carte en cours; on ajuste comme dans la view initiale.
-        if old_column.id == new_column.id and current_index is not None:
-            # current_ids inclut l’idée; insert_at est relatif à dest_ids (sans l’idée)
-            # On ajuste en se basant sur l’index cible "UI" par rapport à current_ids.
-            # Si la cible est après la position actuelle, on décrémente.
-            if target_index is not None and target_index > current_index:
-                insert_at = max(0, insert_at - 1)
-
-            # Reconstruit l’ordre final
-            final_ids = list(src_ids)
-            insert_at = max(0, min(insert_at, len(final_ids)))
-            final_ids.insert(insert_at, idea.id)
-
-            # Met à jour uniquement la position
-            idea.position = insert_at
-            idea.save(update_fields=["position"])
-
-            # Normalise toute la colonne avec l’ordre final
-            _normalize_position(old_column, ids=final_ids)
+            new_column = get_object_or_404(Column, id=to_column_id, board=board)
+
+        # Pas de champ position => on ne gère que le changement de colonne
+        if not hasattr(Idea, "position"):
+            if idea.column_id != new_column.id:
+                with transaction.atomic():
+                    change_column(board, idea, new_column)
+                    idea.save(update_fields=["column", "column_entered_at"])
+            return idea
 
+        # Normalise target_index
+        try:
+            target_index = int(target_index) if target_index is not None else None
+        except Exception:
+            target_index = None
+
+        with transaction.atomic():
+            old_column = idea.column
+
+            with span("move_idea.compute"):
+                # Source: liste ordonnée (exclure l’idée déplacée)
+                src_ids = list(
+                    Idea.objects.filter(column=old_column)
+                    .exclude(id=idea.id)
+                    .order_by("position", "id")
+                    .values_list("id", flat=True)
+                )
+
+                # Destination: liste ordonnée (exclure l’idée déplacée)
+                dest_ids = list(
+                    Idea.objects.filter(column=new_column)
+                    .exclude(id=idea.id)
+                    .order_by("position", "id")
+                    .values_list("id", flat=True)
+                )
+
+                # Index courant (utile en intra-colonne)
+                current_ids = []
+                if old_column.id == new_column.id:
+                    current_ids = list(
+                        Idea.objects.filter(column=old_column)
+                        .order_by("position", "id")
+                        .values_list("id", flat=True)
+                    )
+                    try:
+                        current_index = current_ids.index(idea.id)
+                    except ValueError:
+                        # Si incohérence, on considère que l’idée est en fin
+                        current_index = len(current_ids)
+                else:
+                    current_index = None
+
+                # Borne de l'index d’insertion
+                if target_index is None:
+                    insert_at = len(dest_ids)
+                else:
+                    insert_at = max(0, min(target_index, len(dest_ids)))
+
+            # Intra-colonne : si on se déplace vers le bas, l’index d’insertion
+            # reçu inclut souvent la carte en cours; on ajuste comme dans la view initiale.
+            if old_column.id == new_column.id and current_index is not None:
+                # current_ids inclut l’idée; insert_at est relatif à dest_ids (sans l’idée)
+                # On ajuste en se basant sur l’index cible "UI" par rapport à current_ids.
+                # Si la cible est après la position actuelle, on décrémente.
+                if target_index is not None and target_index > current_index:
+                    insert_at = max(0, insert_at - 1)
+
+                # Reconstruit l’ordre final
+                final_ids = list(src_ids)
+                insert_at = max(0, min(insert_at, len(final_ids)))
+                final_ids.insert(insert_at, idea.id)
+
+                # Met à jour uniquement la position
+                with span("move_idea.write"):
+                    idea.position = insert_at
+                    idea.save(update_fields=["position"])
+
+                # Normalise toute la colonne avec l’ordre final
+                with span("move_idea.normalize", cards=len(final_ids)):
+                    _normalize_position(old_column, ids=final_ids)
+
+                root.set(kind="intra", renormalized=len(final_ids))
+                metrics.observe_move("intra", len(final_ids))
+                debug_log(
+                    "[SERVICE move_idea intra] idea=%s column=%s from=%s to=%s final_index=%s size=%s",
+                    idea.id,
+                    old_column.id,
+                    current_index,
+                    insert_at,
+                    idea.position,
+                    len(final_ids),
+                )
+                return idea
+
+            # Inter-colonne : on insère dans la destination, et on normalise source+dest
+            dest_ids.insert(insert_at, idea.id)
+
+            # Change la colonne + position (provisoirement) avant normalisation
+            with span("move_idea.write"):
+                change_column(board, idea, new_column)
+                idea.position = insert_at
+                idea.save(update_fields=["column", "column_entered_at", "position"])
+
+            # Normalise la destination (ordre déterministe). La source garde un
+            # trou, que l'ordre (position, id) tolère : sa compaction part en
+            # tâche d'arrière-plan après le commit.
+            with span("move_idea.normalize", cards=len(dest_ids)):
+                _normalize_position(new_column, ids=dest_ids)
+            tasks.defer(compact_column, old_column.id)
+
+            root.set(kind="inter", renormalized=len(dest_ids))
+            metrics.observe_move("inter", len(dest_ids))
             debug_log(
-                "[SERVICE move_idea intra] idea=%s column=%s from=%s to=%s final_index=%s size=%s",
+                "[SERVICE move_idea inter] idea=%s from_column=%s to_column=%s insert_at=%s src_size=%s dest_size=%s",
                 idea.id,
                 old_column.id,
-                current_index,
+                new_column.id,
                 insert_at,
-                idea.position,
-                len(final_ids),
+                len(src_ids),
+                len(dest_ids),
             )
-            return idea
-
-        # Inter-colonne : on insère dans la destination, et on normalise source+dest
-        dest_ids.insert(insert_at, idea.id)
-
-        # Change la colonne + position (provisoirement) avant normalisation
-        idea.column = new_column
-        idea.position = insert_at
-        idea.save(update_fields=["column", "position"])
-
-        # Normalise la source et la destination (ordre déterministe)
-        _normalize_position(old_column, ids=src_ids)
-        _normalize_position(new_column, ids=dest_ids)
-
-        debug_log(
-            "[SERVICE move_idea inter] idea=%s from_column=%s to_column=%s insert_at=%s src_size=%s dest_size=%s",
-            idea.id,
-            old_column.id,
-            new_column.id,
-            insert_at,
-            len(src_ids),
-            len(dest_ids),
-        )
 
     return idea
 
@@ -162,52 +213,65 @@ def reorder_column(*, board_id, column_id, ordered_ids):
     """
     Reorder strict d'une colonne (drag intra-colonne).
     """
-    board = get_object_or_404(Board, id=board_id)
-    column = get_object_or_404(Column, id=column_id, board=board)
+    with span("reorder_column", board_id=board_id, column_id=column_id, cards=len(ordered_ids)):
+        with span("reorder_column.load"):
+            board = get_object_or_404(Board, id=board_id)
+            column = get_object_or_404(Column, id=column_id, board=board)
 
-    if not hasattr(Idea, "position"):
-        return
+            if not hasattr(Idea, "position"):
+                return
 
-    ids = [int(i) for i in ordered_ids]
+            ids = [int(i) for i in ordered_ids]
 
-    ideas = list(Idea.objects.filter(column=column, id__in=ids))
-    if len(ideas) != len(ids):
-        raise ValueError("Invalid idea list for reorder")
-
-    with transaction.atomic():
-        for index, iid in enumerate(ids):
-            Idea.objects.filter(id=iid, column=column).update(position=index)
+            current = list(
+                Idea.objects.filter(column=column).order_by("position", "id").values_list("id", flat=True)
+            )
+            if len(set(ids)) != len(ids) or not set(ids) <= set(current):
+                raise ValueError("Invalid idea list for reorder")
+            # Cartes absentes de la liste (arrivées depuis la copie du client,
+            # move concurrent) : à la suite, dans leur ordre actuel, plutôt
+            # qu'à une position déjà attribuée.
+            listed = set(ids)
+            ids += [iid for iid in current if iid not in listed]
+
+        with span("reorder_column.write"), transaction.atomic():
+            for index, iid in enumerate(ids):
+                Idea.objects.filter(id=iid, column=column).update(position=index)
 
     debug_log(
-        "[SERVICE reorder_column] column=%s ids=%s",
+        "[SERVICE reorder_column] column=%s size=%s",
         column.id,
-        ids,
+        len(ids),
     )
 
 
-def quick_add_idea(*, board_id, title, column_id=None):
+def quick_add_idea(*, board_id, title, column_id=None, impact=None):
     """
     Création rapide d'idée, ajoutée en fin de colonne.
     """
-    board = get_object_or_404(Board, id=board_id)
-
-    if column_id:
-        column = get_object_or_404(Column, id=column_id, board=board)
-    else:
-        column = Column.objects.filter(board=board).order_by("order", "id").first()
-        if not column:
-            raise ValueError("Board has no columns")
-
-    if hasattr(Idea, "position"):
-        max_pos = (
-            Idea.objects.filter(column=column)
-            .aggregate(max_pos=Max("position"))
-            .get("max_pos")
-        )
-        pos = (max_pos + 1) if max_pos is not None else 0
-        idea = Idea.objects.create(title=title, column=column, position=pos)
-    else:
-        idea = Idea.objects.create(title=title, column=column)
+    with span("quick_add_idea", board_id=board_id):
+        with span("quick_add_idea.load"):
+            board = get_object_or_404(Board, id=board_id)
+
+            if column_id:
+                column = get_object_or_404(Column, id=column_id, board=board)
+            else:
+                column = Column.objects.filter(board=board).order_by("order", "id").first()
+                if not column:
+                    raise ValueError("Board has no columns")
+
+        extra = {"impact": impact} if impact is not None else {}
+        with span("quick_add_idea.write"), transaction.atomic():
+            if hasattr(Idea, "position"):
+                max_pos = (
+                    Idea.objects.filter(column=column)
+                    .aggregate(max_pos=Max("position"))
+                    .get("max_pos")
+                )
+                pos = (max_pos + 1) if max_pos is not None else 0
+                idea = Idea.objects.create(title=title, column=column, position=pos, **extra)
+            else:
+                idea = Idea.objects.create(title=title, column=column, **extra)
 
     debug_log(
         "[SERVICE quick_add] idea=%s column=%s",
@@ -215,4 +279,4 @@ def quick_add_idea(*, board_id, title, column_id=None):
         column.id,
     )
 
-    return idea
\ No newline at end of file
+    return idea
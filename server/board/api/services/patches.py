@@ -0,0 +1,81 @@
+"""
+Patchs texte pour `body_md` : le client envoie seulement les plages modifiées
+par rapport à une version de base identifiée par son hash.
+
+Format : {"base": "<sha256 hex du body de base>", "ops": [[start, end, "texte"], ...]}
+
+- `start` / `end` sont des offsets en unités UTF-16 (ceux des chaînes JS),
+  sur le texte de base. Les ops sont triées et ne se chevauchent pas.
+- Chaque op remplace base[start:end] par "texte" (insertion : start == end,
+  suppression : texte vide).
+"""
+import hashlib
+
+
+class PatchError(ValueError):
+    """Patch invalide (format, bornes, chevauchement)."""
+
+
+class StalePatchError(Exception):
+    """Le hash de base ne correspond plus au contenu en base."""
+
+    def __init__(self, current_hash):
+        super().__init__("Stale base")
+        self.current_hash = current_hash
+
+
+def body_hash(text):
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _parse_ops(ops, length, max_ops):
+    if not isinstance(ops, list):
+        raise PatchError("ops must be a list")
+    if len(ops) > max_ops:
+        raise PatchError(f"Too many ops (max {max_ops})")
+
+    parsed = []
+    previous_end = 0
+    for op in ops:
+        if not isinstance(op, (list, tuple)) or len(op) != 3:
+            raise PatchError("Each op must be [start, end, text]")
+        start, end, text = op
+        if not isinstance(start, int) or not isinstance(end, int) or not isinstance(text, str):
+            raise PatchError("Each op must be [int, int, str]")
+        if start < previous_end or end < start or end > length:
+            raise PatchError("Ops must be sorted, non-overlapping and within the document")
+        parsed.append((start, end, text))
+        previous_end = end
+    return parsed
+
+
+def apply_patch(text, patch, *, max_ops=1000):
+    """
+    Applique `patch` à `text` et retourne le nouveau texte.
+    Lève StalePatchError si `patch["base"]` ne correspond pas à `text`,
+    PatchError si le patch est mal formé.
+    """
+    if not isinstance(patch, dict) or not isinstance(patch.get("base"), str):
+        raise PatchError("body_patch must be an object with a base hash")
+
+    text = text or ""
+    current = body_hash(text)
+    if patch["base"] != current:
+        raise StalePatchError(current)
+
+    # Travail en UTF-16 (2 octets par unité) pour suivre les offsets du client
+    units = text.encode("utf-16-le")
+    ops = _parse_ops(patch.get("ops"), len(units) // 2, max_ops)
+
+    chunks = []
+    cursor = 0
+    for start, end, replacement in ops:
+        chunks.append(units[cursor * 2:start * 2])
+        chunks.append(replacement.encode("utf-16-le"))
+        cursor = end
+    chunks.append(units[cursor * 2:])
+
+    try:
+        return b"".join(chunks).decode("utf-16-le")
+    except UnicodeDecodeError:
+        raise PatchError("Op boundaries split a surrogate pair")
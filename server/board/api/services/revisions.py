@@ -0,0 +1,201 @@
+"""
+Historique des versions d'une idée : keyframes + deltas.
+
+- Une keyframe stocke le body complet. Un delta stocke les plages modifiées
+  par rapport à la révision précédente : [[start, end, "texte"], ...] en
+  offsets Python (points de code) sur le body précédent.
+- Une keyframe est écrite toutes les BOARD_REVISION_KEYFRAME_EVERY révisions,
+  ou quand le delta serait plus gros que la moitié du document. Reconstruire
+  une version coûte donc au plus N deltas à appliquer.
+- Chaque révision garde le hash de son body. Si le body précédent ne
+  correspond plus à la dernière révision (modification passée à côté de
+  record_revision), il est d'abord enregistré en keyframe : les deltas
+  s'appliquent toujours au body réellement stocké.
+- Rétention : BOARD_REVISION_KEEP révisions par idée. La purge coupe toujours
+  sur une keyframe pour que les révisions gardées restent reconstructibles.
+
+Le stockage grandit avec la taille des modifications, pas avec celle du
+document.
+"""
+import json
+from difflib import SequenceMatcher
+
+from django.conf import settings
+from django.db.models import Max
+
+from ...models import IdeaRevision, RevisionKind
+from .. import tasks
+from ..tracing import span
+from .patches import body_hash
+
+
+# ---------------------------------------------------------------------------
+# Deltas
+# ---------------------------------------------------------------------------
+def compute_delta(old, new):
+    """
+    Plages à remplacer dans `old` pour obtenir `new`.
+    Préfixe/suffixe communs retirés, puis diff par lignes sur la zone restante
+    (les éditions éloignées donnent plusieurs petites plages).
+    """
+    if old == new:
+        return []
+
+    start = 0
+    max_prefix = min(len(old), len(new))
+    while start < max_prefix and old[start] == new[start]:
+        start += 1
+    end_old, end_new = len(old), len(new)
+    while end_old > start and end_new > start and old[end_old - 1] == new[end_new - 1]:
+        end_old -= 1
+        end_new -= 1
+
+    old_mid = old[start:end_old].splitlines(keepends=True)
+    new_mid = new[start:end_new].splitlines(keepends=True)
+    if len(old_mid) <= 1 or len(new_mid) <= 1:
+        return [[start, end_old, new[start:end_new]]]
+
+    # Offsets de début de chaque ligne de la zone, relatifs au document
+    old_offsets = [start]
+    for line in old_mid:
+        old_offsets.append(old_offsets[-1] + len(line))
+    new_offsets = [start]
+    for line in new_mid:
+        new_offsets.append(new_offsets[-1] + len(line))
+
+    ops = []
+    matcher = SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        ops.append([old_offsets[i1], old_offsets[i2], new[new_offsets[j1]:new_offsets[j2]]])
+    return ops
+
+
+def apply_delta(text, ops):
+    chunks = []
+    cursor = 0
+    for start, end, replacement in ops:
+        chunks.append(text[cursor:start])
+        chunks.append(replacement)
+        cursor = end
+    chunks.append(text[cursor:])
+    return "".join(chunks)
+
+
+def _delta_size(ops):
+    return sum(len(op[2]) for op in ops) + 16 * len(ops)
+
+
+# ---------------------------------------------------------------------------
+# Écriture
+# ---------------------------------------------------------------------------
+def _latest(idea_id):
+    return IdeaRevision.objects.filter(idea_id=idea_id).order_by("-number").first()
+
+
+def record_revision(idea, previous_body, previous_title):
+    """
+    Enregistre l'état courant de `idea` comme nouvelle révision.
+    À la première modification suivie, ou si `previous_body` n'est pas le body
+    de la dernière révision (écriture hors record_revision), l'état précédent
+    est d'abord stocké en keyframe pour pouvoir y revenir.
+    """
+    with span("revisions.record", idea_id=idea.id):
+        previous_body = previous_body or ""
+        last = _latest(idea.id)
+        if last is None or last.body_hash != body_hash(previous_body):
+            last = IdeaRevision.objects.create(
+                idea=idea,
+                number=last.number + 1 if last else 1,
+                kind=RevisionKind.KEYFRAME,
+                title=previous_title,
+                data=previous_body,
+                body_size=len(previous_body),
+                body_hash=body_hash(previous_body),
+            )
+
+        body = idea.body_md or ""
+        every = getattr(settings, "BOARD_REVISION_KEYFRAME_EVERY", 20)
+        number = last.number + 1
+
+        ops = compute_delta(previous_body, body)
+        keyframe = (number - 1) % every == 0 or _delta_size(ops) * 2 > len(body)
+        revision = IdeaRevision.objects.create(
+            idea=idea,
+            number=number,
+            kind=RevisionKind.KEYFRAME if keyframe else RevisionKind.DELTA,
+            title=idea.title,
+            data=body if keyframe else json.dumps(ops, ensure_ascii=False, separators=(",", ":")),
+            body_size=len(body),
+            body_hash=body_hash(body),
+        )
+        # Purge hors réponse (board/api/tasks.py) : elle relit le dernier numéro
+        tasks.defer(prune_revisions, idea.id)
+    return revision
+
+
+def prune_revisions(idea_id, latest_number=None):
+    """Garde les BOARD_REVISION_KEEP dernières révisions (coupe sur une keyframe)."""
+    keep = getattr(settings, "BOARD_REVISION_KEEP", 100)
+    if latest_number is None:
+        latest_number = (
+            IdeaRevision.objects.filter(idea_id=idea_id).aggregate(n=Max("number"))["n"] or 0
+        )
+    cutoff = latest_number - keep + 1
+    if cutoff <= 1:
+        return 0
+
+    # La plus récente keyframe <= cutoff devient la plus ancienne révision gardée
+    anchor = (
+        IdeaRevision.objects.filter(idea_id=idea_id, kind=RevisionKind.KEYFRAME, number__lte=cutoff)
+        .order_by("-number")
+        .values_list("number", flat=True)
+        .first()
+    )
+    if anchor is None:
+        return 0
+    deleted, _ = IdeaRevision.objects.filter(idea_id=idea_id, number__lt=anchor).delete()
+    return deleted
+
+
+# ---------------------------------------------------------------------------
+# Lecture
+# ---------------------------------------------------------------------------
+def list_revisions(idea_id):
+    return list(
+        IdeaRevision.objects.filter(idea_id=idea_id)
+        .order_by("-number")
+        .values("number", "kind", "title", "body_size", "created_at")
+    )
+
+
+def reconstruct(idea_id, number):
+    """
+    Retourne (révision, body) pour la version `number`, ou None si elle
+    n'existe pas (ou plus). Lit la keyframe précédente et les deltas qui suivent.
+    """
+    with span("revisions.reconstruct", idea_id=idea_id, number=number):
+        anchor = (
+            IdeaRevision.objects.filter(idea_id=idea_id, kind=RevisionKind.KEYFRAME, number__lte=number)
+            .order_by("-number")
+            .values_list("number", flat=True)
+            .first()
+        )
+        if anchor is None:
+            return None
+
+        chain = list(
+            IdeaRevision.objects.filter(idea_id=idea_id, number__gte=anchor, number__lte=number)
+            .order_by("number")
+        )
+        if not chain or chain[-1].number != number:
+            return None
+
+        body = chain[0].data
+        for revision in chain[1:]:
+            if revision.kind == RevisionKind.KEYFRAME:
+                body = revision.data
+            else:
+                body = apply_delta(body, json.loads(revision.data))
+    return chain[-1], body
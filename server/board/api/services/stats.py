@@ -0,0 +1,205 @@
+"""
+Statistiques de board tenues à jour de façon incrémentale (modèle BoardStat).
+
+Les chemins d'écriture appellent les helpers ci-dessous dans leur transaction :
+- création d'idée et tags : signaux (board/signals.py), pour couvrir aussi
+  l'admin et les commandes ;
+- changement de colonne, de statut ou d'impact : move_idea, update_idea ;
+- suppression de colonne (idées déplacées en bloc) : `column_merged()` ;
+- suppression d'idées : `idea_removed()` ou `rebuild()` du board.
+
+Chaque helper se résume à un `INSERT ... ON CONFLICT DO UPDATE` (executemany).
+Les écritures en SQL brut ou par `QuerySet.update()` doivent être suivies
+d'un `rebuild()` (commande rebuild_board_stats).
+"""
+from collections import defaultdict
+
+from django.db import connection
+from django.utils import timezone
+
+from ...models import BoardStat, Column, Idea, StatDimension, Tag
+
+COLUMN = StatDimension.COLUMN
+STATUS = StatDimension.STATUS
+TAG = StatDimension.TAG
+IMPACT = StatDimension.IMPACT
+
+
+def _ts(value):
+    return value.timestamp() if value else 0.0
+
+
+def _upsert(rows):
+    """rows : (board_id, dimension, bucket, count, dwell_total, exits, entered_sum) à ajouter."""
+    if not rows:
+        return
+    qn = connection.ops.quote_name
+    table = qn(BoardStat._meta.db_table)
+    increments = ("count", "dwell_total", "exits", "entered_sum")
+    updates = ", ".join(f"{qn(f)} = {table}.{qn(f)} + excluded.{qn(f)}" for f in increments)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} (board_id, dimension, bucket, count, dwell_total, exits, entered_sum) "
+            f"VALUES (%s, %s, %s, %s, %s, %s, %s) "
+            f"ON CONFLICT (board_id, dimension, bucket) DO UPDATE SET {updates}",
+            [(b, d, str(k), c, dw, ex, en) for b, d, k, c, dw, ex, en in rows],
+        )
+
+
+# ---------------------------------------------------------------------------
+# Helpers appelés par les chemins d'écriture
+# ---------------------------------------------------------------------------
+def idea_added(board_id, idea, tag_ids=()):
+    _upsert(
+        [
+            (board_id, COLUMN, idea.column_id, 1, 0.0, 0, _ts(idea.column_entered_at)),
+            (board_id, STATUS, idea.status, 1, 0.0, 0, 0.0),
+            (board_id, IMPACT, idea.impact, 1, 0.0, 0, 0.0),
+            *((board_id, TAG, tag_id, 1, 0.0, 0, 0.0) for tag_id in tag_ids),
+        ]
+    )
+
+
+def idea_removed(board_id, idea, tag_ids=()):
+    _upsert(
+        [
+            (board_id, COLUMN, idea.column_id, -1, 0.0, 0, -_ts(idea.column_entered_at)),
+            (board_id, STATUS, idea.status, -1, 0.0, 0, 0.0),
+            (board_id, IMPACT, idea.impact, -1, 0.0, 0, 0.0),
+            *((board_id, TAG, tag_id, -1, 0.0, 0, 0.0) for tag_id in tag_ids),
+        ]
+    )
+
+
+def idea_moved(board_id, old_column_id, new_column_id, entered_at, now):
+    """Fin du séjour dans `old_column_id` (durée cumulée), arrivée dans `new_column_id`."""
+    _upsert(
+        [
+            (board_id, COLUMN, old_column_id, -1, (now - entered_at).total_seconds(), 1, -_ts(entered_at)),
+            (board_id, COLUMN, new_column_id, 1, 0.0, 0, _ts(now)),
+        ]
+    )
+
+
+def column_merged(board_id, old_column_id, new_column_id, moved, now):
+    """
+    Colonne `old_column_id` supprimée, ses `moved` idées arrivées à `now` dans
+    `new_column_id` : une ligne ajustée, la ligne de l'ancienne colonne effacée.
+    """
+    BoardStat.objects.filter(board_id=board_id, dimension=COLUMN, bucket=str(old_column_id)).delete()
+    if moved:
+        _upsert([(board_id, COLUMN, new_column_id, moved, 0.0, 0, moved * _ts(now))])
+
+
+def field_changed(board_id, dimension, old, new):
+    if old == new:
+        return
+    _upsert([(board_id, dimension, old, -1, 0.0, 0, 0.0), (board_id, dimension, new, 1, 0.0, 0, 0.0)])
+
+
+def tags_changed(board_id, tag_ids, delta):
+    """`delta` liens ajoutés (ou retirés si négatif) pour chacun des `tag_ids`."""
+    _upsert([(board_id, TAG, tag_id, delta, 0.0, 0, 0.0) for tag_id in tag_ids])
+
+
+# ---------------------------------------------------------------------------
+# Lecture
+# ---------------------------------------------------------------------------
+def board_stats(board):
+    """Payload de /boards/<id>/stats (3 requêtes : stats, colonnes, tags)."""
+    rows = list(BoardStat.objects.filter(board=board))
+    if not rows and Idea.objects.filter(column__board=board).exists():
+        # Board antérieur aux compteurs : premier calcul complet
+        rebuild(board)
+        rows = list(BoardStat.objects.filter(board=board))
+
+    by_dim = defaultdict(dict)
+    for row in rows:
+        by_dim[row.dimension][row.bucket] = row
+
+    now = _ts(timezone.now())
+    columns = []
+    total = 0
+    for column in Column.objects.filter(board=board).order_by("order", "id").only("id", "name", "order"):
+        row = by_dim[COLUMN].get(str(column.id))
+        count = row.count if row else 0
+        total += count
+        avg = None
+        if row and (row.exits + count) > 0:
+            # Séjours terminés + séjours en cours (now - arrivée), sans parcourir les idées
+            current = count * now - row.entered_sum
+            avg = round((row.dwell_total + current) / (row.exits + count), 1)
+        columns.append({"id": column.id, "name": column.name, "count": count, "avg_dwell_seconds": avg})
+
+    tag_rows = {int(k): r.count for k, r in by_dim[TAG].items() if r.count > 0}
+    tag_names = dict(Tag.objects.filter(id__in=tag_rows).values_list("id", "name"))
+    tags = sorted(
+        ({"id": tid, "name": tag_names.get(tid, ""), "count": n} for tid, n in tag_rows.items()),
+        key=lambda t: (-t["count"], t["name"]),
+    )
+
+    return {
+        "total": total,
+        "columns": columns,
+        "status": {k: r.count for k, r in sorted(by_dim[STATUS].items()) if r.count > 0},
+        "impact": {k: r.count for k, r in sorted(by_dim[IMPACT].items(), key=lambda i: int(i[0])) if r.count > 0},
+        "tags": tags,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Recalcul complet
+# ---------------------------------------------------------------------------
+def recount(board):
+    """Comptes réels {(dimension, bucket): (count, entered_sum)} par parcours des idées."""
+    actual = defaultdict(lambda: [0, 0.0])
+    ideas = Idea.objects.filter(column__board=board).values_list(
+        "column_id", "status", "impact", "column_entered_at"
+    )
+    for column_id, status, impact, entered_at in ideas.iterator(chunk_size=2000):
+        entry = actual[(COLUMN, str(column_id))]
+        entry[0] += 1
+        entry[1] += _ts(entered_at)
+        actual[(STATUS, status)][0] += 1
+        actual[(IMPACT, str(impact))][0] += 1
+
+    links = Idea.tags.through.objects.filter(idea__column__board=board).values_list("tag_id", flat=True)
+    for tag_id in links.iterator(chunk_size=5000):
+        actual[(TAG, str(tag_id))][0] += 1
+    return actual
+
+
+def rebuild(board, write=True, tolerance=1.0):
+    """
+    Compare les compteurs au recomptage complet ; retourne la liste des écarts
+    (dimension, bucket, stocké, réel). Avec `write`, corrige les compteurs.
+    Les cumuls de séjours terminés (dwell_total / exits) sont conservés :
+    ils ne peuvent pas être recalculés sans historique des déplacements.
+    """
+    actual = recount(board)
+    stored = {(r.dimension, r.bucket): r for r in BoardStat.objects.filter(board=board)}
+
+    drift = []
+    to_create = []
+    to_update = []
+    for key in set(actual) | set(stored):
+        count, entered_sum = actual.get(key, (0, 0.0))
+        row = stored.get(key)
+        if row is None:
+            if count:
+                drift.append((key[0], key[1], 0, count))
+                to_create.append(
+                    BoardStat(board=board, dimension=key[0], bucket=key[1], count=count, entered_sum=entered_sum)
+                )
+            continue
+        if row.count != count or abs(row.entered_sum - entered_sum) > tolerance:
+            if row.count != count:
+                drift.append((key[0], key[1], row.count, count))
+            row.count = count
+            row.entered_sum = entered_sum
+            to_update.append(row)
+
+    if write:
+        BoardStat.objects.bulk_create(to_create, batch_size=500)
+        BoardStat.objects.bulk_update(to_update, ["count", "entered_sum"], batch_size=500)
+    return sorted(drift)
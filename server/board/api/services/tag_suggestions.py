@@ -0,0 +1,173 @@
+"""
+Suggestions de tags pour une idée en cours de saisie.
+
+Matrice de co-occurrence par board (TagCooccurrence : nombre d'idées portant
+les deux tags), tenue à jour par le signal m2m de `Idea.tags` : chaque ajout
+ou retrait de tag applique les paires gagnées / perdues par l'idée, en un
+`INSERT ... ON CONFLICT DO UPDATE`.
+
+À la lecture, la matrice du board est chargée en mémoire une fois par
+process (3 requêtes) puis servie depuis le dict : aucune jointure sur la
+table de liaison par frappe clavier. La validité est contrôlée par
+`Board.version` / `Board.updated_at` (services/versions.py), lus en base à
+chaque appel : incrémentés dans la transaction même qui modifie tags, paires
+ou compteurs, ils sont vus par tous les process au commit, quel que soit le
+backend de cache (locmem par process en DEBUG). La version est lue avant les
+données : une matrice chargée pendant un commit est rechargée à l'appel
+suivant.
+
+Score d'un tag candidat c :
+- somme sur les tags déjà posés t de P(c | t) = paires(t, c) / idées(t) ;
+- +1 si le nom du tag (normalisé) figure dans le titre, +0.5 si un mot du
+  titre (3 lettres au moins) en est le début ;
+- départage par la fréquence du tag dans le board.
+"""
+from collections import defaultdict
+
+from django.db import connection
+
+from ...models import Board, BoardStat, Column, Idea, StatDimension, Tag, TagCooccurrence
+from .. import metrics
+from ..tracing import span
+from . import versions
+from .duplicates import normalize
+
+_loaded = {}  # board_id -> ((version, updated_at), données)
+
+
+# ---------------------------------------------------------------------------
+# Écriture
+# ---------------------------------------------------------------------------
+def invalidate(board_id):
+    """Incrémente la version du board (dans la transaction courante)."""
+    versions.touch([board_id])
+
+
+def _pairs(tag_ids):
+    return {(a, b) for a in tag_ids for b in tag_ids if a != b}
+
+
+def apply_change(board_id, before, after):
+    """Paires d'une idée passée des tags `before` aux tags `after` (ensembles d'ids)."""
+    if before == after:
+        return
+    # Même sans paire modifiée (idée à un seul tag, dernier usage d'un tag
+    # retiré), les fréquences et noms lus dans BoardStat ont changé
+    invalidate(board_id)
+    gained = _pairs(after) - _pairs(before)
+    lost = _pairs(before) - _pairs(after)
+    rows = [(board_id, a, b, 1) for a, b in gained] + [(board_id, a, b, -1) for a, b in lost]
+    if not rows:
+        return
+    qn = connection.ops.quote_name
+    table = qn(TagCooccurrence._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {table} (board_id, tag_id, other_id, count) VALUES (%s, %s, %s, %s) "
+            f"ON CONFLICT (board_id, tag_id, other_id) DO UPDATE SET count = {table}.count + excluded.count",
+            rows,
+        )
+
+
+def rebuild(board):
+    """Recalcule la matrice d'un board (une jointure de la table de liaison, hors requête)."""
+    qn = connection.ops.quote_name
+    table = qn(TagCooccurrence._meta.db_table)
+    through = qn(Idea.tags.through._meta.db_table)
+    idea_table = qn(Idea._meta.db_table)
+    column_table = qn(Column._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE board_id = %s", [board.id])
+        cursor.execute(
+            f"INSERT INTO {table} (board_id, tag_id, other_id, count) "
+            f"SELECT %s, a.tag_id, b.tag_id, COUNT(*) "
+            f"FROM {through} a "
+            f"JOIN {through} b ON b.idea_id = a.idea_id AND b.tag_id <> a.tag_id "
+            f"JOIN {idea_table} i ON i.id = a.idea_id "
+            f"JOIN {column_table} c ON c.id = i.column_id "
+            f"WHERE c.board_id = %s "
+            f"GROUP BY a.tag_id, b.tag_id",
+            [board.id, board.id],
+        )
+        count = cursor.rowcount
+    invalidate(board.id)
+    return count
+
+
+# ---------------------------------------------------------------------------
+# Lecture
+# ---------------------------------------------------------------------------
+def _load(board_id):
+    pairs = defaultdict(dict)
+    for tag_id, other_id, count in TagCooccurrence.objects.filter(board_id=board_id, count__gt=0).values_list(
+        "tag_id", "other_id", "count"
+    ):
+        pairs[tag_id][other_id] = count
+
+    # Fréquence de chaque tag : compteurs BoardStat (services/stats.py)
+    counts = {
+        int(bucket): n
+        for bucket, n in BoardStat.objects.filter(
+            board_id=board_id, dimension=StatDimension.TAG, count__gt=0
+        ).values_list("bucket", "count")
+    }
+    names = dict(Tag.objects.filter(id__in=counts).values_list("id", "name"))
+    return {
+        "pairs": dict(pairs),
+        "counts": counts,
+        "names": names,
+        "normalized": {tag_id: normalize(name) for tag_id, name in names.items()},
+        "by_name": {name.lower(): tag_id for tag_id, name in names.items()},
+    }
+
+
+def _board_data(board_id):
+    version = Board.objects.filter(id=board_id).values_list("version", "updated_at").first()
+
+    entry = _loaded.get(board_id)
+    if entry is not None and entry[0] == version:
+        metrics.record_cache("tag_suggestions", True)
+        return entry[1]
+
+    metrics.record_cache("tag_suggestions", False)
+    with span("tag_suggestions.load", board_id=board_id):
+        data = _load(board_id)
+    _loaded[board_id] = (version, data)
+    return data
+
+
+def suggest(board_id, title="", tag_names=(), limit=8):
+    """[{"name", "score"}] : tags proposés pour (title, tags déjà posés), meilleurs d'abord."""
+    data = _board_data(board_id)
+    given = {data["by_name"][n.lower()] for n in tag_names if n.lower() in data["by_name"]}
+    normalized_title = normalize(title or "")
+    words = normalized_title.split()
+    padded = f" {normalized_title} "
+
+    scores = defaultdict(float)
+    for tag_id in given:
+        total = data["counts"].get(tag_id) or 1
+        for other_id, n in data["pairs"].get(tag_id, {}).items():
+            scores[other_id] += n / total
+
+    if words:
+        for tag_id, name in data["normalized"].items():
+            if f" {name} " in padded:
+                scores[tag_id] += 1.0
+            elif any(len(w) >= 3 and name.startswith(w) for w in words):
+                scores[tag_id] += 0.5
+
+    if not given and not words:
+        # Rien à rapprocher : tags les plus utilisés du board
+        scores = {tag_id: 0.0 for tag_id in data["counts"]}
+
+    top = max(data["counts"].values(), default=1)
+    ranked = sorted(
+        (
+            (score + 0.01 * data["counts"].get(tag_id, 0) / top, tag_id)
+            for tag_id, score in scores.items()
+            if tag_id not in given and tag_id in data["names"]
+        ),
+        key=lambda s: (-s[0], data["names"][s[1]]),
+    )
+    return [{"name": data["names"][tag_id], "score": round(score, 3)} for score, tag_id in ranked[:limit]]
@@ -0,0 +1,101 @@
+"""
+Numéro de version des boards (`Board.version`, avec `Board.updated_at`).
+
+Toute modification du contenu affiché d'un board (cartes, positions, colonnes,
+tags) incrémente sa version : les lectures s'en servent comme validateurs
+HTTP (board/api/conditional.py) sans construire la réponse.
+
+Sources des incréments :
+- écritures de l'API : `writes.run` ouvre un `collect()` ; les boards touchés
+  pendant la transaction (ids de l'opération, signaux) sont incrémentés en
+  un seul UPDATE à la fin, dans la même transaction : un rollback l'annule ;
+- hors API (admin, shell, commandes) : signaux de board/signals.py et appels
+  explicites après les écritures en masse (`QuerySet.update`, SQL brut) ;
+- tâches différées qui déplacent des cartes (compaction d'une colonne).
+
+Les ids de l'opération ne sont incrémentés que si le bloc a réellement écrit
+(INSERT/UPDATE/DELETE ayant modifié au moins une ligne, relevé par un
+`execute_wrapper`) : une mise à jour sans changement garde l'ETag. Les
+`collect()` imbriqués suivent les savepoints qu'ils entourent : sortie
+normale, leurs incréments remontent au bloc parent ; sortie sur exception
+(savepoint annulé), ils sont abandonnés.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from ...models import Board
+
+_state = threading.local()
+_WRITES = ("INSERT", "UPDATE", "DELETE")
+
+
+class _Frame:
+    __slots__ = ("ids", "touched", "wrote")
+
+    def __init__(self, board_ids):
+        self.ids = set(board_ids)  # incrémentés seulement si le bloc écrit
+        self.touched = set()  # incrémentés dans tous les cas (signaux, touch)
+        self.wrote = False
+
+    def result(self):
+        return self.touched | self.ids if self.wrote else self.touched
+
+
+def _frames():
+    return getattr(_state, "frames", None)
+
+
+def _watch(execute, sql, params, many, context):
+    result = execute(sql, params, many, context)
+    frames = _frames()
+    if frames and sql.lstrip()[:6].upper() in _WRITES and context["cursor"].rowcount > 0:
+        frames[-1].wrote = True
+    return result
+
+
+def _bump(board_ids):
+    return Board.objects.filter(id__in=board_ids).update(version=F("version") + 1, updated_at=timezone.now())
+
+
+def touch(board_ids):
+    """Incrémente la version des boards (ids, ou sous-requête `values("board_id")`)."""
+    frames = _frames()
+    if frames and isinstance(board_ids, (list, tuple, set, frozenset)):
+        frames[-1].touched.update(board_ids)
+        return
+    _bump(board_ids)
+
+
+@contextmanager
+def collect(board_ids=()):
+    """
+    Regroupe les incréments du bloc (et des boards `board_ids`, s'il écrit) en
+    un UPDATE à la sortie. Imbriquable : le bloc le plus externe écrit, un bloc
+    interne sorti sur exception ne compte pas.
+    """
+    frames = _frames()
+    frame = _Frame(board_ids)
+    if frames:
+        frames.append(frame)
+        try:
+            yield
+        finally:
+            frames.pop()
+        parent = frames[-1]
+        parent.touched |= frame.result()
+        parent.wrote = parent.wrote or frame.wrote
+        return
+
+    _state.frames = [frame]
+    try:
+        with connection.execute_wrapper(_watch):
+            yield
+    finally:
+        _state.frames = None
+    pending = frame.result()
+    if pending:
+        _bump(sorted(pending))
@@ -0,0 +1,157 @@
+"""
+File de tâches en process, pour le travail qui n'a pas à retarder la réponse
+(index de doublons, compaction des positions, purges).
+
+- `defer(fn, *args, **kwargs)` : mise en file au commit de la transaction
+  courante (`transaction.on_commit`) ; rien si elle est annulée. Hors
+  transaction, mise en file immédiate.
+- Pool borné : BOARD_TASK_WORKERS threads (démarrés au premier usage, et
+  après un fork), file de BOARD_TASK_QUEUE_SIZE tâches. File pleine : la
+  tâche s'exécute dans le thread appelant (contre-pression plutôt que perte).
+- Échec : jusqu'à `retries` nouvelles tentatives, délai doublé à chaque fois.
+- Chaque tâche utilise la connexion DB de son thread, fermée selon
+  CONN_MAX_AGE comme en fin de requête.
+- BOARD_TASKS_EAGER (DJANGO_TASKS_EAGER=1) : exécution immédiate dans le
+  thread appelant (scripts, commandes, débogage).
+
+Pas de persistance : un arrêt brutal du process perd la file. Les tâches
+doivent donc être rattrapables (les commandes rebuild_* recalculent tout)
+et idempotentes (elles relisent l'état en base au lieu de recevoir un delta).
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+RETRY_DELAY = 0.05
+MAX_RETRY_DELAY = 2.0
+
+
+class TaskQueue:
+    def __init__(self, workers, maxsize):
+        self.workers = workers
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._pending = 0
+        self._pid = None
+        self._queue = None
+
+    def _ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            # Premier usage, ou process enfant après fork : threads et file neufs
+            self._queue = queue.Queue(self.maxsize)
+            self._pending = 0
+            for n in range(self.workers):
+                threading.Thread(target=self._worker, name=f"board-task-{n}", daemon=True).start()
+            self._pid = os.getpid()
+
+    def submit(self, name, fn, args, kwargs, retries):
+        self._ensure_started()
+        task = (name, fn, args, kwargs, retries)
+        with self._lock:
+            self._pending += 1
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            metrics.record_task(name, "inline")
+            try:
+                _run(*task)
+            finally:
+                self._done()
+
+    def _done(self):
+        with self._lock:
+            self._pending -= 1
+            if self._pending == 0:
+                self._idle.notify_all()
+
+    def _worker(self):
+        while True:
+            task = self._queue.get()
+            try:
+                close_old_connections()
+                _run(*task)
+            finally:
+                close_old_connections()
+                self._done()
+
+    def join(self, timeout=None):
+        """Attend que toutes les tâches soumises soient terminées ; False si timeout."""
+        with self._lock:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+
+def _run(name, fn, args, kwargs, retries):
+    delay = RETRY_DELAY
+    for attempt in range(retries + 1):
+        try:
+            fn(*args, **kwargs)
+        except Exception:
+            if attempt < retries:
+                metrics.record_task(name, "retry")
+                time.sleep(delay)
+                delay = min(delay * 2, MAX_RETRY_DELAY)
+                continue
+            metrics.record_task(name, "failed")
+            logger.exception("Tâche %s en échec après %s tentative(s)", name, attempt + 1)
+            return
+        metrics.record_task(name, "ok")
+        return
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def get_queue():
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = TaskQueue(
+                    workers=getattr(settings, "BOARD_TASK_WORKERS", 2),
+                    maxsize=getattr(settings, "BOARD_TASK_QUEUE_SIZE", 1000),
+                )
+    return _default
+
+
+def _task_name(fn):
+    return f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__qualname__}"
+
+
+def enqueue(fn, *args, retries=2, **kwargs):
+    """Exécute `fn(*args, **kwargs)` en arrière-plan, dès maintenant."""
+    name = _task_name(fn)
+    if getattr(settings, "BOARD_TASKS_EAGER", False):
+        _run(name, fn, args, kwargs, retries)
+        return
+    get_queue().submit(name, fn, args, kwargs, retries)
+
+
+def defer(fn, *args, retries=2, **kwargs):
+    """Comme `enqueue`, mais après le commit de la transaction courante."""
+    transaction.on_commit(lambda: enqueue(fn, *args, retries=retries, **kwargs))
+
+
+def drain(timeout=None):
+    """Attend la fin des tâches en cours (benchs, scripts, arrêt du process)."""
+    if _default is None or _default._pid != os.getpid():
+        return True
+    return _default.join(timeout)
+
+
+atexit.register(drain, 5)
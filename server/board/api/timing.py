@@ -0,0 +1,45 @@
+"""
+Mesures par requête (SQL, encodage JSON), partagées entre
+`board.middleware.RequestTimingMiddleware` et `json_nostore`.
+
+Quand le middleware est désactivé, aucun `RequestTiming` n'est actif :
+`current_timing()` renvoie None et rien n'est mesuré.
+"""
+import time
+from contextvars import ContextVar
+
+_current = ContextVar("board_request_timing", default=None)
+
+
+class RequestTiming:
+    """
+    Compteurs d'une requête. S'utilise aussi comme `execute_wrapper` Django
+    pour compter les requêtes SQL et cumuler leur durée.
+    """
+
+    __slots__ = ("queries", "db", "encode")
+
+    def __init__(self):
+        self.queries = 0
+        self.db = 0.0
+        self.encode = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db += time.perf_counter() - started
+            self.queries += 1
+
+
+def current_timing():
+    return _current.get()
+
+
+def activate(timing):
+    return _current.set(timing)
+
+
+def deactivate(token):
+    _current.reset(token)
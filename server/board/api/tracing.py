@@ -0,0 +1,128 @@
+"""
+Spans chronométrés légers autour des phases des services (move, reorder, quick-add).
+
+    with span("move_idea.load", idea_id=idea_id):
+        ...
+
+Chaque span terminé est transmis au sink configuré par BOARD_TRACE_SINK
+(chemin pointé vers un callable ou une classe, ex. "board.api.tracing.LoggingSink").
+Sans sink, `span()` renvoie un contexte partagé qui ne fait rien : le coût
+est celui d'un appel de fonction.
+"""
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger("board.trace")
+
+_current_span = ContextVar("board_current_span", default=None)
+
+_UNSET = object()
+_sink = _UNSET
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attrs):
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Span:
+    __slots__ = ("name", "attrs", "parent", "start", "duration", "_sink", "_token")
+
+    def __init__(self, name, attrs, sink):
+        self.name = name
+        self.attrs = attrs
+        self.parent = None
+        self.start = 0.0
+        self.duration = 0.0
+        self._sink = sink
+        self._token = None
+
+    def __enter__(self):
+        self.parent = _current_span.get()
+        self._token = _current_span.set(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self.start
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs["error"] = exc_type.__name__
+        try:
+            self._sink(self)
+        except Exception:
+            # un sink défaillant ne doit jamais casser une écriture
+            logger.exception("trace sink failed")
+        return False
+
+    def set(self, **attrs):
+        """Ajoute des attributs connus en cours de route (tailles, ids...)."""
+        self.attrs.update(attrs)
+
+    @property
+    def path(self):
+        names = []
+        node = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+    def to_dict(self):
+        return {
+            "name": self.name,
+            "path": self.path,
+            "duration_ms": round(self.duration * 1000, 3),
+            **self.attrs,
+        }
+
+
+class LoggingSink:
+    """Sink par défaut : une ligne de log INFO par span (logger `board.trace`)."""
+
+    def __call__(self, span):
+        logger.info("span %s %.2fms %s", span.path, span.duration * 1000, span.attrs)
+
+
+def get_sink():
+    global _sink
+    if _sink is _UNSET:
+        path = getattr(settings, "BOARD_TRACE_SINK", "")
+        if not path:
+            _sink = None
+        else:
+            obj = import_string(path)
+            _sink = obj() if isinstance(obj, type) else obj
+    return _sink
+
+
+def _reset_sink(*, setting, **kwargs):
+    global _sink
+    if setting == "BOARD_TRACE_SINK":
+        _sink = _UNSET
+
+
+setting_changed.connect(_reset_sink)
+
+
+def span(name, **attrs):
+    sink = get_sink()
+    if sink is None:
+        return NOOP_SPAN
+    return Span(name, attrs, sink)
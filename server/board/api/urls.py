@@ -1,4 +1,5 @@
 # API routes consumed by Next.js (API-first)
+from django.conf import settings
 from django.urls import path
 
 from .views_auth import (
@@ -10,19 +11,46 @@ from .views_auth import (
 from .views_boards import (
     boards_list_api,
     board_kanban_api,
+    board_stats_api,
+    board_clone_api,
+    board_tag_suggest_api,
 )
+from .views_batch import batch_api
+from .views_bootstrap import bootstrap_api
+from .views_metrics import metrics_api
 from .views_ideas import (
     board_idea_detail_api,
     board_idea_quick_add_api,
     board_idea_update_api,
     board_idea_move_api,
     board_column_reorder_api,
+    board_column_create_api,
+    board_columns_order_api,
+    board_column_rename_api,
+    board_column_delete_api,
+    board_idea_revisions_api,
+    board_idea_revision_detail_api,
 )
 
+if settings.BOARD_ASYNC_READ_VIEWS:
+    # ASGI : endpoints de lecture en async (mêmes URLs, mêmes réponses)
+    from .views_async import (  # noqa: F811
+        auth_me_api,
+        boards_list_api,
+        board_kanban_api,
+        board_idea_detail_api,
+    )
+
 urlpatterns = [
+    # Démarrage client (csrf + auth + boards + kanban)
+    path("bootstrap", bootstrap_api, name="api_bootstrap"),
+
     # Boards
     path("boards", boards_list_api, name="api_boards_list"),
     path("boards/<int:board_id>/kanban", board_kanban_api, name="api_board_kanban"),
+    path("boards/<int:board_id>/stats", board_stats_api, name="api_board_stats"),
+    path("boards/<int:board_id>/clone", board_clone_api, name="api_board_clone"),
+    path("boards/<int:board_id>/tags/suggest-for", board_tag_suggest_api, name="api_board_tag_suggest"),
 
     # Ideas
     path(
@@ -45,6 +73,16 @@ urlpatterns = [
         board_idea_move_api,
         name="api_board_idea_move",
     ),
+    path(
+        "boards/<int:board_id>/ideas/<int:idea_id>/revisions",
+        board_idea_revisions_api,
+        name="api_board_idea_revisions",
+    ),
+    path(
+        "boards/<int:board_id>/ideas/<int:idea_id>/revisions/<int:number>",
+        board_idea_revision_detail_api,
+        name="api_board_idea_revision_detail",
+    ),
 
     # Columns
     path(
@@ -52,10 +90,28 @@ urlpatterns = [
         board_column_reorder_api,
         name="api_board_column_reorder",
     ),
+    path("boards/<int:board_id>/columns", board_column_create_api, name="api_board_column_create"),
+    path("boards/<int:board_id>/columns/order", board_columns_order_api, name="api_board_columns_order"),
+    path(
+        "boards/<int:board_id>/columns/<int:column_id>/rename",
+        board_column_rename_api,
+        name="api_board_column_rename",
+    ),
+    path(
+        "boards/<int:board_id>/columns/<int:column_id>/delete",
+        board_column_delete_api,
+        name="api_board_column_delete",
+    ),
+
+    # Plusieurs écritures en une requête
+    path("batch", batch_api, name="api_batch"),
 
     # Auth
     path("auth/me", auth_me_api, name="api_auth_me"),
     path("auth/login", auth_login_api, name="api_auth_login"),
     path("auth/logout", auth_logout_api, name="api_auth_logout"),
     path("auth/csrf", auth_csrf_api, name="api_auth_csrf"),
+
+    # Observabilité
+    path("metrics", metrics_api, name="api_metrics"),
 ]
\ No newline at end of file
@@ -0,0 +1,86 @@
+"""
+Versions async des endpoints de lecture, pour un déploiement ASGI
+(uvicorn / daphne) avec DJANGO_ASYNC_VIEWS=1.
+
+Sous ASGI, une vue sync occupe un thread de l'exécuteur pendant toute la
+requête. Ici seules les requêtes SQL passent par l'ORM async : le reste
+(auth, sérialisation) tourne sur la boucle d'événements.
+
+Pas de gain de capacité avec SQLite : chaque requête de l'ORM async est un
+saut `sync_to_async` (thread_sensitive) vers le même thread, et ces sauts
+coûtent plus que le thread économisé (`loadtest_reads --compare`, voir
+docs/performance.md). Désactivé par défaut ; à re-mesurer avec un driver
+async (PostgreSQL / psycopg 3).
+Sous WSGI (gunicorn), garder les vues sync : board/api/urls.py choisit.
+"""
+from django.http import Http404
+from django.views.decorators.http import require_GET
+
+from .conditional import aboards_validators, aidea_validators, akanban_validators, conditional
+from .parsing import get_flag, get_int
+from .responses import json_nostore
+from .serializers import serialize_auth_state, serialize_board, serialize_idea_detail
+from .services.boards import akanban_snapshot, alist_boards
+from ..models import Board, Idea
+
+
+async def _arequire_auth(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return user, json_nostore({"error": "Authentication required"}, status=401)
+    return user, None
+
+
+async def _aget_board(board_id):
+    board = await Board.objects.filter(id=board_id).afirst()
+    if board is None:
+        raise Http404("No Board matches the given query.")
+    return board
+
+
+@require_GET
+async def auth_me_api(request):
+    return json_nostore(serialize_auth_state(await request.auser()))
+
+
+@require_GET
+@conditional(aboards_validators)
+async def boards_list_api(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return json_nostore({"boards": []})
+
+    overview = get_flag(request.GET, "overview")
+    recent = get_int(request.GET, "recent", 3)
+    return json_nostore({"boards": await alist_boards(overview=overview, recent=recent)})
+
+
+@require_GET
+@conditional(akanban_validators)
+async def board_kanban_api(request, board_id):
+    _, err = await _arequire_auth(request)
+    if err:
+        return err
+
+    board = await _aget_board(board_id)
+    return json_nostore(await akanban_snapshot(board))
+
+
+@require_GET
+@conditional(aidea_validators)
+async def board_idea_detail_api(request, board_id, idea_id):
+    _, err = await _arequire_auth(request)
+    if err:
+        return err
+
+    board = await _aget_board(board_id)
+    idea = await (
+        Idea.objects.select_related("column")
+        .prefetch_related("tags")
+        .filter(id=idea_id, column__board=board)
+        .afirst()
+    )
+    if idea is None:
+        raise Http404("No Idea matches the given query.")
+
+    return json_nostore({"board": serialize_board(board), "idea": serialize_idea_detail(idea)})
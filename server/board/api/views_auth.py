@@ -7,19 +7,12 @@ from django.views.decorators.csrf import csrf_protect, ensure_csrf_cookie
 from django.views.decorators.http import require_GET, require_POST
 
 from .responses import json_nostore
+from .serializers import serialize_auth_state
 
 
 @require_GET
 def auth_me_api(request):
-    user = request.user
-    if user.is_authenticated:
-        return json_nostore(
-            {
-                "authenticated": True,
-                "user": {"id": user.id, "username": user.get_username(), "email": user.email},
-            }
-        )
-    return json_nostore({"authenticated": False, "user": None})
+    return json_nostore(serialize_auth_state(request.user))
 
 
 @require_POST
@@ -39,12 +32,7 @@ def auth_login_api(request):
         return json_nostore({"error": "Invalid username or password"}, status=401)
 
     login(request, user)
-    return json_nostore(
-        {
-            "authenticated": True,
-            "user": {"id": user.id, "username": user.get_username(), "email": user.email},
-        }
-    )
+    return json_nostore(serialize_auth_state(user))
 
 
 @require_POST
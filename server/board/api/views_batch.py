@@ -0,0 +1,159 @@
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404
+from django.views.decorators.http import require_POST
+
+from . import operations, writes
+from .idempotency import idempotent
+from .operations import OperationError
+from .parsing import parse_payload
+from .responses import json_nostore, require_auth
+from .services import versions
+from .tracing import span
+
+# op -> (fonction, clés d'URL attendues dans la sous-opération)
+OPERATIONS = {
+    "idea.update": (operations.update_idea, ("board_id", "idea_id")),
+    "idea.move": (operations.move, ("board_id", "idea_id")),
+    "idea.quick_add": (operations.quick_add, ("board_id",)),
+    "column.reorder": (operations.reorder, ("board_id", "column_id")),
+    "column.create": (operations.create_column, ("board_id",)),
+    "column.rename": (operations.rename_column, ("board_id", "column_id")),
+    "column.delete": (operations.delete_column, ("board_id", "column_id")),
+    "board.reorder_columns": (operations.reorder_columns, ("board_id",)),
+}
+
+MODES = ("atomic", "best_effort")
+
+# Seules les idées ont des références "$<index>" : les sous-opérations ne
+# retournent qu'une idée, pas de board ni de colonne
+REFERENCE_KEYS = ("idea_id",)
+
+
+class _Abort(Exception):
+    """Interrompt le bloc atomique du mode `atomic` (rollback complet)."""
+
+
+def _resolve_id(key, value, results):
+    """
+    Entier, ou (pour `idea_id`) référence "$<index>" à l'idée créée/retournée
+    par une sous-opération précédente (ex. quick_add puis move de la nouvelle
+    carte).
+    """
+    if isinstance(value, str) and value.startswith("$"):
+        if key not in REFERENCE_KEYS:
+            raise OperationError(f"References are only allowed for {', '.join(REFERENCE_KEYS)}, not {key}")
+        try:
+            ref = results[int(value[1:])]
+        except (ValueError, IndexError):
+            raise OperationError(f"Invalid reference {value!r}")
+        idea = (ref.get("body") or {}).get("idea") if ref["status"] < 400 else None
+        if not idea:
+            raise OperationError(f"Reference {value!r} has no idea")
+        return idea["id"]
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise OperationError("Identifiers must be integers")
+
+
+def _execute(index, op, results):
+    """Exécute une sous-opération dans un savepoint ; retourne son résultat."""
+    if not isinstance(op, dict):
+        return {"index": index, "op": None, "status": 400, "body": {"error": "Operation must be an object"}}
+
+    name = op.get("op")
+    entry = OPERATIONS.get(name)
+    result = {"index": index, "op": name}
+    if entry is None:
+        result.update(status=400, body={"error": f"Unknown op {name!r}"})
+        return result
+
+    fn, keys = entry
+    try:
+        args = [_resolve_id(k, op.get(k), results) for k in keys]
+        payload = op.get("payload") or {}
+        if not isinstance(payload, dict):
+            raise OperationError("payload must be an object")
+        # collect() dans le savepoint : une opération en échec n'incrémente
+        # aucune version (services/versions.py)
+        with span("batch.op", op=name), transaction.atomic(), versions.collect():
+            body, status = fn(*args, payload)
+    except OperationError as e:
+        result.update(status=e.status, body=e.to_dict())
+    except Http404:
+        result.update(status=404, body={"error": "Not found"})
+    else:
+        result.update(status=status, body=body)
+    return result
+
+
+def _apply(ops, mode):
+    """Exécute les sous-opérations ; retourne (résultats, premier échec ou None)."""
+    results = []
+    failed = None
+    try:
+        with transaction.atomic(), versions.collect():
+            for index, op in enumerate(ops):
+                result = _execute(index, op, results)
+                results.append(result)
+                if result["status"] >= 400 and failed is None:
+                    failed = result
+                    if mode == "atomic":
+                        raise _Abort()
+    except _Abort:
+        for result in results[:-1]:
+            result["rolled_back"] = True
+    return results, failed
+
+
+@require_POST
+@idempotent
+def batch_api(request):
+    """
+    Plusieurs écritures en une requête : une seule résolution session/auth,
+    un seul contrôle CSRF et une seule transaction.
+
+    Corps : {"mode": "atomic" | "best_effort", "operations": [
+        {"op": "idea.update", "board_id": 1, "idea_id": 3, "payload": {...}},
+        {"op": "idea.quick_add", "board_id": 1, "payload": {"text": "..."}},
+        {"op": "idea.move", "board_id": 1, "idea_id": "$1", "payload": {...}},
+        ...
+    ]}
+
+    - atomic (défaut) : tout ou rien. À la première erreur, la transaction est
+      annulée et la réponse porte le statut de l'opération fautive.
+    - best_effort : chaque opération a son savepoint ; une erreur n'annule que
+      celle-ci. Réponse 200 avec le statut de chaque opération.
+    """
+    err = require_auth(request)
+    if err:
+        return err
+
+    payload = parse_payload(request)
+    mode = payload.get("mode") or "atomic"
+    ops = payload.get("operations")
+
+    if mode not in MODES:
+        return json_nostore({"error": f"mode must be one of {', '.join(MODES)}"}, status=400)
+    if not isinstance(ops, list) or not ops:
+        return json_nostore({"error": "operations must be a non-empty list"}, status=400)
+    max_ops = getattr(settings, "BOARD_BATCH_MAX_OPS", 50)
+    if len(ops) > max_ops:
+        return json_nostore({"error": f"Too many operations (max {max_ops})"}, status=400)
+
+    # Verrous de tous les boards visés (writes.run) ; transaction rejouée en
+    # entier sur « database is locked »
+    board_ids = [op.get("board_id") for op in ops if isinstance(op, dict)]
+    with span("batch", mode=mode, ops=len(ops)):
+        try:
+            results, failed = writes.run(board_ids, _apply, ops, mode)
+        except writes.Busy as e:
+            response = json_nostore(e.to_dict(), status=e.status)
+            response["Retry-After"] = "1"
+            return response
+
+    data = {"mode": mode, "ok": failed is None, "results": results}
+    if mode == "atomic" and failed is not None:
+        return json_nostore(data, status=failed["status"])
+    return json_nostore(data)
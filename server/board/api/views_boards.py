@@ -1,62 +1,89 @@
+from django.conf import settings
 from django.shortcuts import get_object_or_404
-from django.views.decorators.http import require_GET
+from django.views.decorators.http import require_GET, require_POST
 
+from .conditional import boards_validators, conditional, kanban_validators
+from .idempotency import idempotent
+from .parsing import get_flag, get_int, parse_payload
 from .responses import json_nostore, require_auth
-from ..models import Board, Column, Idea
+from .serializers import serialize_board
+from .services.boards import kanban_snapshot, list_boards
+from .services.cloning import clone_board
+from .services.stats import board_stats
+from .services.tag_suggestions import suggest
+from ..models import Board
 
 
 @require_GET
+@conditional(boards_validators)
 def boards_list_api(request):
     if not request.user.is_authenticated:
         return json_nostore({"boards": []})
 
-    boards = Board.objects.order_by("id").values("id", "name")
-    return json_nostore({"boards": list(boards)})
+    overview = get_flag(request.GET, "overview")
+    recent = get_int(request.GET, "recent", 3)
+    return json_nostore({"boards": list_boards(overview=overview, recent=recent)})
 
 
 @require_GET
+@conditional(kanban_validators)
 def board_kanban_api(request, board_id):
     err = require_auth(request)
     if err:
         return err
 
     board = get_object_or_404(Board, id=board_id)
+    return json_nostore(kanban_snapshot(board))
 
-    columns_qs = Column.objects.filter(board=board).order_by("order", "id")
-    ideas_qs = (
-        Idea.objects.filter(column__board=board)
-        .select_related("column")
-        .prefetch_related("tags")
+
+@require_GET
+def board_stats_api(request, board_id):
+    """Comptes par colonne / statut / tag / impact + temps moyen par colonne (compteurs BoardStat)."""
+    err = require_auth(request)
+    if err:
+        return err
+
+    board = get_object_or_404(Board, id=board_id)
+    return json_nostore({"board": serialize_board(board), **board_stats(board)})
+
+
+@require_GET
+def board_tag_suggest_api(request, board_id):
+    """
+    Tags proposés pendant la saisie : ?title=...&tags=a,b&limit=5.
+    Servi depuis la matrice de co-occurrence en mémoire (services/tag_suggestions.py).
+    """
+    err = require_auth(request)
+    if err:
+        return err
+
+    board = get_object_or_404(Board, id=board_id)
+    limit = get_int(request.GET, "limit", getattr(settings, "BOARD_TAG_SUGGEST_LIMIT", 8))
+    limit = max(1, min(limit, 50))
+    tag_names = [t.strip() for t in request.GET.get("tags", "").split(",") if t.strip()]
+    return json_nostore(
+        {"suggestions": suggest(board.id, title=request.GET.get("title", ""), tag_names=tag_names, limit=limit)}
     )
 
-    if hasattr(Idea, "position"):
-        ideas_qs = ideas_qs.order_by("column_id", "position", "id")
-    else:
-        ideas_qs = ideas_qs.order_by("column_id", "id")
-
-    ideas_by_col = {}
-    for idea in ideas_qs:
-        ideas_by_col.setdefault(idea.column_id, []).append(
-            {
-                "id": idea.id,
-                "title": idea.title,
-                "status": getattr(idea, "status", None),
-                "impact": getattr(idea, "impact", None),
-                "next_action": getattr(idea, "next_action", None),
-                "updated_at": idea.updated_at.isoformat() if getattr(idea, "updated_at", None) else None,
-                "tags": [t.name for t in idea.tags.all()] if hasattr(idea, "tags") else [],
-            }
-        )
-
-    columns = []
-    for col in columns_qs:
-        columns.append(
-            {
-                "id": col.id,
-                "name": col.name,
-                "order": getattr(col, "order", None),
-                "ideas": ideas_by_col.get(col.id, []),
-            }
-        )
-
-    return json_nostore({"board": {"id": board.id, "name": board.name}, "columns": columns})
\ No newline at end of file
+
+@require_POST
+@idempotent
+def board_clone_api(request, board_id):
+    """
+    Copie d'un board : {"name": "...", "structure_only": false}.
+    Nombre de requêtes fixe quelle que soit la taille du board (services.cloning).
+    """
+    err = require_auth(request)
+    if err:
+        return err
+
+    source = get_object_or_404(Board, id=board_id)
+    payload = parse_payload(request)
+    structure_only = payload.get("structure_only") in (True, "1", "true", "on")
+
+    try:
+        board, counts = clone_board(source, payload.get("name"), include_ideas=not structure_only)
+    except ValueError as e:
+        return json_nostore({"error": str(e)}, status=400)
+
+    return json_nostore({"board": serialize_board(board), "copied": counts}, status=201)
@@ -0,0 +1,44 @@
+from django.middleware.csrf import get_token
+from django.views.decorators.csrf import ensure_csrf_cookie
+from django.views.decorators.http import require_GET
+
+from .parsing import get_int
+from .responses import json_nostore
+from .serializers import serialize_auth_state
+from .services.boards import kanban_snapshot, list_boards
+from ..models import Board
+
+
+@ensure_csrf_cookie
+@require_GET
+def bootstrap_api(request):
+    """
+    Démarrage du client en un seul aller-retour :
+    cookie CSRF + état d'auth + liste des boards + kanban de `?board=<id>`.
+
+    Remplace la séquence auth/csrf -> auth/me -> boards -> boards/<id>/kanban.
+    Requêtes SQL fixes (session/user en cache) : boards, colonnes, idées, tags.
+    """
+    get_token(request)
+    user = request.user
+
+    data = {
+        "auth": serialize_auth_state(user),
+        "boards": [],
+        "kanban": None,
+    }
+    if not user.is_authenticated:
+        return json_nostore(data)
+
+    data["boards"] = list_boards()
+
+    board_id = get_int(request.GET, "board")
+    if board_id is not None:
+        # Le board est pris dans la liste déjà chargée : pas de requête en plus.
+        row = next((b for b in data["boards"] if b["id"] == board_id), None)
+        if row is None:
+            data["kanban_error"] = "Board not found"
+        else:
+            data["kanban"] = kanban_snapshot(Board(id=row["id"], name=row["name"]))
+
+    return json_nostore(data)
@@ -1,21 +1,19 @@
 from __future__ import annotations
 
-from django.shortcuts import get_object_or_404
 from django.views.decorators.http import require_GET, require_POST
-from .debug import debug_log
-from .parsing import parse_payload, get_int
+from . import operations, writes
+from .conditional import conditional, idea_validators
+from .idempotency import idempotent
+from .operations import OperationError, get_board, get_idea_in_board
+from .parsing import parse_payload
 from .responses import json_nostore, require_auth
 from .serializers import (
     serialize_board,
-    serialize_idea_card,
     serialize_idea_detail,
+    serialize_revision,
 )
-from .services.ideas import (
-    move_idea,
-    reorder_column,
-    quick_add_idea,
-)
-from ..models import Board, Column, Idea
+from .services.patches import body_hash
+from .services.revisions import list_revisions, reconstruct
 
 
 # -----------------------------------------------------------------------------
@@ -33,136 +31,99 @@ def _payload_or_400(request):
     return payload, None
 
 
-def _get_board(board_id: int) -> Board:
-    return get_object_or_404(Board, id=board_id)
-
-
-def _get_idea_in_board(board: Board, idea_id: int) -> Idea:
-    return get_object_or_404(
-        Idea.objects.select_related("column").prefetch_related("tags"),
-        id=idea_id,
-        column__board=board,
-    )
-
-
-
-def _normalize_tags_value(tags_val):
-    """Accept str 'a,b' or list; return list[str]."""
-    if isinstance(tags_val, str):
-        return [t.strip() for t in tags_val.split(",") if t.strip()]
-    if isinstance(tags_val, list):
-        return [str(t).strip() for t in tags_val if str(t).strip()]
-    return []
+def _run(operation, board_id, *args):
+    """
+    Exécute une opération d'écriture (board.api.operations) sous le verrou du
+    board, rejouée sur « database is locked » (writes.run), et la traduit en
+    réponse.
+    """
+    try:
+        data, status = writes.run(board_id, operation, board_id, *args)
+    except OperationError as e:
+        response = json_nostore(e.to_dict(), status=e.status)
+        if isinstance(e, writes.Busy):
+            response["Retry-After"] = "1"
+        return response
+    return json_nostore(data, status=status)
 
 
 # -----------------------------------------------------------------------------
 # Endpoints
 # -----------------------------------------------------------------------------
 @require_GET
+@conditional(idea_validators)
 def board_idea_detail_api(request, board_id, idea_id):
     err = _ensure_auth(request)
     if err:
         return err
 
-    board = _get_board(board_id)
-    idea = _get_idea_in_board(board, idea_id)
+    board = get_board(board_id)
+    idea = get_idea_in_board(board, idea_id)
 
     return json_nostore({"board": serialize_board(board), "idea": serialize_idea_detail(idea)})
 
 
+@require_GET
+def board_idea_revisions_api(request, board_id, idea_id):
+    """Historique d'une idée (sans les contenus), plus récente d'abord."""
+    err = _ensure_auth(request)
+    if err:
+        return err
+
+    board = get_board(board_id)
+    idea = get_idea_in_board(board, idea_id)
+
+    return json_nostore({"idea_id": idea.id, "revisions": [serialize_revision(r) for r in list_revisions(idea.id)]})
+
+
+@require_GET
+def board_idea_revision_detail_api(request, board_id, idea_id, number):
+    """Contenu reconstruit d'une révision (keyframe + deltas)."""
+    err = _ensure_auth(request)
+    if err:
+        return err
+
+    board = get_board(board_id)
+    idea = get_idea_in_board(board, idea_id)
+
+    found = reconstruct(idea.id, number)
+    if found is None:
+        return json_nostore({"error": "Revision not found"}, status=404)
+    revision, body = found
+
+    return json_nostore(
+        {
+            "idea_id": idea.id,
+            "revision": {
+                **serialize_revision(revision),
+                "body_md": body,
+                "body_hash": body_hash(body),
+            },
+        }
+    )
+
+
 @require_POST
+@idempotent
 def board_idea_update_api(request, board_id, idea_id):
     """
     Mise à jour des champs d'une idée (édition).
-    On garde la logique ici pour l'instant car elle touche plusieurs champs optionnels
-    (tags / impact / next_action / body_md), mais la sérialisation est déportée.
+    La logique (champs optionnels tags / impact / next_action / body_md) est
+    dans operations.update_idea, partagée avec l'endpoint batch.
     """
     err = _ensure_auth(request)
     if err:
         return err
 
-    board = _get_board(board_id)
-    idea = _get_idea_in_board(board, idea_id)
-
     payload, bad = _payload_or_400(request)
     if bad:
         return bad
 
-    updated_fields = []
-
-    # title
-    if "title" in payload:
-        title = (payload.get("title") or "").strip()
-        if not title:
-            return json_nostore({"error": "Title is required"}, status=400)
-        idea.title = title
-        updated_fields.append("title")
-
-    # body_md
-    if "body_md" in payload:
-        idea.body_md = payload.get("body_md") or ""
-        updated_fields.append("body_md")
-
-    # next_action (optional field)
-    if "next_action" in payload and hasattr(idea, "next_action"):
-        idea.next_action = payload.get("next_action") or ""
-        updated_fields.append("next_action")
-
-    # impact (optional field)
-    if "impact" in payload and hasattr(idea, "impact"):
-        impact_raw = payload.get("impact")
-        if impact_raw in (None, ""):
-            idea.impact = None
-            updated_fields.append("impact")
-        else:
-            impact_int = get_int(payload, "impact", default="__invalid__")
-            if impact_int == "__invalid__":
-                return json_nostore({"error": "Impact must be an integer"}, status=400)
-            idea.impact = impact_int
-            updated_fields.append("impact")
-
-    # column switch (optional)
-    if "column_id" in payload:
-        col_id = get_int(payload, "column_id")
-        if col_id is None:
-            return json_nostore({"error": "column_id must be an integer"}, status=400)
-
-        new_col = get_object_or_404(Column, id=col_id, board=board)
-        if idea.column_id != new_col.id:
-            idea.column = new_col
-            updated_fields.append("column")
-
-    # Save core fields
-    if updated_fields:
-        idea.save(update_fields=updated_fields)
-    else:
-        idea.save()
-
-    # Tags (optional)
-    if "tags" in payload and hasattr(idea, "tags"):
-        tags_list = _normalize_tags_value(payload.get("tags"))
-        try:
-            from ..models import Tag  # local import to avoid circular imports
-
-            tag_objs = []
-            for name in tags_list:
-                tag, _ = Tag.objects.get_or_create(name=name)
-                tag_objs.append(tag)
-            idea.tags.set(tag_objs)
-        except Exception:
-            # keep API tolerant: tags failures shouldn't block updates
-            pass
-
-        # refresh to return current tags/column
-        try:
-            idea = _get_idea_in_board(board, idea.id)
-        except Exception:
-            pass
-
-    return json_nostore({"idea": serialize_idea_detail(idea)})
+    return _run(operations.update_idea, board_id, idea_id, payload)
 
 
 @require_POST
+@idempotent
 def board_idea_move_api(request, board_id, idea_id):
     """
     Move/reorder via DnD.
@@ -176,51 +137,32 @@ def board_idea_move_api(request, board_id, idea_id):
     if bad:
         return bad
 
-    debug_log("[MOVE] board_id=%s idea_id=%s payload=%s", board_id, idea_id, payload)
-
-    # Accept multiple client keys (legacy compatible)
-    to_column_id = payload.get("to_column_id")
-    column_id = payload.get("column_id") or payload.get("column")
-    column_id = to_column_id or column_id
+    return _run(operations.move, board_id, idea_id, payload)
 
-    if not column_id:
-        return json_nostore({"error": "to_column_id/column_id is required"}, status=400)
 
-    try:
-        to_column_id = int(column_id)
-    except Exception:
-        return json_nostore({"error": "to_column_id/column_id must be an integer"}, status=400)
+@require_POST
+@idempotent
+def board_column_reorder_api(request, board_id, column_id):
+    """
+    Reorder strict d'une colonne (drag intra-colonne).
+    """
+    err = _ensure_auth(request)
+    if err:
+        return err
 
-    # target_index may be missing; accept synonyms
-    target_index = payload.get("target_index", payload.get("position", payload.get("order")))
-    try:
-        target_index = int(target_index) if target_index is not None else None
-    except Exception:
-        target_index = None
-
-    idea = move_idea(
-        board_id=int(board_id),
-        idea_id=int(idea_id),
-        to_column_id=int(to_column_id),
-        target_index=target_index,
-    )
+    payload, bad = _payload_or_400(request)
+    if bad:
+        return bad
 
-    return json_nostore(
-        {
-            "ok": True,
-            "idea": {
-                "id": idea.id,
-                "column_id": idea.column_id,
-                **({"position": idea.position} if hasattr(idea, "position") else {}),
-            },
-        }
-    )
+    return _run(operations.reorder, board_id, column_id, payload)
 
 
 @require_POST
-def board_column_reorder_api(request, board_id, column_id):
+@idempotent
+def board_idea_quick_add_api(request, board_id):
     """
-    Reorder strict d'une colonne (drag intra-colonne).
+    Quick add: parse du texte (#tags @colonne !impact) + création.
+    La création en base (position fin de colonne) est déportée dans le service.
     """
     err = _ensure_auth(request)
     if err:
@@ -230,37 +172,59 @@ def board_column_reorder_api(request, board_id, column_id):
     if bad:
         return bad
 
-    ordered_ids = payload.get("ordered_ids") or payload.get("orderedIds") or payload.get("ids")
-    if isinstance(ordered_ids, str):
-        try:
-            import json as _json
-            ordered_ids = _json.loads(ordered_ids)
-        except Exception:
-            pass
+    return _run(operations.quick_add, board_id, payload)
 
-    if not isinstance(ordered_ids, list) or not ordered_ids:
-        return json_nostore({"error": "ordered_ids must be a non-empty list"}, status=400)
 
-    try:
-        ordered_ids = [int(i) for i in ordered_ids]
-    except Exception:
-        return json_nostore({"error": "ordered_ids must be integers"}, status=400)
+@require_POST
+@idempotent
+def board_column_create_api(request, board_id):
+    """Nouvelle colonne : {"name": "...", "index": 2} (index optionnel)."""
+    err = _ensure_auth(request)
+    if err:
+        return err
 
-    debug_log("[REORDER] board_id=%s column_id=%s ordered_ids=%s", board_id, column_id, ordered_ids)
+    payload, bad = _payload_or_400(request)
+    if bad:
+        return bad
 
-    try:
-        reorder_column(board_id=int(board_id), column_id=int(column_id), ordered_ids=ordered_ids)
-    except ValueError:
-        return json_nostore({"error": "Some ideas do not belong to this column"}, status=400)
+    return _run(operations.create_column, board_id, payload)
+
+
+@require_POST
+@idempotent
+def board_columns_order_api(request, board_id):
+    """Ordre complet des colonnes du board : {"column_ids": [...]} (2 UPDATE)."""
+    err = _ensure_auth(request)
+    if err:
+        return err
+
+    payload, bad = _payload_or_400(request)
+    if bad:
+        return bad
 
-    return json_nostore({"ok": True})
+    return _run(operations.reorder_columns, board_id, payload)
 
 
 @require_POST
-def board_idea_quick_add_api(request, board_id):
+@idempotent
+def board_column_rename_api(request, board_id, column_id):
+    err = _ensure_auth(request)
+    if err:
+        return err
+
+    payload, bad = _payload_or_400(request)
+    if bad:
+        return bad
+
+    return _run(operations.rename_column, board_id, column_id, payload)
+
+
+@require_POST
+@idempotent
+def board_column_delete_api(request, board_id, column_id):
     """
-    Quick add: parse du texte (#tags @colonne !impact) + création.
-    La création en base (position fin de colonne) est déportée dans le service.
+    Suppression d'une colonne : {"target_column_id": 3}.
+    Les idées sont déplacées en bloc en fin de colonne cible (pas de cascade).
     """
     err = _ensure_auth(request)
     if err:
@@ -270,88 +234,4 @@ def board_idea_quick_add_api(request, board_id):
     if bad:
         return bad
 
-    raw_text = (payload.get("text") or payload.get("title") or "").strip()
-    column_id = payload.get("column_id")
-
-    if not raw_text:
-        return json_nostore({"error": "Text or title is required"}, status=400)
-
-    board = _get_board(board_id)
-
-    # Simple inline parsing: #tag @column !impact
-    words = raw_text.split()
-    tag_names = []
-    column_hint = None
-    impact_value = None
-    remaining = []
-
-    for w in words:
-        if w.startswith("#") and len(w) > 1:
-            name = w[1:].strip().strip(",;")
-            if name:
-                tag_names.append(name)
-            continue
-
-        if w.startswith("@") and len(w) > 1:
-            name = w[1:].strip().strip(",;")
-            if name:
-                column_hint = name
-            continue
-
-        if w.startswith("!") and len(w) > 1:
-            n = w[1:].strip().strip(",;")
-            try:
-                impact_value = int(n)
-                continue
-            except Exception:
-                pass
-
-        remaining.append(w)
-
-    title = " ".join(remaining).strip() or raw_text
-
-    # Resolve destination column_id
-    resolved_column_id = None
-
-    if column_id is not None:
-        try:
-            resolved_column_id = int(column_id)
-        except Exception:
-            return json_nostore({"error": "column_id must be an integer"}, status=400)
-    elif column_hint:
-        col = Column.objects.filter(board=board, name__iexact=column_hint).order_by("order", "id").first()
-        if col:
-            resolved_column_id = col.id
-
-    # Create idea (service sets position at end when supported)
-    try:
-        idea = quick_add_idea(board_id=int(board_id), title=title, column_id=resolved_column_id)
-    except ValueError as e:
-        return json_nostore({"error": str(e)}, status=400)
-
-    # impact (optional)
-    if impact_value is not None and hasattr(idea, "impact"):
-        try:
-            idea.impact = impact_value
-            idea.save(update_fields=["impact"])
-        except Exception:
-            pass
-
-    # tags (optional)
-    if tag_names and hasattr(idea, "tags"):
-        try:
-            from ..models import Tag
-
-            for name in tag_names:
-                tag, _ = Tag.objects.get_or_create(name=name)
-                idea.tags.add(tag)
-        except Exception:
-            pass
-
-        # refresh for tags
-        try:
-            idea = _get_idea_in_board(board, idea.id)
-        except Exception:
-            pass
-
-    return json_nostore({"idea": serialize_idea_card(idea)}, status=201)
\ No newline at end of file
+    return _run(operations.delete_column, board_id, column_id, payload)
@@ -0,0 +1,31 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from . import metrics
+from .responses import json_nostore
+
+
+def _authorized(request):
+    """Session staff, ou `Authorization: Bearer <BOARD_METRICS_TOKEN>` pour le scraper."""
+    token = getattr(settings, "BOARD_METRICS_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    if token and header.startswith("Bearer "):
+        return hmac.compare_digest(header[len("Bearer "):].strip(), token)
+    user = request.user
+    return user.is_authenticated and user.is_staff
+
+
+@require_GET
+def metrics_api(request):
+    if not metrics.enabled():
+        raise Http404("Metrics disabled")
+
+    if not _authorized(request):
+        return json_nostore({"error": "Authentication required"}, status=401)
+
+    resp = HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+    resp["Cache-Control"] = "no-store, no-cache, must-revalidate, max-age=0"
+    return resp
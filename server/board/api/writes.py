@@ -0,0 +1,122 @@
+"""
+Exécution des écritures d'un board, pour tenir la charge sous SQLite.
+
+SQLite n'a qu'un verrou d'écriture pour toute la base. Sous des drag & drop
+concurrents, les transactions attendaient ce verrou dans le busy handler de
+SQLite (attentes croissantes, sans ordre), puis échouaient en 500
+« database is locked » au bout du timeout (scripts/loadtest_dnd.py).
+
+`run(board_ids, fn, *args)` :
+- prend un verrou par board dans ce process : les écritures d'un même board
+  passent une à une, en file sur un `threading.Lock` au lieu de se disputer
+  le verrou SQLite. Les écritures de boards différents ne s'attendent pas ici ;
+- exécute `fn` dans une seule transaction. Avec `transaction_mode=IMMEDIATE`
+  (settings), le verrou SQLite est pris dès le BEGIN : un « database is
+  locked » ne peut survenir qu'avant la première écriture, la transaction est
+  donc rejouable sans risque de double écriture ;
+- rejoue jusqu'à BOARD_WRITE_RETRIES fois, après une pause aléatoire
+  (« full jitter ») dont le plafond double à chaque tentative ;
+- au-delà, lève `OperationError` 503 : le client peut réessayer ;
+- incrémente la version des boards touchés dans la même transaction, si
+  elle a réellement écrit (services/versions.py : validateurs ETag des
+  lectures).
+
+Dans une transaction déjà ouverte (batch, appelant atomique), le verrou SQLite
+est déjà tenu : `fn` s'exécute directement, sans verrou de board ni rejeu.
+"""
+import random
+import threading
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connection, transaction
+
+from . import metrics
+from .operations import OperationError
+from .services import versions
+from .tracing import span
+
+BACKOFF_BASE = 0.02
+BACKOFF_MAX = 0.5
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+class Busy(OperationError):
+    """Verrou d'écriture introuvable après les nouvelles tentatives."""
+
+    def __init__(self):
+        super().__init__("Database is busy, retry shortly", status=503)
+
+
+def is_lock_error(exc):
+    return isinstance(exc, OperationalError) and "locked" in str(exc)
+
+
+def board_lock(board_id):
+    lock = _locks.get(board_id)
+    if lock is None:
+        with _locks_guard:
+            lock = _locks.setdefault(board_id, threading.Lock())
+    return lock
+
+
+def _board_ids(board_ids):
+    if board_ids is None:
+        return []
+    if isinstance(board_ids, (list, tuple, set, frozenset)):
+        values = board_ids
+    else:
+        values = [board_ids]
+    ids = set()
+    for value in values:
+        try:
+            ids.add(int(value))
+        except (TypeError, ValueError):
+            continue  # id invalide : l'opération le refusera elle-même
+    # Ordre fixe : deux écritures multi-boards ne peuvent pas s'interbloquer
+    return sorted(ids)
+
+
+def run(board_ids, fn, *args, **kwargs):
+    """`fn(*args, **kwargs)` sous les verrous des boards `board_ids` (id ou liste), transaction rejouable."""
+    ids = _board_ids(board_ids)
+    if connection.in_atomic_block:
+        with versions.collect(ids):
+            return fn(*args, **kwargs)
+
+    retries = getattr(settings, "BOARD_WRITE_RETRIES", 4)
+    timeout = getattr(settings, "BOARD_WRITE_LOCK_TIMEOUT", 10)
+
+    acquired = []
+    try:
+        with span("writes.wait", boards=len(ids)):
+            deadline = time.monotonic() + timeout
+            for board_id in ids:
+                lock = board_lock(board_id)
+                if not lock.acquire(timeout=max(0.0, deadline - time.monotonic())):
+                    metrics.record_write("busy")
+                    raise Busy()
+                acquired.append(lock)
+
+        ceiling = BACKOFF_BASE
+        for attempt in range(retries + 1):
+            try:
+                with transaction.atomic(), versions.collect(ids):
+                    result = fn(*args, **kwargs)
+            except OperationalError as e:
+                if not is_lock_error(e):
+                    raise
+                if attempt == retries:
+                    metrics.record_write("busy")
+                    raise Busy() from e
+                metrics.record_write("retry")
+                time.sleep(random.uniform(0, ceiling))
+                ceiling = min(ceiling * 2, BACKOFF_MAX)
+                continue
+            metrics.record_write("ok")
+            return result
+    finally:
+        for lock in reversed(acquired):
+            lock.release()
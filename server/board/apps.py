@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class BoardConfig(AppConfig):
     name = 'board'
+
+    def ready(self):
+        from . import signals
+        from .api import metrics
+
+        signals.connect_user_signals()
+        if metrics.enabled():
+            metrics.prune_snapshots()
@@ -0,0 +1,81 @@
+import copy
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .api import metrics
+
+
+def user_cache_key(user_id):
+    return f"board:user:v2:{user_id}"  # v2 : entrée sans mot de passe
+
+
+def invalidate_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def _cache_entry(user):
+    """
+    Copie de l'utilisateur sans le hash du mot de passe, et les empreintes de
+    session qui en dérivent (seul usage du mot de passe à chaque requête).
+    """
+    entry = copy.copy(user)
+    # Champ différé : rechargé depuis la base si on y accède, et exclu d'un
+    # save() de cette instance (qui n'écrase donc pas le mot de passe).
+    del entry.__dict__["password"]
+    return entry, user.get_session_auth_hash(), list(user.get_session_auth_fallback_hash())
+
+
+def _session_hash(user, cached):
+    if "password" in user.__dict__:  # rechargé ou modifié depuis la mise en cache
+        return type(user).get_session_auth_hash(user)
+    return cached
+
+
+def _session_fallback_hashes(user, cached):
+    if "password" in user.__dict__:
+        return type(user).get_session_auth_fallback_hash(user)
+    return iter(cached)
+
+
+def _from_cache_entry(entry):
+    user, session_hash, fallback_hashes = entry
+    # Attributs d'instance : masquent les méthodes appelées par
+    # django.contrib.auth.get_user() pour vérifier la session.
+    user.get_session_auth_hash = partial(_session_hash, user, session_hash)
+    user.get_session_auth_fallback_hash = partial(_session_fallback_hashes, user, fallback_hashes)
+    return user
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend dont `get_user()` passe par le cache.
+
+    AuthenticationMiddleware appelle `get_user()` à chaque requête : sans cache,
+    chaque poll du client coûte un SELECT sur auth_user. L'entrée est invalidée
+    à chaque sauvegarde/suppression de l'utilisateur (changement de mot de passe
+    inclus) et au logout (voir board/signals.py).
+
+    Le hash du mot de passe n'est pas mis en cache (fichiers picklés hors de la
+    base) : seules les empreintes de session, des HMAC qui en dérivent, le sont.
+    """
+
+    def get_user(self, user_id):
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is not None:
+            metrics.record_cache("user", True)
+            user = _from_cache_entry(entry)
+            return user if self.user_can_authenticate(user) else None
+
+        metrics.record_cache("user", False)
+        user = super().get_user(user_id)
+        if user is not None:
+            cache.set(key, _cache_entry(user), getattr(settings, "BOARD_USER_CACHE_TIMEOUT", 300))
+        return user
+
+    async def aget_user(self, user_id):
+        return await sync_to_async(self.get_user)(user_id)
@@ -0,0 +1,95 @@
+"""
+Outils partagés par les commandes de mesure (bench_api, ...).
+
+Le préfixe `_` empêche Django d'exposer ce module comme une commande.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from board.api import tasks
+from board.models import Board, Column, Idea
+
+BENCH_PREFIX = "Bench"
+BENCH_USERNAME = "bench"
+BENCH_PASSWORD = "bench-password"
+
+
+@contextmanager
+def benchmark_database():
+    """
+    Crée une base de test jetable (comme `manage.py test`) le temps du bloc :
+    les mesures ne touchent jamais la base de dev/prod.
+    """
+    setup_test_environment(debug=False)
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    previous_test_name = test_settings.get("NAME")
+    if connection.vendor == "sqlite" and not previous_test_name:
+        # Base SQLite en fichier (et non en mémoire partagée) : les threads de
+        # board/api/tasks.py attendent le verrou au lieu d'échouer.
+        test_settings["NAME"] = os.path.join(tempfile.gettempdir(), f"studioboard-bench-{os.getpid()}.sqlite3")
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        tasks.drain(10)
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = previous_test_name
+        teardown_test_environment()
+
+
+def seed_dataset(ideas, *, boards=3, seed=42):
+    """Vide la base puis génère un jeu de données de `ideas` idées."""
+    call_command("flush", interactive=False, verbosity=0)
+    call_command(
+        "generate_dataset",
+        ideas=ideas,
+        boards=boards,
+        seed=seed,
+        prefix=BENCH_PREFIX,
+        stdout=StringIO(),
+    )
+    get_user_model().objects.create_user(BENCH_USERNAME, password=BENCH_PASSWORD)
+
+
+def bench_user():
+    return get_user_model().objects.get(username=BENCH_USERNAME)
+
+
+def bench_context():
+    """
+    Ids utiles aux scénarios : le premier board généré, ses deux colonnes les
+    plus remplies et une idée de la première.
+    """
+    board = Board.objects.filter(name__startswith=f"{BENCH_PREFIX} ").order_by("id").first()
+    columns = list(Column.objects.filter(board=board).order_by("order", "id"))
+    if len(columns) < 2:
+        raise RuntimeError("Le jeu de données doit avoir au moins deux colonnes.")
+
+    idea = Idea.objects.filter(column=columns[0]).order_by("position", "id").first()
+    if idea is None:
+        raise RuntimeError("Le jeu de données doit contenir des idées.")
+
+    return {
+        "board_id": board.id,
+        "column_id": columns[0].id,
+        "other_column_id": columns[1].id,
+        "idea_id": idea.id,
+    }
+
+
+def percentile(values, pct):
+    """Percentile par interpolation linéaire (values non vide)."""
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
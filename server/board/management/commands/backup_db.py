@@ -0,0 +1,162 @@
+import gzip
+import shutil
+import sqlite3
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+
+class Command(BaseCommand):
+    help = (
+        "Sauvegarde à chaud de la base SQLite via l'API de backup en ligne "
+        "(copie par paquets de pages, sans bloquer les écritures)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=None,
+            help="Fichier ou dossier de destination (défaut: <BASE_DIR>/backups/)",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Alias de la base à sauvegarder (défaut: 'default')",
+        )
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=256,
+            help="Nombre de pages copiées par étape (défaut: 256)",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0.05,
+            help="Pause en secondes entre deux étapes (défaut: 0.05)",
+        )
+        parser.add_argument(
+            "--compress",
+            action="store_true",
+            help="Compresse la sauvegarde en .gz après vérification",
+        )
+        parser.add_argument(
+            "--no-verify",
+            action="store_true",
+            help="Ne lance pas le PRAGMA integrity_check sur la copie",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        alias = options["database"]
+        if alias not in connections.databases:
+            raise CommandError(f"Base inconnue: {alias}")
+
+        db_settings = connections.databases[alias]
+        if "sqlite3" not in db_settings["ENGINE"]:
+            raise CommandError("backup_db ne fonctionne qu'avec SQLite.")
+
+        source = Path(db_settings["NAME"])
+        if not source.exists():
+            raise CommandError(f"Fichier de base introuvable: {source}")
+
+        if options["pages"] <= 0:
+            raise CommandError("--pages doit être > 0")
+
+        target = self._resolve_target(options["output"], source)
+        partial = target.with_name(target.name + ".partial")
+        target.parent.mkdir(parents=True, exist_ok=True)
+
+        started = time.monotonic()
+        self._backup(source, partial, pages=options["pages"], sleep=options["sleep"])
+
+        if not options["no_verify"]:
+            self._verify(partial)
+            self.stdout.write(self.style.SUCCESS("Vérification OK (integrity_check)."))
+
+        partial.replace(target)
+
+        if options["compress"]:
+            target = self._compress(target)
+
+        elapsed = time.monotonic() - started
+        size_kb = target.stat().st_size / 1024
+        self.stdout.write(
+            self.style.SUCCESS(f"Sauvegarde écrite: {target} ({size_kb:.0f} Ko, {elapsed:.2f}s)")
+        )
+
+    # ------------------------------------------------------------------
+    # Étapes
+    # ------------------------------------------------------------------
+    def _resolve_target(self, output, source):
+        stamp = timezone.localtime().strftime("%Y%m%d-%H%M%S")
+        filename = f"{source.stem}-{stamp}.sqlite3"
+
+        if not output:
+            return Path(settings.BASE_DIR) / "backups" / filename
+
+        if output.endswith(("/", "\\")) or Path(output).is_dir():
+            return Path(output) / filename
+        return Path(output)
+
+    def _backup(self, source, destination, *, pages, sleep):
+        """
+        Copie `source` vers `destination` par paquets de `pages` pages.
+        Entre deux étapes, SQLite relâche le verrou de lecture : les écritures
+        (move, quick-add...) passent donc pendant la pause `sleep`.
+
+        Le `sleep` de `Connection.backup` ne s'applique qu'aux étapes en échec
+        (BUSY / LOCKED) : la pause entre étapes réussies est faite ici, dans
+        le callback de progression. Retourne le nombre de pauses.
+        """
+        if destination.exists():
+            destination.unlink()
+
+        src = sqlite3.connect(f"file:{source}?mode=ro", uri=True)
+        dst = sqlite3.connect(str(destination))
+        verbosity = self.verbosity
+        pauses = 0
+
+        def progress(status, remaining, total):
+            nonlocal pauses
+            if verbosity >= 2 and total:
+                done = total - remaining
+                self.stdout.write(f"  {done}/{total} pages")
+            if remaining and sleep > 0:
+                time.sleep(sleep)
+                pauses += 1
+
+        try:
+            with dst:
+                src.backup(dst, pages=pages, progress=progress, sleep=sleep)
+        except sqlite3.Error as e:
+            dst.close()
+            destination.unlink(missing_ok=True)
+            raise CommandError(f"Échec de la sauvegarde: {e}") from e
+        finally:
+            src.close()
+        dst.close()
+        return pauses
+
+    def _verify(self, path):
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute("PRAGMA integrity_check").fetchall()
+        finally:
+            conn.close()
+
+        if rows != [("ok",)]:
+            path.unlink(missing_ok=True)
+            details = ", ".join(str(r[0]) for r in rows[:5])
+            raise CommandError(f"Sauvegarde corrompue: {details}")
+
+    def _compress(self, path):
+        gz_path = path.with_name(path.name + ".gz")
+        with open(path, "rb") as src, gzip.open(gz_path, "wb", compresslevel=6) as dst:
+            shutil.copyfileobj(src, dst, length=1024 * 1024)
+        path.unlink()
+        return gz_path
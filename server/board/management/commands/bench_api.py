@@ -0,0 +1,313 @@
+import json
+import platform
+import time
+import tracemalloc
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from board.models import Idea
+
+from ._bench import (
+    BENCH_PASSWORD,
+    BENCH_USERNAME,
+    bench_context,
+    bench_user,
+    benchmark_database,
+    percentile,
+    seed_dataset,
+)
+
+
+# -----------------------------------------------------------------------------
+# Scénarios
+# -----------------------------------------------------------------------------
+# Chaque endpoint : (nom, méthode, url(ctx), payload(ctx, i) | None, client).
+# `client` vaut "user" (session connectée partagée) ou "auth" (client dédié aux
+# endpoints d'auth, pour ne pas casser la session des autres scénarios).
+# Les mutations sont écrites pour être rejouables : le volume ne dérive pas.
+
+
+def _move_payload(ctx, i):
+    # Aller-retour entre les deux colonnes pour garder des tailles stables.
+    target = ctx["other_column_id"] if i % 2 == 0 else ctx["column_id"]
+    return {"to_column_id": target, "target_index": 0}
+
+
+def _reorder_payload(ctx, i):
+    ids = ctx["reorder_ids"]
+    return {"ordered_ids": ids if i % 2 == 0 else list(reversed(ids))}
+
+
+ENDPOINTS = [
+    (
+        "bootstrap",
+        "get",
+        lambda c: reverse("api_bootstrap") + f"?board={c['board_id']}",
+        None,
+        "user",
+    ),
+    ("boards_list", "get", lambda c: reverse("api_boards_list"), None, "user"),
+    (
+        "board_kanban",
+        "get",
+        lambda c: reverse("api_board_kanban", args=[c["board_id"]]),
+        None,
+        "user",
+    ),
+    (
+        "idea_detail",
+        "get",
+        lambda c: reverse("api_board_idea_detail", args=[c["board_id"], c["idea_id"]]),
+        None,
+        "user",
+    ),
+    (
+        "idea_update",
+        "post",
+        lambda c: reverse("api_board_idea_update", args=[c["board_id"], c["idea_id"]]),
+        lambda c, i: {"title": f"Bench update {i}", "impact": i % 6},
+        "user",
+    ),
+    (
+        "idea_move",
+        "post",
+        lambda c: reverse("api_board_idea_move", args=[c["board_id"], c["idea_id"]]),
+        _move_payload,
+        "user",
+    ),
+    (
+        "column_reorder",
+        "post",
+        lambda c: reverse("api_board_column_reorder", args=[c["board_id"], c["reorder_column_id"]]),
+        _reorder_payload,
+        "user",
+    ),
+    (
+        "idea_quick_add",
+        "post",
+        lambda c: reverse("api_board_idea_quick_add", args=[c["board_id"]]),
+        lambda c, i: {"text": f"Bench quick add {i} #bench !impact=2"},
+        "user",
+    ),
+    ("auth_me", "get", lambda c: reverse("api_auth_me"), None, "user"),
+    ("auth_csrf", "get", lambda c: reverse("api_auth_csrf"), None, "auth"),
+    (
+        "auth_login",
+        "post",
+        lambda c: reverse("api_auth_login"),
+        lambda c, i: {"username": BENCH_USERNAME, "password": BENCH_PASSWORD},
+        "auth",
+    ),
+    ("auth_logout", "post", lambda c: reverse("api_auth_logout"), lambda c, i: {}, "auth"),
+]
+
+ENDPOINT_NAMES = [e[0] for e in ENDPOINTS]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure latence (p50/p95), nombre de requêtes SQL et mémoire allouée "
+        "de chaque endpoint API sur des jeux de données de plusieurs tailles, "
+        "et compare à une baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="100,1000,10000",
+            help="Tailles de jeux de données (nombre d'idées), séparées par des virgules",
+        )
+        parser.add_argument("--iterations", type=int, default=30, help="Mesures par endpoint (défaut: 30)")
+        parser.add_argument("--warmup", type=int, default=3, help="Appels de chauffe par endpoint (défaut: 3)")
+        parser.add_argument(
+            "--only",
+            default="",
+            help=f"Endpoints à mesurer, séparés par des virgules ({', '.join(ENDPOINT_NAMES)})",
+        )
+        parser.add_argument("--output", default=None, help="Écrit les résultats JSON dans ce fichier")
+        parser.add_argument("--baseline", default=None, help="Fichier JSON de référence à comparer")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.25,
+            help="Hausse relative du p95 tolérée avant régression (défaut: 0.25)",
+        )
+        parser.add_argument(
+            "--min-delta-ms",
+            type=float,
+            default=1.0,
+            help="Hausse absolue du p95 ignorée en dessous de ce seuil (défaut: 1.0 ms)",
+        )
+        parser.add_argument(
+            "--no-fail",
+            action="store_true",
+            help="Signale les régressions sans retourner d'erreur",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(s) for s in options["sizes"].split(",") if s.strip()]
+        except ValueError:
+            raise CommandError("--sizes doit être une liste d'entiers")
+        if not sizes or min(sizes) < 10:
+            raise CommandError("--sizes : au moins une taille >= 10")
+
+        only = [n.strip() for n in options["only"].split(",") if n.strip()]
+        unknown = set(only) - set(ENDPOINT_NAMES)
+        if unknown:
+            raise CommandError(f"Endpoints inconnus: {', '.join(sorted(unknown))}")
+        endpoints = [e for e in ENDPOINTS if not only or e[0] in only]
+
+        if options["iterations"] < 1:
+            raise CommandError("--iterations doit être >= 1")
+
+        report = {
+            "meta": {
+                "created_at": timezone.now().isoformat(),
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "iterations": options["iterations"],
+            },
+            "results": {},
+        }
+
+        with benchmark_database():
+            for size in sizes:
+                self.stdout.write(self.style.MIGRATE_HEADING(f"Jeu de données: {size} idées"))
+                seed_dataset(size)
+                results = self._run_size(endpoints, options)
+                report["results"][str(size)] = results
+                self._print_results(results)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(report, fh, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f"Résultats écrits: {options['output']}"))
+
+        if options["baseline"]:
+            self._compare(report, options)
+
+    # ------------------------------------------------------------------
+    # Mesures
+    # ------------------------------------------------------------------
+    def _run_size(self, endpoints, options):
+        ctx = bench_context()
+        ids = list(
+            Idea.objects.filter(column_id=ctx["other_column_id"])
+            .order_by("position", "id")
+            .values_list("id", flat=True)
+        )
+        ctx["reorder_column_id"] = ctx["other_column_id"]
+        ctx["reorder_ids"] = ids
+
+        user_client = Client()
+        user_client.force_login(bench_user())
+        auth_client = Client()
+
+        results = {}
+        for name, method, url_fn, payload_fn, client_kind in endpoints:
+            client = user_client if client_kind == "user" else auth_client
+            url = url_fn(ctx)
+
+            if name == "column_reorder" and not ids:
+                continue
+
+            def prepare():
+                # Le logout a besoin d'une session ouverte, hors mesure.
+                if name == "auth_logout":
+                    client.force_login(bench_user())
+
+            def call(i):
+                started = time.perf_counter()
+                if method == "get":
+                    resp = client.get(url)
+                else:
+                    resp = client.post(url, data=json.dumps(payload_fn(ctx, i)), content_type="application/json")
+                elapsed = time.perf_counter() - started
+                if resp.status_code >= 400:
+                    raise CommandError(f"{name}: HTTP {resp.status_code} {resp.content[:200]!r}")
+                return elapsed
+
+            for i in range(options["warmup"]):
+                prepare()
+                call(i)
+
+            # Passe instrumentée (requêtes + mémoire), séparée des mesures de
+            # latence pour ne pas les fausser.
+            prepare()
+            tracemalloc.start()
+            with CaptureQueriesContext(connection) as captured:
+                call(0)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            # captured_queries est relu dans connection.queries : figer le compte
+            # avant les appels suivants (reset_queries à chaque requête).
+            queries = len(captured)
+
+            timings = []
+            for i in range(options["iterations"]):
+                prepare()
+                timings.append(call(i) * 1000)
+
+            results[name] = {
+                "p50_ms": round(percentile(timings, 50), 3),
+                "p95_ms": round(percentile(timings, 95), 3),
+                "mean_ms": round(sum(timings) / len(timings), 3),
+                "queries": queries,
+                "alloc_peak_kb": round(peak / 1024, 1),
+                "iterations": len(timings),
+            }
+        return results
+
+    # ------------------------------------------------------------------
+    # Restitution
+    # ------------------------------------------------------------------
+    def _print_results(self, results):
+        header = f"{'endpoint':<18}{'p50 ms':>10}{'p95 ms':>10}{'queries':>9}{'alloc KB':>10}"
+        self.stdout.write(header)
+        for name, r in results.items():
+            self.stdout.write(
+                f"{name:<18}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['queries']:>9}{r['alloc_peak_kb']:>10.1f}"
+            )
+
+    def _compare(self, report, options):
+        try:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Baseline illisible: {e}")
+
+        regressions = []
+        for size, results in report["results"].items():
+            base_results = baseline.get("results", {}).get(size, {})
+            for name, current in results.items():
+                base = base_results.get(name)
+                if not base:
+                    continue
+
+                if current["queries"] > base["queries"]:
+                    regressions.append(
+                        f"[{size}] {name}: requêtes {base['queries']} -> {current['queries']}"
+                    )
+
+                limit = base["p95_ms"] * (1 + options["tolerance"])
+                delta = current["p95_ms"] - base["p95_ms"]
+                if current["p95_ms"] > limit and delta > options["min_delta_ms"]:
+                    regressions.append(
+                        f"[{size}] {name}: p95 {base['p95_ms']:.2f} ms -> {current['p95_ms']:.2f} ms"
+                    )
+
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("Aucune régression par rapport à la baseline."))
+            return
+
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(f"Régression {line}"))
+        if not options["no_fail"]:
+            raise CommandError(f"{len(regressions)} régression(s) détectée(s).")
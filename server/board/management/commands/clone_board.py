@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from board.api.services.cloning import clone_board
+from board.models import Board
+
+
+class Command(BaseCommand):
+    help = (
+        "Duplique un board (colonnes, idées, positions, tags) sous un nouveau nom. "
+        "Avec --structure-only, seules les colonnes sont copiées (board modèle)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("source", help="Id ou nom du board à copier")
+        parser.add_argument("name", help="Nom du nouveau board")
+        parser.add_argument("--structure-only", action="store_true", help="Copier uniquement les colonnes")
+        parser.add_argument("--description", default=None, help="Description (défaut: celle de la source)")
+
+    def handle(self, *args, **options):
+        source_ref = options["source"]
+        lookup = {"id": int(source_ref)} if source_ref.isdigit() else {"name": source_ref}
+        source = Board.objects.filter(**lookup).first()
+        if source is None:
+            raise CommandError(f"Board introuvable: {source_ref}")
+
+        started = time.perf_counter()
+        try:
+            board, counts = clone_board(
+                source,
+                options["name"],
+                include_ideas=not options["structure_only"],
+                description=options["description"],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+        elapsed = (time.perf_counter() - started) * 1000
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Board créé: {board.name} (id {board.id}) — {counts['columns']} colonne(s), "
+                f"{counts['ideas']} idée(s), {counts['tag_links']} lien(s) de tag en {elapsed:.0f} ms"
+            )
+        )
@@ -0,0 +1,261 @@
+import itertools
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from board.api.services import stats, tag_suggestions
+from board.models import Board, Column, Idea, IdeaStatus, Tag
+from board.management.commands.seed_ideas_board import DEFAULT_COLUMNS
+
+
+WORDS = (
+    "idée projet client produit marketing landing page refonte api mobile "
+    "design système données export import tableau carte colonne tag impact "
+    "prochaine action test perf cache requête serveur raspberry backup "
+    "note contenu markdown template atelier vidéo article podcast veille "
+    "prototype budget planning priorité retour utilisateur onboarding"
+).split()
+
+# Les corps Markdown sont assemblés à partir d'un pool de blocs (~150 caractères).
+BLOCK_POOL_SIZE = 512
+BLOCK_MEAN_SIZE = 150
+
+STATUS_WEIGHTS = (
+    (IdeaStatus.ACTIVE, 70),
+    (IdeaStatus.DRAFT, 20),
+    (IdeaStatus.ARCHIVED, 10),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données volumineux (boards, colonnes, idées, tags) "
+        "par insertions groupées, de façon déterministe (graine fixe)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--boards", type=int, default=3, help="Nombre de boards (défaut: 3)")
+        parser.add_argument(
+            "--columns",
+            type=int,
+            default=len(DEFAULT_COLUMNS),
+            help=f"Colonnes par board (défaut: {len(DEFAULT_COLUMNS)})",
+        )
+        parser.add_argument(
+            "--ideas",
+            type=int,
+            default=10_000,
+            help="Nombre total d'idées, réparties sur les boards (défaut: 10000)",
+        )
+        parser.add_argument("--tags", type=int, default=50, help="Nombre de tags (défaut: 50)")
+        parser.add_argument(
+            "--max-tags-per-idea",
+            type=int,
+            default=4,
+            help="Nombre maximum de tags par idée (défaut: 4)",
+        )
+        parser.add_argument(
+            "--body-size",
+            type=int,
+            default=800,
+            help="Taille médiane de body_md en caractères (défaut: 800)",
+        )
+        parser.add_argument("--seed", type=int, default=42, help="Graine aléatoire (défaut: 42)")
+        parser.add_argument(
+            "--prefix",
+            default="Dataset",
+            help="Préfixe des noms de boards/tags générés (défaut: 'Dataset')",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Supprime d'abord les boards et tags portant ce préfixe",
+        )
+
+    def handle(self, *args, **options):
+        n_boards = options["boards"]
+        n_columns = options["columns"]
+        n_ideas = options["ideas"]
+        n_tags = options["tags"]
+        prefix = options["prefix"]
+
+        if n_boards < 1 or n_columns < 1:
+            raise CommandError("--boards et --columns doivent être >= 1")
+        if min(n_ideas, n_tags, options["max_tags_per_idea"]) < 0:
+            raise CommandError("Les volumes doivent être positifs")
+
+        rng = random.Random(options["seed"])
+        started = time.monotonic()
+
+        with transaction.atomic():
+            if options["reset"]:
+                Board.objects.filter(name__startswith=f"{prefix} ").delete()
+                Tag.objects.filter(name__startswith=f"{prefix.lower()}-").delete()
+
+            existing = (
+                Board.objects.filter(name__startswith=f"{prefix} ").exists()
+                or Tag.objects.filter(name__startswith=f"{prefix.lower()}-").exists()
+            )
+            if existing:
+                raise CommandError(
+                    f"Des données '{prefix}' existent déjà (utiliser --reset ou --prefix)."
+                )
+
+            boards = Board.objects.bulk_create(
+                [
+                    Board(name=f"{prefix} {i + 1}", description="Jeu de données généré.")
+                    for i in range(n_boards)
+                ]
+            )
+
+            columns = Column.objects.bulk_create(
+                [
+                    Column(board=board, name=self._column_name(c), order=c)
+                    for board in boards
+                    for c in range(n_columns)
+                ]
+            )
+
+            tags = Tag.objects.bulk_create(
+                [Tag(name=f"{prefix.lower()}-{i + 1}") for i in range(n_tags)]
+            )
+
+            idea_rows = self._build_idea_rows(rng, columns, n_ideas, options["body_size"])
+            idea_ids = self._insert_ideas(idea_rows)
+
+            links = self._build_tag_links(rng, idea_ids, tags, options["max_tags_per_idea"])
+            self._insert_tag_links(links)
+
+            # Insertions brutes : pas de signaux, les compteurs sont recalculés
+            for board in boards:
+                stats.rebuild(board)
+                tag_suggestions.rebuild(board)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(boards)} boards, {len(columns)} colonnes, {len(idea_ids)} idées, "
+                f"{len(tags)} tags, {len(links)} liens générés en {elapsed:.2f}s."
+            )
+        )
+
+    # ------------------------------------------------------------------
+    # Génération
+    # ------------------------------------------------------------------
+    def _column_name(self, index):
+        if index < len(DEFAULT_COLUMNS):
+            return DEFAULT_COLUMNS[index]
+        return f"Colonne {index + 1}"
+
+    def _build_idea_rows(self, rng, columns, n_ideas, body_size):
+        statuses = [s for s, _ in STATUS_WEIGHTS]
+        weights = [w for _, w in STATUS_WEIGHTS]
+        pool = self._block_pool(rng)
+        # Valeur déjà adaptée pour la base : les lignes partent en SQL brut.
+        now = Idea._meta.get_field("created_at").get_db_prep_value(timezone.now(), connection)
+        next_position = {}
+        rows = []
+
+        for _ in range(n_ideas):
+            # Répartition uniforme sur toutes les colonnes de tous les boards.
+            column_id = columns[rng.randrange(len(columns))].id
+            position = next_position.get(column_id, 0)
+            next_position[column_id] = position + 1
+
+            rows.append(
+                (
+                    now,
+                    now,
+                    now,
+                    column_id,
+                    self._sentence(rng, rng.randint(3, 9)),
+                    self._body(rng, pool, body_size),
+                    rng.choices(statuses, weights)[0],
+                    position,
+                    rng.randint(0, 5),
+                    self._sentence(rng, rng.randint(2, 6)) if rng.random() < 0.4 else "",
+                )
+            )
+        return rows
+
+    def _insert_ideas(self, rows):
+        """
+        Insertion brute (executemany) : instancier 100k objets `Idea` coûte
+        à lui seul plusieurs secondes. Renvoie les ids dans l'ordre d'insertion.
+        """
+        fields = [
+            "created_at", "updated_at", "column_entered_at", "column_id", "title", "body_md",
+            "status", "position", "impact", "next_action",
+        ]
+        table = connection.ops.quote_name(Idea._meta.db_table)
+        columns_sql = ", ".join(connection.ops.quote_name(f) for f in fields)
+        placeholders = ", ".join(["%s"] * len(fields))
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            last_id = cursor.fetchone()[0]
+            cursor.executemany(
+                f"INSERT INTO {table} ({columns_sql}) VALUES ({placeholders})",
+                rows,
+            )
+
+        # Transaction en cours : les ids attribués sont croissants dans l'ordre d'insertion.
+        return list(Idea.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True))
+
+    def _build_tag_links(self, rng, idea_ids, tags, max_tags):
+        if not tags or max_tags <= 0:
+            return []
+
+        tag_ids = [tag.id for tag in tags]
+        # Distribution "longue traîne" : quelques tags très utilisés.
+        cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(tag_ids))))
+        upper = min(max_tags, len(tag_ids))
+        links = []
+        for idea_id in idea_ids:
+            count = rng.randint(0, upper)
+            if count:
+                chosen = set(rng.choices(tag_ids, cum_weights=cum_weights, k=count))
+                links.extend((idea_id, tag_id) for tag_id in chosen)
+        return links
+
+    def _insert_tag_links(self, links):
+        through = Idea.tags.through
+        table = connection.ops.quote_name(through._meta.db_table)
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT INTO {table} (idea_id, tag_id) VALUES (%s, %s)",
+                links,
+            )
+
+    def _sentence(self, rng, n_words):
+        return " ".join(rng.choices(WORDS, k=n_words)).capitalize()
+
+    def _block_pool(self, rng, size=BLOCK_POOL_SIZE):
+        """
+        Paragraphes/listes pré-générés : les corps sont assemblés à partir de
+        ce pool, ce qui évite de tirer des milliers de mots par idée.
+        """
+        pool = []
+        for _ in range(size):
+            if rng.random() < 0.3:
+                block = "\n".join(f"- {self._sentence(rng, rng.randint(3, 8))}" for _ in range(3))
+            else:
+                block = self._sentence(rng, rng.randint(15, 40)) + "."
+            pool.append(block)
+        return pool
+
+    def _body(self, rng, pool, median_size):
+        """
+        Corps Markdown de taille log-normale autour de `median_size`
+        (beaucoup de notes courtes, quelques documents très longs).
+        """
+        if median_size <= 0:
+            return ""
+
+        target = rng.lognormvariate(0, 0.8) * median_size
+        n_blocks = max(1, round(target / BLOCK_MEAN_SIZE))
+        heading = f"# {self._sentence(rng, rng.randint(2, 5))}\n"
+        return "\n\n".join([heading, *rng.choices(pool, k=n_blocks)])
@@ -0,0 +1,184 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.urls import reverse
+
+from ._bench import bench_context, bench_user, benchmark_database, percentile, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Charge les endpoints de lecture via le handler ASGI, en process, avec N "
+        "clients concurrents. --compare lance le chemin sync puis le chemin async "
+        "(DJANGO_ASYNC_VIEWS) et compare les débits."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ideas", type=int, default=1000, help="Taille du jeu de données (défaut: 1000)")
+        parser.add_argument("--concurrency", type=int, default=50, help="Clients concurrents (défaut: 50)")
+        parser.add_argument("--requests", type=int, default=2000, help="Nombre total de requêtes (défaut: 2000)")
+        parser.add_argument(
+            "--compare",
+            action="store_true",
+            help="Mesure les deux chemins (sync puis async) dans deux process séparés",
+        )
+        parser.add_argument("--json", action="store_true", help="Sortie JSON (usage interne de --compare)")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["requests"] < 1:
+            raise CommandError("--concurrency et --requests doivent être >= 1")
+
+        if options["compare"]:
+            self._compare(options)
+            return
+
+        with benchmark_database():
+            seed_dataset(options["ideas"])
+            result = self._run(options)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(result))
+        else:
+            self._print({result["mode"]: result})
+
+    # ------------------------------------------------------------------
+    # Mesure (un mode, dans ce process)
+    # ------------------------------------------------------------------
+    def _run(self, options):
+        ctx = bench_context()
+        client = Client()
+        client.force_login(bench_user())
+        cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+
+        # Mélange représentatif du polling client
+        paths = [
+            reverse("api_auth_me"),
+            reverse("api_boards_list"),
+            reverse("api_board_kanban", args=[ctx["board_id"]]),
+            reverse("api_board_idea_detail", args=[ctx["board_id"], ctx["idea_id"]]),
+        ]
+
+        app = ASGIHandler()
+        return asyncio.run(self._drive(app, paths, cookie, options["concurrency"], options["requests"]))
+
+    async def _drive(self, app, paths, cookie, concurrency, total):
+        latencies = []
+        errors = 0
+        issued = 0
+        in_flight = 0
+        peak_in_flight = 0
+        peak_threads = threading.active_count()
+
+        async def one(path):
+            done = asyncio.Event()
+            sent_body = False
+            status = None
+
+            async def receive():
+                nonlocal sent_body
+                if not sent_body:
+                    sent_body = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                elif message["type"] == "http.response.body" and not message.get("more_body"):
+                    done.set()
+
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": path,
+                "raw_path": path.encode(),
+                "query_string": b"",
+                "root_path": "",
+                "headers": [(b"host", b"testserver"), (b"cookie", cookie.encode())],
+                "client": ("127.0.0.1", 50000),
+                "server": ("testserver", 80),
+            }
+            await app(scope, receive, send)
+            return status
+
+        async def worker():
+            nonlocal issued, errors, in_flight, peak_in_flight, peak_threads
+            while issued < total:
+                path = paths[issued % len(paths)]
+                issued += 1
+                in_flight += 1
+                peak_in_flight = max(peak_in_flight, in_flight)
+                started = time.perf_counter()
+                status = await one(path)
+                latencies.append((time.perf_counter() - started) * 1000)
+                in_flight -= 1
+                peak_threads = max(peak_threads, threading.active_count())
+                if status != 200:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+        return {
+            "mode": "async" if settings.BOARD_ASYNC_READ_VIEWS else "sync",
+            "requests": len(latencies),
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "rps": round(len(latencies) / elapsed, 1),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "peak_in_flight": peak_in_flight,
+            "peak_threads": peak_threads,
+        }
+
+    # ------------------------------------------------------------------
+    # Comparaison sync / async (un process par mode : urls.py choisit à l'import)
+    # ------------------------------------------------------------------
+    def _compare(self, options):
+        results = {}
+        manage_py = os.path.join(settings.BASE_DIR, "manage.py")
+        for mode, flag in (("sync", "0"), ("async", "1")):
+            env = {**os.environ, "DJANGO_ASYNC_VIEWS": flag}
+            cmd = [
+                sys.executable,
+                manage_py,
+                "loadtest_reads",
+                "--json",
+                f"--ideas={options['ideas']}",
+                f"--concurrency={options['concurrency']}",
+                f"--requests={options['requests']}",
+            ]
+            proc = subprocess.run(cmd, env=env, capture_output=True, text=True)
+            if proc.returncode != 0:
+                raise CommandError(f"Échec du mode {mode}:\n{proc.stderr[-2000:]}")
+            results[mode] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        self._print(results)
+        if "sync" in results and "async" in results and results["sync"]["rps"]:
+            gain = results["async"]["rps"] / results["sync"]["rps"]
+            self.stdout.write(self.style.SUCCESS(f"Débit async / sync : x{gain:.2f}"))
+
+    def _print(self, results):
+        self.stdout.write(
+            f"{'mode':<8}{'req':>7}{'err':>5}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'in-flight':>11}{'threads':>9}"
+        )
+        for mode, r in results.items():
+            self.stdout.write(
+                f"{mode:<8}{r['requests']:>7}{r['errors']:>5}{r['rps']:>9.1f}{r['p50_ms']:>9.2f}"
+                f"{r['p95_ms']:>9.2f}{r['peak_in_flight']:>11}{r['peak_threads']:>9}"
+            )
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from board.api.services import stats
+from board.models import Board
+
+
+class Command(BaseCommand):
+    help = (
+        "Vérifie les compteurs de statistiques (BoardStat) contre un recomptage "
+        "complet des idées, et les corrige."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", help="Board(s) à traiter (défaut: tous)")
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Ne corrige rien ; code de sortie non nul si un écart est trouvé",
+        )
+
+    def handle(self, *args, **options):
+        boards = Board.objects.order_by("id")
+        if options["board"]:
+            boards = boards.filter(id__in=options["board"])
+            if not boards.exists():
+                raise CommandError("Aucun board trouvé")
+
+        write = not options["check"]
+        total_drift = 0
+        for board in boards:
+            with transaction.atomic():
+                drift = stats.rebuild(board, write=write)
+            total_drift += len(drift)
+            if not drift:
+                if options["verbosity"] >= 2:
+                    self.stdout.write(f"{board.name}: ok")
+                continue
+
+            self.stdout.write(self.style.WARNING(f"{board.name}: {len(drift)} écart(s)"))
+            for dimension, bucket, stored, actual in drift[:20]:
+                self.stdout.write(f"  {dimension}={bucket}: stocké {stored}, réel {actual}")
+            if len(drift) > 20:
+                self.stdout.write(f"  … {len(drift) - 20} de plus")
+
+        if not total_drift:
+            self.stdout.write(self.style.SUCCESS("Compteurs à jour."))
+        elif options["check"]:
+            raise CommandError(f"{total_drift} écart(s) trouvé(s) (relancer sans --check pour corriger)")
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{total_drift} écart(s) corrigé(s)."))
@@ -0,0 +1,35 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from board.api.services import duplicates
+from board.models import Board
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule l'index de doublons (signatures MinHash et bandes LSH) des "
+        "idées existantes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", help="Board(s) à traiter (défaut: tous)")
+
+    def handle(self, *args, **options):
+        boards = Board.objects.order_by("id")
+        if options["board"]:
+            boards = boards.filter(id__in=options["board"])
+            if not boards.exists():
+                raise CommandError("Aucun board trouvé")
+
+        total = 0
+        for board in boards:
+            started = time.perf_counter()
+            with transaction.atomic():
+                count = duplicates.rebuild(board)
+            total += count
+            elapsed = (time.perf_counter() - started) * 1000
+            self.stdout.write(f"{board.name}: {count} idée(s) indexée(s) en {elapsed:.0f} ms")
+
+        self.stdout.write(self.style.SUCCESS(f"Index de doublons à jour ({total} idée(s))."))
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from board.api.services import tag_suggestions
+from board.models import Board
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule la matrice de co-occurrence des tags (suggestions de tags) "
+        "à partir des liens idée-tag existants."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--board", type=int, action="append", help="Board(s) à traiter (défaut: tous)")
+
+    def handle(self, *args, **options):
+        boards = Board.objects.order_by("id")
+        if options["board"]:
+            boards = boards.filter(id__in=options["board"])
+            if not boards.exists():
+                raise CommandError("Aucun board trouvé")
+
+        for board in boards:
+            with transaction.atomic():
+                pairs = tag_suggestions.rebuild(board)
+            self.stdout.write(f"{board.name}: {pairs} paire(s)")
+
+        self.stdout.write(self.style.SUCCESS("Co-occurrences à jour."))
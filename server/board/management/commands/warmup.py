@@ -0,0 +1,130 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from board.warmup import warm_up
+
+from ._bench import bench_context, bench_user, benchmark_database, seed_dataset
+
+# Process enfant de --measure : importe config.wsgi comme un worker gunicorn
+# (préchauffage compris selon DJANGO_WARMUP), puis enchaîne les GET.
+PROBE = """
+import json, sys, time
+from config.wsgi import application
+ready = time.time()
+from board.warmup import call_wsgi
+path, cookie, count = sys.argv[1], sys.argv[2], int(sys.argv[3])
+requests = []
+for _ in range(count):
+    started = time.time()
+    status = call_wsgi(application, path, cookie)
+    requests.append((started, time.time(), status))
+print(json.dumps({"ready": ready, "requests": requests}))
+"""
+
+# Une réponse est « rapide » à moins de FAST_FACTOR fois la médiane du régime établi
+FAST_FACTOR = 1.5
+
+
+class Command(BaseCommand):
+    help = (
+        "Préchauffe ce process (connexion, URLs, middlewares, kanbans, tags) et "
+        "affiche le temps de chaque étape. --measure compare des workers neufs "
+        "avec et sans préchauffage : démarrage → première réponse rapide."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--measure",
+            action="store_true",
+            help="Lance des process neufs sur une base jetable, sans puis avec DJANGO_WARMUP",
+        )
+        parser.add_argument("--ideas", type=int, default=1000, help="Taille du jeu de données (défaut: 1000)")
+        parser.add_argument("--runs", type=int, default=3, help="Process lancés par mode (défaut: 3)")
+        parser.add_argument("--requests", type=int, default=30, help="Requêtes kanban par process (défaut: 30)")
+
+    def handle(self, *args, **options):
+        if options["measure"]:
+            if options["runs"] < 1 or options["requests"] < 4:
+                raise CommandError("--runs doit être >= 1 et --requests >= 4")
+            self._measure(options)
+            return
+
+        total = 0.0
+        for name, ms in warm_up():
+            total += ms
+            self.stdout.write(f"{name:<12}{ms:>9.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"{'total':<12}{total:>9.1f} ms"))
+
+    # ------------------------------------------------------------------
+    # Mesure : un process neuf par essai (urls, imports, connexion à froid)
+    # ------------------------------------------------------------------
+    def _measure(self, options):
+        with benchmark_database():
+            seed_dataset(options["ideas"])
+            ctx = bench_context()
+            client = Client()
+            client.force_login(bench_user())
+            cookie = f"{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}"
+            path = reverse("api_board_kanban", args=[ctx["board_id"]])
+            db_path = str(connection.settings_dict["NAME"])
+
+            results = {}
+            for mode, flag in (("cold", "0"), ("warmup", "1")):
+                runs = [self._spawn(path, cookie, options["requests"], db_path, flag) for _ in range(options["runs"])]
+                results[mode] = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+
+        self.stdout.write(
+            f"{'mode':<8}{'ready ms':>10}{'1st req ms':>12}{'→1st ms':>10}{'→fast ms':>10}{'p50 ms':>9}"
+        )
+        for mode, r in results.items():
+            self.stdout.write(
+                f"{mode:<8}{r['ready_ms']:>10.0f}{r['first_ms']:>12.1f}{r['to_first_ms']:>10.0f}"
+                f"{r['to_fast_ms']:>10.0f}{r['steady_ms']:>9.1f}"
+            )
+        self.stdout.write(
+            "ready : lancement → application importée ; →1st / →fast : lancement → fin de la "
+            f"première réponse / de la première réponse à moins de {FAST_FACTOR}x la médiane établie."
+        )
+
+    def _spawn(self, path, cookie, count, db_path, flag):
+        env = {
+            **os.environ,
+            "DJANGO_WARMUP": flag,
+            "DJANGO_DB_PATH": db_path,
+            "DJANGO_TASKS_EAGER": "1",
+        }
+        spawned = time.time()
+        proc = subprocess.run(
+            [sys.executable, "-c", PROBE, path, cookie, str(count)],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode != 0:
+            raise CommandError(f"Échec du process (DJANGO_WARMUP={flag}):\n{proc.stderr[-2000:]}")
+        data = json.loads(proc.stdout.strip().splitlines()[-1])
+
+        requests = data["requests"]
+        if any(status != 200 for _, _, status in requests):
+            raise CommandError(f"Réponse inattendue : {[status for _, _, status in requests]}")
+        latencies = [(end - start) * 1000 for start, end, _ in requests]
+        steady = statistics.median(latencies[len(latencies) // 2:])
+        fast_end = next(end for (_, end, _), ms in zip(requests, latencies) if ms <= steady * FAST_FACTOR)
+        return {
+            "ready_ms": (data["ready"] - spawned) * 1000,
+            "first_ms": latencies[0],
+            "to_first_ms": (requests[0][1] - spawned) * 1000,
+            "to_fast_ms": (fast_end - spawned) * 1000,
+            "steady_ms": steady,
+        }
@@ -0,0 +1,156 @@
+import itertools
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.utils import timezone
+
+from .api import metrics
+from .api.timing import RequestTiming, activate, deactivate
+from .profiling import StackSampler, write_folded
+
+logger = logging.getLogger("board.timing")
+
+
+class RequestTimingMiddleware:
+    """
+    Instrumentation opt-in (DJANGO_REQUEST_TIMING=1) : nombre de requêtes SQL,
+    temps SQL, temps d'encodage JSON et temps total par requête.
+
+    - header `Server-Timing` (visible dans l'onglet réseau du navigateur)
+    - une ligne de log structurée (JSON) par requête, en WARNING au-delà
+      du budget de requêtes (BOARD_QUERY_BUDGET)
+
+    Désactivé, le middleware lève MiddlewareNotUsed : Django le retire de la
+    chaîne au démarrage, le coût est nul.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "BOARD_REQUEST_TIMING", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.query_budget = getattr(settings, "BOARD_QUERY_BUDGET", None)
+
+    def __call__(self, request):
+        timing = RequestTiming()
+        token = activate(timing)
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(timing):
+                response = self.get_response(request)
+        finally:
+            deactivate(token)
+        total = time.perf_counter() - started
+
+        # Le reste (vue, middlewares, sérialisation Python) = total - SQL - JSON
+        app = max(0.0, total - timing.db - timing.encode)
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={timing.db * 1000:.2f};desc="{timing.queries} queries"',
+                f"json;dur={timing.encode * 1000:.2f}",
+                f"app;dur={app * 1000:.2f}",
+                f"total;dur={total * 1000:.2f}",
+            ]
+        )
+
+        over_budget = self.query_budget is not None and timing.queries > self.query_budget
+        match = getattr(request, "resolver_match", None)
+        fields = {
+            "method": request.method,
+            "path": request.path,
+            "route": match.url_name if match else None,
+            "status": response.status_code,
+            "queries": timing.queries,
+            "db_ms": round(timing.db * 1000, 2),
+            "json_ms": round(timing.encode * 1000, 2),
+            "app_ms": round(app * 1000, 2),
+            "total_ms": round(total * 1000, 2),
+            "over_budget": over_budget,
+        }
+        if over_budget:
+            logger.warning("request_timing %s", json.dumps(fields))
+        else:
+            logger.info("request_timing %s", json.dumps(fields))
+
+        return response
+
+
+class MetricsMiddleware:
+    """
+    Alimente le registre de métriques (board.api.metrics) : nombre de requêtes,
+    latence et requêtes SQL par route (`url_name` de board/api/urls.py).
+    Opt-in via DJANGO_METRICS=1 (MiddlewareNotUsed sinon).
+    """
+
+    def __init__(self, get_response):
+        if not metrics.enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timing = RequestTiming()
+        started = time.perf_counter()
+        with connection.execute_wrapper(timing):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        match = getattr(request, "resolver_match", None)
+        route = (match.url_name if match else None) or "unresolved"
+        metrics.record_request(route, request.method, response.status_code, elapsed, timing.queries)
+        return response
+
+
+class SamplingProfilerMiddleware:
+    """
+    Profiler opt-in (BOARD_PROFILE_SLOW_MS > 0) : chaque requête est
+    échantillonnée, et une requête lente sur BOARD_PROFILE_EVERY donne un
+    fichier flame graph (`.folded`) dans BOARD_PROFILE_DIR.
+
+    Pensé pour un déploiement WSGI (gunicorn) : une requête = un thread.
+    """
+
+    def __init__(self, get_response):
+        slow_ms = getattr(settings, "BOARD_PROFILE_SLOW_MS", 0)
+        if not slow_ms:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = slow_ms / 1000
+        self.every = max(1, getattr(settings, "BOARD_PROFILE_EVERY", 10))
+        self.directory = Path(getattr(settings, "BOARD_PROFILE_DIR", "profiles"))
+        self.sampler = StackSampler(interval=getattr(settings, "BOARD_PROFILE_INTERVAL_MS", 5) / 1000)
+        self._slow_count = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def __call__(self, request):
+        self.sampler.start()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            elapsed = time.perf_counter() - started
+            samples = self.sampler.stop()
+
+        if elapsed >= self.slow_seconds and samples:
+            with self._lock:
+                nth = next(self._slow_count)
+            if nth % self.every == 0:
+                self._dump(request, elapsed, samples)
+        return response
+
+    def _dump(self, request, elapsed, samples):
+        match = getattr(request, "resolver_match", None)
+        route = (match.url_name if match else None) or "unresolved"
+        stamp = timezone.localtime().strftime("%Y%m%d-%H%M%S-%f")
+        path = self.directory / f"{stamp}-{route}-{elapsed * 1000:.0f}ms.folded"
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            write_folded(path, samples)
+        except OSError:
+            logger.exception("profile dump failed: %s", path)
+            return
+        logger.warning("slow request profiled: %s %s -> %s", request.method, request.path, path)
@@ -0,0 +1,31 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0003_idempotencykey'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdeaRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('number', models.PositiveIntegerField()),
+                ('kind', models.CharField(choices=[('key', 'Keyframe'), ('delta', 'Delta')], max_length=5)),
+                ('title', models.CharField(max_length=180)),
+                ('data', models.TextField(blank=True)),
+                ('body_size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('idea', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='revisions', to='board.idea')),
+            ],
+            options={
+                'ordering': ['idea', 'number'],
+                'constraints': [models.UniqueConstraint(fields=('idea', 'number'), name='uniq_revision_number_per_idea')],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:20
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F
+
+
+def entered_at_from_updated_at(apps, schema_editor):
+    # Pas d'historique des déplacements : la dernière modification est la
+    # meilleure approximation de l'arrivée dans la colonne.
+    Idea = apps.get_model("board", "Idea")
+    Idea.objects.update(column_entered_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0004_idearevision'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idea',
+            name='column_entered_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(entered_at_from_updated_at, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='BoardStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(choices=[('column', 'Colonne'), ('status', 'Statut'), ('tag', 'Tag'), ('impact', 'Impact')], max_length=8)),
+                ('bucket', models.CharField(max_length=64)),
+                ('count', models.IntegerField(default=0)),
+                ('dwell_total', models.FloatField(default=0)),
+                ('exits', models.PositiveIntegerField(default=0)),
+                ('entered_sum', models.FloatField(default=0)),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='board.board')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('board', 'dimension', 'bucket'), name='uniq_board_stat')],
+            },
+        ),
+    ]
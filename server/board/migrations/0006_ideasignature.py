@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-19 15:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0005_boardstat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IdeaSignature',
+            fields=[
+                ('idea', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='board.idea')),
+                ('signature', models.BinaryField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='board.board')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='IdeaLshBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='board.board')),
+                ('idea', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_bands', to='board.idea')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['board', 'band', 'bucket'], name='board_lsh_lookup_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 16:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0008_board_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='idearevision',
+            name='body_hash',
+            field=models.CharField(blank=True, max_length=64),
+        ),
+    ]
@@ -1,4 +1,6 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 class TimeStampedModel(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -14,8 +16,11 @@ class Board(TimeStampedModel):
     """
     name = models.CharField(max_length=120, unique=True)
     description = models.TextField(blank=True)
+    # Incrémenté (avec updated_at) à chaque modification du contenu du board :
+    # ETags des lectures (board/api/conditional.py)
+    version = models.PositiveBigIntegerField(default=0)
 
-    def __str__(self) -> self:
+    def __str__(self) -> str:
         return self.name
 
 class Column(TimeStampedModel):
@@ -73,6 +78,9 @@ class Idea(TimeStampedModel):
     impact = models.PositiveSmallIntegerField(default=0)  # 0..5 par ex.
     next_action = models.CharField(max_length=200, blank=True)
 
+    # Arrivée dans la colonne courante (temps moyen par colonne, voir BoardStat)
+    column_entered_at = models.DateTimeField(default=timezone.now)
+
     class Meta:
         ordering = ["position", "id"]
         indexes = [
@@ -96,3 +104,147 @@ class IdeaTemplate(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class IdempotencyKey(models.Model):
+    """
+    Réponse mémorisée d'un POST envoyé avec un en-tête `Idempotency-Key`
+    (voir board/api/idempotency.py). `status` est NULL tant que la requête
+    d'origine est en cours.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status = models.PositiveSmallIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True)
+    body = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="uniq_idempotency_key_per_user"),
+        ]
+        indexes = [
+            models.Index(fields=["created_at"]),
+        ]
+
+    def __str__(self) -> str:
+        return self.key
+
+
+class RevisionKind(models.TextChoices):
+    KEYFRAME = "key", "Keyframe"
+    DELTA = "delta", "Delta"
+
+
+class IdeaRevision(models.Model):
+    """
+    Version de `body_md` (+ titre) d'une idée, enregistrée à chaque update.
+
+    Les keyframes stockent le body complet, les deltas les plages modifiées
+    par rapport à la révision précédente (voir board/api/services/revisions.py).
+    """
+    idea = models.ForeignKey(Idea, on_delete=models.CASCADE, related_name="revisions")
+    number = models.PositiveIntegerField()
+    kind = models.CharField(max_length=5, choices=RevisionKind.choices)
+    title = models.CharField(max_length=180)
+    data = models.TextField(blank=True)
+    body_size = models.PositiveIntegerField(default=0)
+    # sha256 du body de cette version : détecte les modifications faites hors
+    # record_revision (QuerySet.update, shell...) avant d'écrire un delta
+    body_hash = models.CharField(max_length=64, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["idea", "number"]
+        constraints = [
+            models.UniqueConstraint(fields=["idea", "number"], name="uniq_revision_number_per_idea"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.idea_id} #{self.number} ({self.kind})"
+
+
+class StatDimension(models.TextChoices):
+    COLUMN = "column", "Colonne"
+    STATUS = "status", "Statut"
+    TAG = "tag", "Tag"
+    IMPACT = "impact", "Impact"
+
+
+class BoardStat(models.Model):
+    """
+    Compteur agrégé d'un board, tenu à jour par les chemins d'écriture
+    (board/api/services/stats.py) au lieu d'un GROUP BY à chaque lecture.
+
+    `bucket` vaut l'id de colonne, le statut, l'id de tag ou l'impact.
+    Pour les colonnes : `dwell_total` / `exits` cumulent les séjours terminés,
+    `entered_sum` la somme des timestamps d'arrivée des idées présentes.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="stats")
+    dimension = models.CharField(max_length=8, choices=StatDimension.choices)
+    bucket = models.CharField(max_length=64)
+    count = models.IntegerField(default=0)
+    dwell_total = models.FloatField(default=0)
+    exits = models.PositiveIntegerField(default=0)
+    entered_sum = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["board", "dimension", "bucket"], name="uniq_board_stat"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.board_id} {self.dimension}={self.bucket}: {self.count}"
+
+
+class IdeaSignature(models.Model):
+    """
+    Signature MinHash du texte d'une idée (titre + début du body), pour la
+    détection de doublons (board/api/services/duplicates.py).
+    `signature` : 32 entiers 32 bits little-endian.
+    """
+    idea = models.OneToOneField(Idea, on_delete=models.CASCADE, primary_key=True, related_name="signature")
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="+")
+    signature = models.BinaryField()
+
+    def __str__(self) -> str:
+        return f"signature {self.idea_id}"
+
+
+class IdeaLshBand(models.Model):
+    """
+    Index LSH : une ligne par bande de la signature (hash des valeurs de la
+    bande). Deux idées qui partagent une bande sont candidates au doublon.
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="+")
+    idea = models.ForeignKey(Idea, on_delete=models.CASCADE, related_name="lsh_bands")
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["board", "band", "bucket"], name="board_lsh_lookup_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.idea_id} band {self.band}: {self.bucket}"
+
+
+class TagCooccurrence(models.Model):
+    """
+    Nombre d'idées du board portant à la fois `tag` et `other` (les deux sens
+    sont stockés). Tenu à jour par les signaux m2m (board/api/services/tag_suggestions.py).
+    """
+    board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name="+")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="+")
+    other = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="+")
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["board", "tag", "other"], name="uniq_tag_cooccurrence"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.board_id} {self.tag_id}+{self.other_id}: {self.count}"
@@ -0,0 +1,80 @@
+"""
+Profiler par échantillonnage (opt-in) pour les requêtes lentes.
+
+Un thread démon relève périodiquement la pile des threads enregistrés
+(`sys._current_frames`) et compte les piles identiques. Le résultat est écrit
+au format "folded" (une pile par ligne, frames séparées par `;`, suivie du
+nombre d'échantillons), lisible par flamegraph.pl ou https://www.speedscope.app.
+"""
+import sys
+import threading
+import time
+from collections import Counter
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}.{code.co_name}"
+
+
+def collapse_stack(frame):
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return ";".join(labels)
+
+
+class StackSampler:
+    """Échantillonne les threads enregistrés toutes les `interval` secondes."""
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._active = threading.Event()
+        self._thread = None
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="board-stack-sampler", daemon=True)
+            self._thread.start()
+
+    def start(self, thread_id=None):
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            self._samples[thread_id] = Counter()
+            self._active.set()
+            self._ensure_thread()
+
+    def stop(self, thread_id=None):
+        """Arrête l'échantillonnage du thread et renvoie ses piles comptées."""
+        thread_id = thread_id or threading.get_ident()
+        with self._lock:
+            samples = self._samples.pop(thread_id, Counter())
+            if not self._samples:
+                self._active.clear()
+        return samples
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            # Bloque sans consommer de CPU tant qu'aucune requête n'est suivie.
+            self._active.wait()
+            time.sleep(self.interval)
+            frames = sys._current_frames()
+            with self._lock:
+                for thread_id, counter in self._samples.items():
+                    if thread_id == own_id:
+                        continue
+                    frame = frames.get(thread_id)
+                    if frame is not None:
+                        counter[collapse_stack(frame)] += 1
+
+
+def write_folded(path, samples):
+    with open(path, "w", encoding="utf-8") as fh:
+        for stack, count in samples.most_common():
+            fh.write(f"{stack} {count}\n")
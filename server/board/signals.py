@@ -0,0 +1,167 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db.models import Count
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .api import tasks
+from .api.services import duplicates, stats, tag_suggestions, versions
+from .auth_backends import invalidate_user
+from .models import Column, Idea, Tag
+
+
+def _invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def _invalidate_on_logout(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
+
+
+def connect_user_signals():
+    """Branché depuis BoardConfig.ready() (le modèle User doit être chargé)."""
+    User = get_user_model()
+    post_save.connect(_invalidate_cached_user, sender=User, dispatch_uid="board_user_cache_save")
+    post_delete.connect(_invalidate_cached_user, sender=User, dispatch_uid="board_user_cache_delete")
+
+
+# -----------------------------------------------------------------------------
+# Compteurs de board (board/api/services/stats.py)
+# Pas de pre_delete sur Idea : un receiver empêcherait Django de supprimer en
+# masse (cascade board/colonne). Les suppressions recalculent le board.
+# -----------------------------------------------------------------------------
+@receiver(post_save, sender=Idea, dispatch_uid="board_stats_idea_created")
+def _stats_idea_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.idea_added(instance.column.board_id, instance)
+
+
+@receiver(m2m_changed, sender=Idea.tags.through, dispatch_uid="board_stats_idea_tags")
+def _stats_idea_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    through = Idea.tags.through
+    if action in ("pre_remove", "pre_clear"):
+        # Seuls les liens existants comptent : on les relève avant suppression
+        links = through.objects.filter(**{"tag_id" if reverse else "idea_id": instance.pk})
+        if pk_set is not None:
+            links = links.filter(**{"idea_id__in" if reverse else "tag_id__in": pk_set})
+        instance._stats_removed_links = set(links.values_list("idea_id" if reverse else "tag_id", flat=True))
+        return
+
+    if action == "post_add":
+        changed, delta = pk_set or set(), 1
+    elif action in ("post_remove", "post_clear"):
+        changed, delta = instance.__dict__.pop("_stats_removed_links", set()), -1
+    else:
+        return
+    if not changed:
+        return
+
+    if not reverse:
+        stats.tags_changed(instance.column.board_id, changed, delta)
+        return
+
+    # tag.ideas.add(...) : les idées peuvent appartenir à plusieurs boards
+    per_board = (
+        Idea.objects.filter(id__in=changed).values("column__board_id").annotate(n=Count("id")).order_by()
+    )
+    for row in per_board:
+        stats.tags_changed(row["column__board_id"], [instance.pk], delta * row["n"])
+
+
+# -----------------------------------------------------------------------------
+# Index de doublons (board/api/services/duplicates.py) : création ici, mises à
+# jour du titre / body dans update_idea et l'admin. Calcul en arrière-plan
+# après le commit (board/api/tasks.py).
+# -----------------------------------------------------------------------------
+@receiver(post_save, sender=Idea, dispatch_uid="board_duplicates_idea_created")
+def _duplicates_idea_created(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        tasks.defer(duplicates.reindex, instance.pk, created=True)
+
+
+# -----------------------------------------------------------------------------
+# Co-occurrence des tags (board/api/services/tag_suggestions.py) : tags de
+# chaque idée touchée relevés avant l'écriture, paires appliquées après.
+# -----------------------------------------------------------------------------
+@receiver(m2m_changed, sender=Idea.tags.through, dispatch_uid="board_tag_cooccurrence")
+def _tag_cooccurrence(sender, instance, action, reverse, pk_set, **kwargs):
+    through = Idea.tags.through
+    if action in ("pre_add", "pre_remove", "pre_clear"):
+        if not reverse:
+            idea_ids = [instance.pk]
+        elif pk_set is not None:
+            idea_ids = list(pk_set)
+        else:
+            idea_ids = list(through.objects.filter(tag_id=instance.pk).values_list("idea_id", flat=True))
+        before = {idea_id: set() for idea_id in idea_ids}
+        for idea_id, tag_id in through.objects.filter(idea_id__in=idea_ids).values_list("idea_id", "tag_id"):
+            before[idea_id].add(tag_id)
+        instance._tag_pairs_before = before
+        return
+
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    before = instance.__dict__.pop("_tag_pairs_before", {})
+    if not before:
+        return
+
+    if reverse:
+        changed = {instance.pk}
+        boards = dict(Idea.objects.filter(id__in=before).values_list("id", "column__board_id"))
+    else:
+        changed = set(pk_set or ())
+        boards = {instance.pk: instance.column.board_id}
+
+    for idea_id, tags in before.items():
+        if action == "post_add":
+            after = tags | changed
+        elif action == "post_remove":
+            after = tags - changed
+        else:
+            after = set() if not reverse else tags - changed
+        if idea_id in boards:
+            tag_suggestions.apply_change(boards[idea_id], tags, after)
+
+
+# -----------------------------------------------------------------------------
+# Version des boards (board/api/services/versions.py) : validateurs ETag des
+# lectures. Dans writes.run, les incréments sont regroupés en fin de
+# transaction ; ailleurs (admin, shell), un UPDATE par signal. Pas de
+# post_delete sur Idea (cf. compteurs) : l'admin incrémente après suppression.
+# -----------------------------------------------------------------------------
+@receiver(post_save, sender=Idea, dispatch_uid="board_version_idea_saved")
+def _version_idea(sender, instance, raw=False, **kwargs):
+    if not raw:
+        versions.touch([instance.column.board_id])
+
+
+@receiver(post_save, sender=Column, dispatch_uid="board_version_column_saved")
+@receiver(post_delete, sender=Column, dispatch_uid="board_version_column_deleted")
+def _version_column(sender, instance, raw=False, **kwargs):
+    if not raw:
+        versions.touch([instance.board_id])
+
+
+@receiver(m2m_changed, sender=Idea.tags.through, dispatch_uid="board_version_idea_tags")
+def _version_idea_tags(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        versions.touch([instance.column.board_id])
+    elif pk_set:
+        versions.touch(Idea.objects.filter(id__in=pk_set).values("column__board_id"))
+
+
+@receiver(post_save, sender=Tag, dispatch_uid="board_version_tag_saved")
+def _version_tag(sender, instance, created, raw=False, **kwargs):
+    # Renommage : le nom figure sur les cartes de tous les boards qui l'utilisent
+    if not created and not raw:
+        versions.touch(Idea.objects.filter(tags=instance).values("column__board_id"))
+
+
+@receiver(pre_delete, sender=Tag, dispatch_uid="board_version_tag_deleted")
+def _version_tag_deleted(sender, instance, **kwargs):
+    # Avant la suppression des liens (cascade, sans m2m_changed)
+    versions.touch(Idea.objects.filter(tags=instance).values("column__board_id"))
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from board.admin import CappedCountPaginator
+from board.models import Board, Column, Idea
+
+
+class SmallCapPaginator(CappedCountPaginator):
+    CAP = 25
+
+
+class CappedCountPaginatorTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        board = Board.objects.create(name="Pagination")
+        column = Column.objects.create(board=board, name="Idées")
+        Idea.objects.bulk_create([Idea(column=column, title=f"Idée {i}", position=i) for i in range(100)])
+
+    def _paginator(self, page):
+        return SmallCapPaginator(Idea.objects.order_by("position"), 10, page_hint=page)
+
+    def test_count_is_capped_from_first_page(self):
+        paginator = self._paginator(1)
+        self.assertEqual(paginator.count, 26)
+        self.assertTrue(paginator.capped)
+
+    def test_pages_past_the_cap_are_reachable(self):
+        paginator = self._paginator(8)
+        page = paginator.page(8)
+        self.assertEqual([idea.position for idea in page.object_list], list(range(70, 80)))
+        self.assertTrue(page.has_next())
+        # Reste (30 lignes) au-dessus du plafond... puis compte exact en fin de liste
+        self.assertEqual(self._paginator(9).count, 100)
+        self.assertFalse(self._paginator(9).capped)
+        self.assertEqual(self._paginator(10).page(10).object_list.count(), 10)
+
+    def test_exact_count_under_the_cap(self):
+        paginator = SmallCapPaginator(Idea.objects.filter(position__lt=20), 10)
+        self.assertEqual(paginator.count, 20)
+        self.assertFalse(paginator.capped)
+
+
+class ChangelistPastCapTests(TestCase):
+    def setUp(self):
+        board = Board.objects.create(name="Admin")
+        column = Column.objects.create(board=board, name="Idées")
+        Idea.objects.bulk_create([Idea(column=column, title=f"Idée {i}", position=i) for i in range(250)])
+        admin = get_user_model().objects.create_superuser("root", "root@example.com", "root-password")
+        self.client.force_login(admin)
+        CappedCountPaginator.CAP, self._cap = 120, CappedCountPaginator.CAP
+        self.addCleanup(setattr, CappedCountPaginator, "CAP", self._cap)
+
+    def test_last_page_past_the_cap(self):
+        response = self.client.get("/admin/board/idea/", {"p": 3})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context["cl"].result_list), 50)
+
+    def test_capped_count_label(self):
+        response = self.client.get("/admin/board/idea/")
+        self.assertContains(response, "120+ ")
@@ -0,0 +1,35 @@
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase
+
+from board.admin import ColumnAdmin, TagAdmin
+from board.api.operations import quick_add
+from board.api.services import stats
+from board.models import Board, Column, Tag
+
+
+class AdminCascadeStatsTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Stats admin")
+        self.todo = Column.objects.create(board=self.board, name="Idées", order=0)
+        self.done = Column.objects.create(board=self.board, name="Faites", order=1)
+        for column, text in ((self.todo, "Une #alpha #beta"), (self.todo, "Deux #alpha"), (self.done, "Trois #beta")):
+            data, status = quick_add(self.board.id, {"text": text, "column_id": column.id})
+            self.assertEqual(status, 201, data)
+        self.request = RequestFactory().post("/")
+        self.assertEqual(stats.rebuild(self.board, write=False), [])
+
+    def test_column_delete_recounts_board(self):
+        ColumnAdmin(Column, AdminSite()).delete_model(self.request, self.todo)
+        self.assertEqual(stats.rebuild(self.board, write=False), [])
+
+    def test_column_bulk_delete_recounts_board(self):
+        ColumnAdmin(Column, AdminSite()).delete_queryset(self.request, Column.objects.filter(pk=self.done.pk))
+        self.assertEqual(stats.rebuild(self.board, write=False), [])
+
+    def test_tag_delete_recounts_board(self):
+        TagAdmin(Tag, AdminSite()).delete_model(self.request, Tag.objects.get(name="alpha"))
+        self.assertEqual(stats.rebuild(self.board, write=False), [])
+
+    def test_tag_bulk_delete_recounts_board(self):
+        TagAdmin(Tag, AdminSite()).delete_queryset(self.request, Tag.objects.all())
+        self.assertEqual(stats.rebuild(self.board, write=False), [])
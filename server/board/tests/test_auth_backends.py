@@ -0,0 +1,48 @@
+import pickle
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from board.auth_backends import user_cache_key
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = get_user_model().objects.create_user("cache", password="cache-password")
+        self.client.force_login(self.user)
+
+    def _me(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/auth/me")
+        self.assertEqual(response.status_code, 200)
+        return response, [q["sql"] for q in queries if "auth_user" in q["sql"]]
+
+    def test_password_hash_not_cached(self):
+        self._me()
+        entry = cache.get(user_cache_key(self.user.pk))
+        self.assertIsNotNone(entry)
+        self.assertNotIn(self.user.password.encode(), pickle.dumps(entry))
+
+    def test_session_verified_from_cache(self):
+        self._me()
+        response, user_queries = self._me()
+        self.assertEqual(user_queries, [])
+        self.assertTrue(response.json()["authenticated"])
+
+    def test_password_change_ends_session(self):
+        self._me()
+        self.user.set_password("new-password")
+        self.user.save()
+        response, _ = self._me()
+        self.assertFalse(response.json()["authenticated"])
+
+    def test_saving_cached_user_keeps_password(self):
+        self._me()
+        cached = self.client.get("/api/auth/me").wsgi_request.user
+        cached.first_name = "Ada"
+        cached.save()
+        self.assertTrue(get_user_model().objects.get(pk=self.user.pk).check_password("cache-password"))
@@ -0,0 +1,53 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from board.management.commands import backup_db
+
+
+class BackupPauseTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        self.source = self.dir / "source.sqlite3"
+        conn = sqlite3.connect(self.source)
+        with conn:
+            conn.execute("CREATE TABLE t (x TEXT)")
+            conn.executemany("INSERT INTO t VALUES (?)", [("x" * 1000,)] * 200)
+        conn.close()
+        self.command = backup_db.Command()
+        self.command.verbosity = 1
+
+    def _page_count(self):
+        conn = sqlite3.connect(self.source)
+        try:
+            return conn.execute("PRAGMA page_count").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_sleeps_between_successful_steps(self):
+        pages = self._page_count()
+        with mock.patch.object(backup_db.time, "sleep") as sleep:
+            pauses = self.command._backup(self.source, self.dir / "copy.sqlite3", pages=10, sleep=0.05)
+
+        steps = -(-pages // 10)
+        # Une pause après chaque étape, sauf la dernière
+        self.assertEqual(pauses, steps - 1)
+        self.assertEqual(sleep.call_count, steps - 1)
+        sleep.assert_called_with(0.05)
+
+        copy = sqlite3.connect(self.dir / "copy.sqlite3")
+        try:
+            self.assertEqual(copy.execute("SELECT COUNT(*) FROM t").fetchone()[0], 200)
+        finally:
+            copy.close()
+
+    def test_no_pause_when_sleep_is_zero(self):
+        with mock.patch.object(backup_db.time, "sleep") as sleep:
+            pauses = self.command._backup(self.source, self.dir / "copy.sqlite3", pages=10, sleep=0)
+        self.assertEqual(pauses, 0)
+        sleep.assert_not_called()
@@ -0,0 +1,49 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from board.models import Board, Column, Idea
+
+
+class BatchReferenceTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Batch")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+        self.other = Column.objects.create(board=self.board, name="Faites", order=1)
+        user = get_user_model().objects.create_user("batch", password="batch-password")
+        self.client.force_login(user)
+
+    def _batch(self, operations, mode="atomic"):
+        return self.client.post(
+            "/api/batch", json.dumps({"mode": mode, "operations": operations}), content_type="application/json"
+        )
+
+    def test_idea_reference_is_resolved(self):
+        response = self._batch(
+            [
+                {"op": "idea.quick_add", "board_id": self.board.id, "payload": {"text": "Nouvelle"}},
+                {
+                    "op": "idea.move",
+                    "board_id": self.board.id,
+                    "idea_id": "$0",
+                    "payload": {"to_column_id": self.other.id, "target_index": 0},
+                },
+            ]
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Idea.objects.get(title="Nouvelle").column, self.other)
+
+    def test_reference_rejected_for_other_keys(self):
+        response = self._batch(
+            [
+                {"op": "idea.quick_add", "board_id": self.board.id, "payload": {"text": "Nouvelle"}},
+                {"op": "idea.quick_add", "board_id": "$0", "payload": {"text": "Ailleurs"}},
+            ],
+            mode="best_effort",
+        )
+        self.assertEqual(response.status_code, 200)
+        second = response.json()["results"][1]
+        self.assertEqual(second["status"], 400)
+        self.assertIn("board_id", second["body"]["error"])
+        self.assertFalse(Idea.objects.filter(title="Ailleurs").exists())
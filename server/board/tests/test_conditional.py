@@ -0,0 +1,48 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from board.models import Board, Column, Idea
+
+
+class ConditionalKanbanTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Conditionnel")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+        Idea.objects.create(column=self.column, title="Première")
+        user = get_user_model().objects.create_user("cond", password="cond-password")
+        self.client.force_login(user)
+        self.url = f"/api/boards/{self.board.id}/kanban"
+
+    def _quick_add(self, text):
+        response = self.client.post(
+            f"/api/boards/{self.board.id}/ideas/quick-add",
+            json.dumps({"text": text, "column_id": self.column.id}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_etag_round_trip(self):
+        first = self.client.get(self.url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first["Cache-Control"], "private, no-cache")
+        self.assertNotIn("Last-Modified", first)
+
+        cached = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+        self._quick_add("Deuxième")
+        fresh = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(fresh.status_code, 200)
+
+    def test_writes_in_the_same_second_are_not_hidden(self):
+        self._quick_add("Deuxième")
+        self.client.get(self.url)
+        self._quick_add("Troisième")
+        # If-Modified-Since seul, postérieur aux deux écritures : jamais de 304
+        # (une date HTTP ne distingue pas deux écritures dans la même seconde)
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2035 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+        titles = [idea["title"] for column in response.json()["columns"] for idea in column["ideas"]]
+        self.assertIn("Troisième", titles)
@@ -0,0 +1,59 @@
+import json
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from board.api import idempotency
+from board.models import Board, Column, IdempotencyKey, Idea
+
+
+@override_settings(BOARD_IDEMPOTENCY_LEASE=60)
+class StaleClaimTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Idempotence")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+        self.user = get_user_model().objects.create_user("idem", password="idem-password")
+        self.client.force_login(self.user)
+        self.url = f"/api/boards/{self.board.id}/ideas/quick-add"
+        self.body = json.dumps({"text": "Retry", "column_id": self.column.id})
+
+    def _post(self):
+        return self.client.post(self.url, self.body, content_type="application/json", HTTP_IDEMPOTENCY_KEY="k-1")
+
+    def _pending_claim(self, age):
+        first = self._post()
+        self.assertEqual(first.status_code, 201)
+        # Simule un worker mort avant d'avoir mémorisé sa réponse
+        Idea.objects.filter(column=self.column).delete()
+        row = IdempotencyKey.objects.get(user=self.user, key="k-1")
+        IdempotencyKey.objects.filter(pk=row.pk).update(
+            status=None, body="", created_at=timezone.now() - timedelta(seconds=age)
+        )
+
+    def test_recent_pending_claim_is_in_progress(self):
+        self._pending_claim(age=5)
+        response = self._post()
+        self.assertEqual(response.status_code, 409)
+        self.assertFalse(Idea.objects.filter(column=self.column).exists())
+
+    def test_stale_pending_claim_is_taken_over(self):
+        self._pending_claim(age=120)
+        response = self._post()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Idea.objects.filter(column=self.column).count(), 1)
+
+        # La reprise a mémorisé sa réponse : le retry suivant est un rejeu
+        replay = self._post()
+        self.assertEqual(replay.status_code, 201)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(Idea.objects.filter(column=self.column).count(), 1)
+
+    def test_dispossessed_worker_cannot_overwrite(self):
+        self._pending_claim(age=120)
+        stale = IdempotencyKey.objects.get(user=self.user, key="k-1")
+        self.assertEqual(self._post().status_code, 201)
+
+        idempotency._release(stale)
+        self.assertTrue(IdempotencyKey.objects.filter(pk=stale.pk, status=201).exists())
@@ -0,0 +1,65 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from django.test import SimpleTestCase, override_settings
+
+from board.api import metrics
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+def _snapshot(value):
+    return {"counters": [["board_writes_total", [["result", "ok"]], value]], "histograms": []}
+
+
+class SnapshotStalenessTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = Path(tmp.name)
+        settings = override_settings(BOARD_METRICS_DIR=str(self.dir), BOARD_METRICS_STALE_SECONDS=60)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        metrics.REGISTRY.reset()
+        self.addCleanup(metrics.REGISTRY.reset)
+
+    def _write(self, pid, value, age=0):
+        path = self.dir / f"metrics-{pid}.json"
+        path.write_text(json.dumps(_snapshot(value)), encoding="utf-8")
+        if age:
+            stamp = time.time() - age
+            os.utime(path, (stamp, stamp))
+        return path
+
+    def _total(self):
+        counters, _ = metrics.collect()
+        return counters.get(("board_writes_total", (("result", "ok"),)), 0)
+
+    def test_only_live_fresh_snapshots_are_summed(self):
+        self._write(os.getppid(), 3)
+        self._write(_dead_pid(), 100)
+        self.assertEqual(self._total(), 3)
+
+    def test_old_snapshot_of_a_live_pid_is_ignored(self):
+        self._write(os.getppid(), 5, age=120)
+        self.assertEqual(self._total(), 0)
+
+    def test_prune_at_startup(self):
+        live = self._write(os.getppid(), 1)
+        dead = self._write(_dead_pid(), 1)
+        metrics.write_snapshot(self.dir, _snapshot(7))  # ancien process de même PID
+        own = self.dir / f"metrics-{os.getpid()}.json"
+
+        self.assertEqual(metrics.prune_snapshots(), 2)
+        self.assertTrue(live.exists())
+        self.assertFalse(dead.exists())
+        self.assertFalse(own.exists())
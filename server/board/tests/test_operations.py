@@ -0,0 +1,40 @@
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import TransactionTestCase, override_settings
+
+from board.models import Board, Column, Idea, Tag
+
+
+# Transactions réelles : writes.run ouvre la sienne (pas de bloc atomique de
+# test). Tâches différées exécutées sur place, sans thread qui tiendrait la base.
+@override_settings(BOARD_TASKS_EAGER=True)
+class UpdateIdeaTagsTests(TransactionTestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Tags")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+        self.idea = Idea.objects.create(column=self.column, title="Avant")
+        user = get_user_model().objects.create_user("ops", password="ops-password")
+        self.client.force_login(user)
+
+    def _update(self, payload):
+        return self.client.post(
+            f"/api/boards/{self.board.id}/ideas/{self.idea.id}/update",
+            json.dumps(payload),
+            content_type="application/json",
+        )
+
+    def test_tags_set(self):
+        response = self._update({"title": "Après", "tags": "alpha, beta"})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(sorted(self.idea.tags.values_list("name", flat=True)), ["alpha", "beta"])
+
+    def test_database_error_on_tags_rolls_back_update(self):
+        with mock.patch.object(Tag.objects, "get_or_create", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError), self.assertLogs("django.request", "ERROR"):
+                self._update({"title": "Après", "tags": "alpha"})
+        self.idea.refresh_from_db()
+        self.assertEqual(self.idea.title, "Avant")
+        self.assertFalse(self.idea.tags.exists())
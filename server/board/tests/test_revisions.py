@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase
+
+from board.admin import IdeaAdmin
+from board.api.operations import update_idea
+from board.api.services.revisions import list_revisions, reconstruct
+from board.models import Board, Column, Idea
+
+
+class OutOfBandEditTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Révisions")
+        column = Column.objects.create(board=self.board, name="Idées")
+        self.idea = Idea.objects.create(column=column, title="Idée", body_md="v0 ligne\nfin\n")
+
+    def _api_edit(self, body):
+        data, status = update_idea(self.board.id, self.idea.id, {"body_md": body})
+        self.assertEqual(status, 200, data)
+
+    def _bodies(self):
+        numbers = sorted(r["number"] for r in list_revisions(self.idea.id))
+        return [reconstruct(self.idea.id, n)[1] for n in numbers]
+
+    def test_admin_edit_between_api_edits(self):
+        self._api_edit("v1 ligne\nfin\n")
+
+        idea = Idea.objects.get(pk=self.idea.pk)
+        idea.body_md = "v2 admin\nfin\n"
+        form = SimpleNamespace(changed_data=["body_md"])
+        IdeaAdmin(Idea, AdminSite()).save_model(RequestFactory().post("/"), idea, form, change=True)
+
+        self._api_edit("v2 admin\nfin\nv3\n")
+        self.assertEqual(
+            self._bodies(),
+            ["v0 ligne\nfin\n", "v1 ligne\nfin\n", "v2 admin\nfin\n", "v2 admin\nfin\nv3\n"],
+        )
+
+    def test_queryset_update_between_api_edits(self):
+        self._api_edit("v1 ligne\nfin\n")
+        Idea.objects.filter(pk=self.idea.pk).update(body_md="v2 update\nfin\n")
+        self._api_edit("v2 update\nfin\nv3\n")
+
+        bodies = self._bodies()
+        # L'écriture hors API est rattrapée en keyframe avant le delta suivant
+        self.assertEqual(bodies[-2:], ["v2 update\nfin\n", "v2 update\nfin\nv3\n"])
+        self.assertEqual(bodies[:2], ["v0 ligne\nfin\n", "v1 ligne\nfin\n"])
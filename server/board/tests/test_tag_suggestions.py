@@ -0,0 +1,71 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import TestCase
+
+from board.api.services import tag_suggestions
+from board.models import Board, Column, Idea, Tag
+
+
+class VersionInDatabaseTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Suggestions")
+        self.alpha = Tag.objects.create(name="alpha")
+        self.beta = Tag.objects.create(name="beta")
+
+    def _version(self):
+        return Board.objects.values_list("version", flat=True).get(pk=self.board.pk)
+
+    def test_change_bumps_board_version(self):
+        before = self._version()
+        tag_suggestions.apply_change(self.board.id, set(), {self.alpha.id, self.beta.id})
+        self.assertEqual(self._version(), before + 1)
+
+    def test_rolled_back_change_keeps_version(self):
+        before = self._version()
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            tag_suggestions.rebuild(self.board)
+            raise RuntimeError
+        self.assertEqual(self._version(), before)
+
+    def test_loaded_matrix_reloaded_after_change_from_another_process(self):
+        tag_suggestions._board_data(self.board.id)
+        cached = tag_suggestions._loaded[self.board.id]
+        # Écriture d'un autre worker : seule la base est partagée
+        Board.objects.filter(pk=self.board.pk).update(version=cached[0][0] + 1)
+        tag_suggestions._board_data(self.board.id)
+        self.assertNotEqual(tag_suggestions._loaded[self.board.id][0], cached[0])
+
+
+class SingleTagChangeTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Podcasts")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+        user = get_user_model().objects.create_user("tags", password="tags-password")
+        self.client.force_login(user)
+
+    def _suggest(self, title):
+        response = self.client.get(f"/api/boards/{self.board.id}/tags/suggest-for", {"title": title})
+        self.assertEqual(response.status_code, 200)
+        return [s["name"] for s in response.json()["suggestions"]]
+
+    def _quick_add(self, text):
+        response = self.client.post(
+            f"/api/boards/{self.board.id}/ideas/quick-add",
+            json.dumps({"text": text, "column_id": self.column.id}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        return response.json()["idea"]["id"]
+
+    def test_single_tag_idea_is_suggested(self):
+        self.assertEqual(self._suggest("podcast"), [])  # matrice chargée, board vide
+        self._quick_add("Épisode #podcast")
+        self.assertEqual(self._suggest("podcast"), ["podcast"])
+
+    def test_last_usage_removed(self):
+        idea_id = self._quick_add("Épisode #podcast")
+        self.assertEqual(self._suggest("podcast"), ["podcast"])
+        Idea.objects.get(pk=idea_id).tags.clear()
+        self.assertEqual(self._suggest("podcast"), [])
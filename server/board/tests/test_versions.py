@@ -0,0 +1,89 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from board.api.services import versions
+from board.models import Board, Column, Idea
+
+
+class CollectTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="Versions")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+
+    def _version(self):
+        return Board.objects.values_list("version", flat=True).get(pk=self.board.pk)
+
+    def test_operation_ids_need_a_write(self):
+        before = self._version()
+        with versions.collect([self.board.id]):
+            Idea.objects.filter(column=self.column).update(title="aucune ligne")
+        self.assertEqual(self._version(), before)
+
+        with versions.collect([self.board.id]):
+            Column.objects.filter(pk=self.column.pk).update(name="Renommée")
+        self.assertEqual(self._version(), before + 1)
+
+    def test_nested_block_discarded_on_exception(self):
+        before = self._version()
+        with versions.collect([self.board.id]):
+            with self.assertRaises(RuntimeError), versions.collect():
+                versions.touch([self.board.id])
+                Column.objects.filter(pk=self.column.pk).update(name="Annulée")
+                raise RuntimeError
+        self.assertEqual(self._version(), before)
+
+
+class ApiVersionTests(TestCase):
+    def setUp(self):
+        self.board = Board.objects.create(name="API")
+        self.column = Column.objects.create(board=self.board, name="Idées")
+        self.other = Column.objects.create(board=self.board, name="Faites", order=1)
+        self.idea = Idea.objects.create(column=self.column, title="Titre")
+        user = get_user_model().objects.create_user("versions", password="versions-password")
+        self.client.force_login(user)
+
+    def _version(self):
+        return Board.objects.values_list("version", flat=True).get(pk=self.board.pk)
+
+    def _post(self, url, payload):
+        return self.client.post(url, json.dumps(payload), content_type="application/json")
+
+    def _update(self, payload):
+        return self._post(f"/api/boards/{self.board.id}/ideas/{self.idea.id}/update", payload)
+
+    def _batch(self, operations, mode):
+        return self._post("/api/batch", {"mode": mode, "operations": operations})
+
+    def _op(self, payload):
+        return {"op": "idea.update", "board_id": self.board.id, "idea_id": self.idea.id, "payload": payload}
+
+    def test_unchanged_update_keeps_version(self):
+        before = self._version()
+        response = self._update({"title": "Titre"})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._version(), before)
+
+    def test_move_bumps_version(self):
+        before = self._version()
+        response = self._post(
+            f"/api/boards/{self.board.id}/ideas/{self.idea.id}/move",
+            {"to_column_id": self.other.id, "target_index": 0},
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._version(), before + 1)
+
+    def test_failed_atomic_batch_keeps_version(self):
+        before = self._version()
+        response = self._batch([self._op({"title": "Nouveau"}), self._op({"status": "inconnu"})], "atomic")
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(self._version(), before)
+        self.idea.refresh_from_db()
+        self.assertEqual(self.idea.title, "Titre")
+
+    def test_best_effort_counts_only_applied_operations(self):
+        before = self._version()
+        response = self._batch([self._op({"status": "inconnu"}), self._op({"title": "Titre"})], "best_effort")
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(self._version(), before)
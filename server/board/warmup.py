@@ -0,0 +1,165 @@
+"""
+Préchauffage d'un worker avant sa première requête.
+
+Sans préchauffage, la première requête d'un process (après un déploiement ou
+un redémarrage du Pi) paie tout ce que Django initialise paresseusement :
+imports des vues et middlewares, résolution des URLs, première connexion SQLite,
+chemins ORM et sérialisation du kanban, matrices de suggestions de tags
+(chargées en mémoire par process pour les BOARD_WARMUP_BOARDS boards récents).
+
+`warm_up()` fait ce travail d'avance, en une passe chronométrée par étape.
+Appelé par config/wsgi.py et config/asgi.py quand DJANGO_WARMUP=1, et par la
+commande `warmup` (qui mesure aussi le temps « démarrage → première réponse
+rapide » avec --measure).
+
+Les étapes ne dépendent pas d'un utilisateur : la pile HTTP est traversée en
+anonyme, les lectures de boards appellent directement les services.
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.conf import settings
+from django.db import connection, connections
+from django.urls import get_resolver, reverse
+
+logger = logging.getLogger(__name__)
+
+
+def _environ(path, cookie=""):
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "localhost",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "HTTP_HOST": "localhost",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(),
+        "wsgi.errors": BytesIO(),
+        "wsgi.multithread": False,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if cookie:
+        environ["HTTP_COOKIE"] = cookie
+    return environ
+
+
+def call_wsgi(application, path, cookie=""):
+    """GET `path` à travers l'application WSGI ; retourne le statut HTTP (int)."""
+    status = []
+
+    def start_response(status_line, headers, exc_info=None):
+        status.append(int(status_line.split(" ", 1)[0]))
+
+    body = application(_environ(path, cookie), start_response)
+    try:
+        for _ in body:
+            pass
+    finally:
+        if hasattr(body, "close"):
+            body.close()
+    return status[0]
+
+
+# ---------------------------------------------------------------------------
+# Étapes
+# ---------------------------------------------------------------------------
+def _database():
+    connection.ensure_connection()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def _urls():
+    resolver = get_resolver()
+    # Remplit les tables de reverse et les caches de résolution
+    for name, args in (("api_boards_list", []), ("api_board_kanban", [1]), ("api_board_idea_detail", [1, 1])):
+        resolver.resolve(reverse(name, args=args))
+
+
+def _http_stack():
+    # Handler WSGI dédié : charge la chaîne de middlewares, la session, le
+    # moteur de réponse JSON, sans dépendre de l'application de l'appelant.
+    from django.core.handlers.wsgi import WSGIHandler
+
+    handler = WSGIHandler()
+    for name in ("api_auth_csrf", "api_boards_list"):
+        call_wsgi(handler, reverse(name))
+
+
+def _recent_boards():
+    from .models import Board
+
+    limit = getattr(settings, "BOARD_WARMUP_BOARDS", 5)
+    return list(Board.objects.order_by("-updated_at", "-id").values_list("id", flat=True)[:limit])
+
+
+def _kanban():
+    from .api.responses import json_nostore
+    from .api.services.boards import kanban_snapshot, list_boards
+    from .models import Board
+
+    json_nostore({"boards": list_boards(overview=True)})
+    # Un seul kanban : le coût à froid (compilation des requêtes ORM, encodeur
+    # JSON) est payé une fois pour tous les boards ; le reste dépend de la taille.
+    board = Board.objects.order_by("-updated_at", "-id").first()
+    if board is not None:
+        json_nostore(kanban_snapshot(board))
+
+
+def _tags():
+    from .api.services.tag_suggestions import suggest
+
+    # Matrices de co-occurrence gardées en mémoire par ce process
+    for board_id in _recent_boards():
+        suggest(board_id)
+
+
+STEPS = (
+    ("database", _database),
+    ("urls", _urls),
+    ("http_stack", _http_stack),
+    ("kanban", _kanban),
+    ("tags", _tags),
+)
+
+
+def warm_up():
+    """Exécute les étapes ; retourne [(étape, ms)]. Une étape en échec n'arrête pas les suivantes."""
+    timings = []
+    for name, step in STEPS:
+        started = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Préchauffage : étape %s en échec", name)
+        timings.append((name, (time.perf_counter() - started) * 1000))
+
+    if not settings.DATABASES["default"].get("CONN_MAX_AGE"):
+        # Connexions non persistantes : Django fermerait celle-ci à la première
+        # requête. On la ferme aussi pour ne pas la partager après un fork.
+        connections.close_all()
+
+    logger.info("Préchauffage : %s", ", ".join(f"{name} {ms:.0f} ms" for name, ms in timings))
+    return timings
+
+
+def maybe_warm_up():
+    """Point d'entrée de config/wsgi.py et config/asgi.py (DJANGO_WARMUP=1)."""
+    if not getattr(settings, "BOARD_WARMUP", False):
+        return None
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return warm_up()
+    # Import depuis une boucle asyncio (certains serveurs ASGI) : l'ORM refuse
+    # les appels synchrones dans ce thread, on préchauffe dans un autre.
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(warm_up).result()
@@ -49,6 +49,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Opt-in (DJANGO_REQUEST_TIMING=1), en tête pour couvrir session/auth
+    "board.middleware.RequestTimingMiddleware",
+    "board.middleware.MetricsMiddleware",
+    "board.middleware.SamplingProfilerMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -78,16 +82,122 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "config.wsgi.application"
 
+# Sous ASGI : versions async des endpoints de lecture (board/api/views_async.py).
+# Pas plus rapides que les vues sync avec SQLite (docs/performance.md) : à 0.
+BOARD_ASYNC_READ_VIEWS = os.environ.get("DJANGO_ASYNC_VIEWS", "0") == "1"
+
+# POST /api/batch : nombre maximal de sous-opérations par requête
+BOARD_BATCH_MAX_OPS = int(os.environ.get("DJANGO_BATCH_MAX_OPS", "50"))
+
+# En-tête Idempotency-Key des POST (board/api/idempotency.py) : durée de
+# rejeu, taille max de la table, purge toutes les N insertions, et durée
+# après laquelle une requête "en cours" (worker mort) peut être reprise : à
+# garder au-dessus du temps de réponse maximal d'un POST.
+BOARD_IDEMPOTENCY_TTL = int(os.environ.get("DJANGO_IDEMPOTENCY_TTL", str(24 * 3600)))
+BOARD_IDEMPOTENCY_MAX_ROWS = int(os.environ.get("DJANGO_IDEMPOTENCY_MAX_ROWS", "10000"))
+BOARD_IDEMPOTENCY_PRUNE_EVERY = 100
+BOARD_IDEMPOTENCY_LEASE = int(os.environ.get("DJANGO_IDEMPOTENCY_LEASE", "60"))
+
+# Mode patch de body_md (board/api/services/patches.py) : nombre max de plages
+BOARD_PATCH_MAX_OPS = 1000
+
+# Historique des idées (board/api/services/revisions.py) : une keyframe toutes
+# les N révisions, N révisions gardées par idée.
+BOARD_REVISION_KEYFRAME_EVERY = int(os.environ.get("DJANGO_REVISION_KEYFRAME_EVERY", "20"))
+BOARD_REVISION_KEEP = int(os.environ.get("DJANGO_REVISION_KEEP", "100"))
+
+# Détection de doublons (board/api/services/duplicates.py) : similarité
+# estimée minimale (0..1) et nombre max de doublons renvoyés.
+BOARD_DUPLICATE_THRESHOLD = float(os.environ.get("DJANGO_DUPLICATE_THRESHOLD", "0.5"))
+BOARD_DUPLICATE_LIMIT = 5
+
+# File de tâches en process (board/api/tasks.py) : threads, taille de file,
+# exécution immédiate (sans thread) avec DJANGO_TASKS_EAGER=1.
+BOARD_TASK_WORKERS = int(os.environ.get("DJANGO_TASK_WORKERS", "2"))
+BOARD_TASK_QUEUE_SIZE = int(os.environ.get("DJANGO_TASK_QUEUE_SIZE", "1000"))
+BOARD_TASKS_EAGER = os.environ.get("DJANGO_TASKS_EAGER", "0") == "1"
+
+# Écritures des boards (board/api/writes.py) : nouvelles tentatives sur
+# « database is locked », attente max (s) du verrou d'un board dans le process.
+BOARD_WRITE_RETRIES = int(os.environ.get("DJANGO_WRITE_RETRIES", "4"))
+BOARD_WRITE_LOCK_TIMEOUT = float(os.environ.get("DJANGO_WRITE_LOCK_TIMEOUT", "10"))
+
+# Suggestions de tags (board/api/services/tag_suggestions.py) : nombre max renvoyé
+BOARD_TAG_SUGGEST_LIMIT = 8
+
+# Préchauffage des workers (board/warmup.py) au chargement de config/wsgi.py
+# ou config/asgi.py, et nombre de boards récents dont les suggestions de tags
+# sont chargées en mémoire.
+BOARD_WARMUP = os.environ.get("DJANGO_WARMUP", "0") == "1"
+BOARD_WARMUP_BOARDS = int(os.environ.get("DJANGO_WARMUP_BOARDS", "5"))
+
 # -----------------------------------------------------------------------------
 # Database
 # -----------------------------------------------------------------------------
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+        "NAME": os.environ.get("DJANGO_DB_PATH") or BASE_DIR / "db.sqlite3",
+        # Connexions persistantes (secondes) : celle ouverte par le préchauffage
+        # sert alors aux premières requêtes. 0 = fermée en fin de requête.
+        "CONN_MAX_AGE": int(os.environ.get("DJANGO_CONN_MAX_AGE", "0")),
+        "OPTIONS": {
+            # Les transactions prennent le verrou d'écriture dès BEGIN : avec les
+            # threads de board/api/tasks.py, une transaction qui lit puis écrit
+            # attend le verrou (timeout) au lieu d'échouer en "database is locked".
+            "transaction_mode": "IMMEDIATE",
+            # WAL : les lectures (polling du kanban) ne bloquent plus le commit
+            # des écritures, et inversement. synchronous=NORMAL suffit en WAL
+            # (pas de corruption possible, seul le dernier commit peut être
+            # perdu en cas de coupure de courant).
+            "init_command": "PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;",
+        },
     }
 }
 
+# -----------------------------------------------------------------------------
+# Cache, sessions & auth
+# -----------------------------------------------------------------------------
+# locmem : un cache par process (OK pour runserver).
+# file   : partagé entre les workers gunicorn d'une même machine (défaut hors DEBUG),
+#          indispensable pour que logout / changement de mot de passe soient vus
+#          par tous les workers.
+CACHE_BACKEND = os.environ.get("DJANGO_CACHE", "locmem" if DEBUG else "file")
+if CACHE_BACKEND == "file":
+    # Le cache contient des sessions picklées : répertoire privé (0700) sous
+    # BASE_DIR plutôt que /tmp, lisible par tous et pré-créable par un autre
+    # compte. Un DJANGO_CACHE_DIR qui n'appartient pas au process fait échouer
+    # le démarrage (chmod refusé).
+    CACHE_DIR = os.environ.get("DJANGO_CACHE_DIR", str(BASE_DIR / ".cache"))
+    os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+    os.chmod(CACHE_DIR, 0o700)
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+            "LOCATION": CACHE_DIR,
+            "TIMEOUT": 300,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "studioboard",
+            "TIMEOUT": 300,
+        }
+    }
+
+# Sessions lues dans le cache, la base restant la source de vérité
+SESSION_ENGINE = "django.contrib.sessions.backends.cached_db"
+
+# get_user() mis en cache (board/auth_backends.py). ModelBackend reste listé pour
+# que les sessions ouvertes avant la mise en place restent valides.
+AUTHENTICATION_BACKENDS = [
+    "board.auth_backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+BOARD_USER_CACHE_TIMEOUT = int(os.environ.get("DJANGO_USER_CACHE_TIMEOUT", "300"))
+
 # -----------------------------------------------------------------------------
 # Password validation
 # -----------------------------------------------------------------------------
@@ -171,6 +281,33 @@ LOGGING = {
     },
 }
 
+# -----------------------------------------------------------------------------
+# Instrumentation (opt-in)
+# -----------------------------------------------------------------------------
+# Server-Timing + log structuré par requête (board.middleware.RequestTimingMiddleware)
+BOARD_REQUEST_TIMING = os.environ.get("DJANGO_REQUEST_TIMING", "0") == "1"
+# Au-delà de ce nombre de requêtes SQL, la ligne de log passe en WARNING
+BOARD_QUERY_BUDGET = int(os.environ.get("DJANGO_QUERY_BUDGET", "20"))
+
+# Spans des services (board.api.tracing) : chemin vers un sink, vide = désactivé
+BOARD_TRACE_SINK = os.environ.get("DJANGO_TRACE_SINK", "")
+
+# Profiler par échantillonnage : seuil "requête lente" en ms (0 = désactivé),
+# un flame graph toutes les N requêtes lentes.
+BOARD_PROFILE_SLOW_MS = int(os.environ.get("DJANGO_PROFILE_SLOW_MS", "0"))
+BOARD_PROFILE_EVERY = int(os.environ.get("DJANGO_PROFILE_EVERY", "10"))
+BOARD_PROFILE_INTERVAL_MS = int(os.environ.get("DJANGO_PROFILE_INTERVAL_MS", "5"))
+BOARD_PROFILE_DIR = os.environ.get("DJANGO_PROFILE_DIR", str(BASE_DIR / "profiles"))
+
+# Métriques Prometheus (GET /api/metrics, staff ou Bearer token)
+BOARD_METRICS_ENABLED = os.environ.get("DJANGO_METRICS", "0") == "1"
+BOARD_METRICS_TOKEN = os.environ.get("DJANGO_METRICS_TOKEN", "")
+# Multi-workers : dossier partagé où chaque process dépose ses compteurs ;
+# fichiers ignorés si leur process est mort ou s'ils ont plus de N secondes
+BOARD_METRICS_DIR = os.environ.get("DJANGO_METRICS_DIR", "")
+BOARD_METRICS_FLUSH_SECONDS = int(os.environ.get("DJANGO_METRICS_FLUSH_SECONDS", "5"))
+BOARD_METRICS_STALE_SECONDS = int(os.environ.get("DJANGO_METRICS_STALE_SECONDS", "3600"))
+
 # -----------------------------------------------------------------------------
 # Default primary key field type
 # -----------------------------------------------------------------------------
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
 application = get_wsgi_application()
+
+# Préchauffage avant la première requête (DJANGO_WARMUP=1), une fois par worker
+from board.warmup import maybe_warm_up  # noqa: E402
+
+maybe_warm_up()